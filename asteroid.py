@@ -9,6 +9,12 @@
 # current speed with given value, this is for parting ways for splitting asteroids.
 # Other method involved in basic repositioning (move), checking for a collision
 # with other obj in the game, and re-adjust speed due to a collision.
+# Asteroid args are kept in a row of an EntityTable (see world.py), the object
+# is a view to its row.
+############################################################
+# Imports
+############################################################
+from world import EntityTable
 ############################################################
 # Asteroid class
 ############################################################
@@ -19,7 +25,10 @@ class Asteroid:
     Class representing Asteroid in 2D world.
     consts AXIS_X, AXIS_Y, MIN, MAX are used for the structural implementation
     of object's bounds arg.
+    Asteroid only holds its table, row index and bounds (in slots, no
+    per-object dict), all other args are in the table columns.
     """
+    __slots__ = ("_table", "_index", "bounds")
     AXIS_X = 0
     AXIS_Y = 1
     MIN = 0
@@ -27,7 +36,7 @@ class Asteroid:
     NORMALIZING_FACTOR = -5
     SIZE_COEFFICIENT = 10
 
-    def __init__(self, pos, speed, size, bounds):
+    def __init__(self, pos, speed, size, bounds, table=None):
         """
         Asteroid object constructor
         :param pos: location on 2d matrix as (x, y)
@@ -40,56 +49,71 @@ class Asteroid:
         each tuple incl. min and max values for screen bounds.
         for ex. [(min_x, max_x), (min_y, max_y)]
         :type bounds: list
+        :param table: table of asteroids to keep args in, if not given
+        asteroid gets a table of its own.
+        :type table: EntityTable
         """
-        self.__pos = pos
-        self.__speed = speed
-        self.__size = size
+        self._table = table if table is not None else EntityTable()
+        self._index = -1
         self.bounds = bounds
+        self.reset(pos, speed, size)
+
+    def reset(self, pos, speed, size):
+        """
+        This method sets asteroid args and adds it (again) to its table,
+        for re-using an asteroid that was removed from table.
+        :param pos: location on 2d matrix as (x, y)
+        :param speed: Asteroid's speed on 2d matrix, (x, y)
+        :param size: Size of asteroid
+        """
+        self._table.add(self, pos, speed,
+                        (size * self.SIZE_COEFFICIENT) - self.NORMALIZING_FACTOR,
+                        size)
 
     def get_coordinates(self):
         """
         Asteroid coordinates getter
         :return: Asteroid pos arg (tuple)
         """
-        return self.__pos
+        return self._table.x[self._index], self._table.y[self._index]
 
     def get_size(self):
         """
         Asteroid size getter
         :return: Asteroid size arg (int)
         """
-        return self.__size
+        return int(self._table.size[self._index])
 
     def get_speed(self):
         """
         Asteroid speed getter
         :return: Asteroid speed arg (tuple)
         """
-        return self.__speed
+        return self._table.vx[self._index], self._table.vy[self._index]
 
     def get_x(self):
         """
         Asteroid's X coordinate getter
         :return: X coordinate of asteroid's position
         """
-        return self.__pos[self.AXIS_X]
+        return self._table.x[self._index]
 
     def get_y(self):
         """
         Asteroid's Y coordinate getter
         :return: Y coordinate of asteroid's position
         """
-        return self.__pos[self.AXIS_Y]
+        return self._table.y[self._index]
 
     def get_radius(self):
         """
         Asteroid radius getter
-        note: This is not an arg of Asteroid class.
-        :return: the radius of the asteroid.
-        Radius is calculated by the following formula:
+        note: This is not an arg of Asteroid class, it is calculated once
+        when asteroid is added to its table, by the following formula:
         RADIUS = (ASTEROID SIZE * SIZE_COEFFICIENT) - NORMALIZING FACTOR
+        :return: the radius of the asteroid.
         """
-        return (self.get_size() * self.SIZE_COEFFICIENT) - self.NORMALIZING_FACTOR
+        return self._table.radius[self._index]
 
     def set_split_ways(self, split_value):
         """
@@ -97,8 +121,8 @@ class Asteroid:
         multiplication factor in order to part directions of splitting asteroids.
         :param split_value: multiplication factor
         """
-        self.__speed = self.__speed[self.AXIS_X] * split_value, \
-                       self.__speed[self.AXIS_Y] * split_value
+        self._table.vx[self._index] *= split_value
+        self._table.vy[self._index] *= split_value
 
     def get_new_coordinate(self, axis, axis_bounds):
         """
@@ -113,9 +137,9 @@ class Asteroid:
         from object's bounds arg.
         :return: new coordination according to formula within a given axis, x or y.
         """
-        new_coord = self.__pos[axis]
+        new_coord = self.get_coordinates()[axis]
         dif_axis = axis_bounds[self.MAX] - axis_bounds[self.MIN]
-        new_coord = (self.__speed[axis] + new_coord - axis_bounds[self.MIN]) \
+        new_coord = (self.get_speed()[axis] + new_coord - axis_bounds[self.MIN]) \
             % dif_axis + axis_bounds[self.MIN]
         return new_coord
 
@@ -125,21 +149,39 @@ class Asteroid:
         """
         new_coord_x = self.get_new_coordinate(self.AXIS_X, self.bounds[self.AXIS_X])
         new_coord_y = self.get_new_coordinate(self.AXIS_Y, self.bounds[self.AXIS_Y])
-        self.__pos = (new_coord_x, new_coord_y)
+        self._table.x[self._index] = new_coord_x
+        self._table.y[self._index] = new_coord_y
+
+    def get_axis_distance(self, axis, coord, axis_bounds):
+        """
+        This method gets the distance of a coordinate from asteroid on
+        one axis, the shorter way around the wrapping screen.
+        :param axis: a const (AXIS_X or AXIS_Y) as defined in class consts
+        :param coord: coordinate of other object on axis
+        :param axis_bounds: the bounds of the specific axis, a tuple for the axis
+        :return: distance on axis (non negative)
+        """
+        dif_axis = axis_bounds[self.MAX] - axis_bounds[self.MIN]
+        distance = abs(coord - self.get_coordinates()[axis])
+        return min(distance, dif_axis - distance)
 
     def has_intersection(self, obj):
         """
         This method checks if an object had a collision with the asteroid.
         The check is based on the condition that the distance is less/equal
-        than/to the sum of asteroid's radius and object's radius.
-        Distance formula: ((obj.x_coord - asteroid.x_coord)**2 +
-        (obj.y_coord - asteroid.y_coord)**2)**0.5
+        than/to the sum of asteroid's radius and object's radius, compared
+        squared so no square root is taken:
+        Squared distance formula: dx**2 + dy**2
+        dx, dy are the distances on each axis, as screen wraps around an axis
+        distance is the shorter one of: |obj coord - asteroid coord| and
+        AXIS DIFFERENCE - |obj coord - asteroid coord|
         :param obj: object of Ship class (but could be implemented for other obj)
         :return: True - object has collided with asteroid, False - else.
         """
-        distance = ((obj.get_x() - self.get_x())**2
-                    + (obj.get_y() - self.get_y())**2)**0.5
-        if distance <= self.get_radius() + obj.get_radius():
+        squared_distance = \
+            self.get_axis_distance(self.AXIS_X, obj.get_x(), self.bounds[self.AXIS_X])**2 \
+            + self.get_axis_distance(self.AXIS_Y, obj.get_y(), self.bounds[self.AXIS_Y])**2
+        if squared_distance <= (self.get_radius() + obj.get_radius())**2:
             return True
         return False
 
@@ -154,9 +196,11 @@ class Asteroid:
         (asteroid current speed_y coord))**0.5
         :param obj: object of Torpedo class
         """
-        formula_divisor = ((self.__speed[self.AXIS_X])**2 + (self.__speed[self.AXIS_Y])**2)**0.5
+        speed = self.get_speed()
+        formula_divisor = ((speed[self.AXIS_X])**2 + (speed[self.AXIS_Y])**2)**0.5
         new_x_speed = (obj.get_speed()[self.AXIS_X] +
-                       self.__speed[self.AXIS_X]) / formula_divisor
+                       speed[self.AXIS_X]) / formula_divisor
         new_y_speed = (obj.get_speed()[self.AXIS_Y] +
-                       self.__speed[self.AXIS_Y]) / formula_divisor
-        self.__speed = (new_x_speed, new_y_speed)
+                       speed[self.AXIS_Y]) / formula_divisor
+        self._table.vx[self._index] = new_x_speed
+        self._table.vy[self._index] = new_y_speed
@@ -16,20 +16,64 @@
 #
 # Gameplay is built on passive reaction to user, with running the main loop,
 # over and over, creating movements and be responsive to user input.
+# The main loop runs at a fixed rate (see scheduler.py), and drawing is done
+# apart from it, once after the loops that were due.
+# Disarmed torpedoes and destroyed asteroids are re-used (see pool.py) at the
+# end of the loop, so a long game does not keep constructing new objects.
+#
+# Random values of a game (ship and asteroids start) come from a random
+# generator of the game, given a seed, so a game can be played again the same
+# way with the same seed and input of each loop (see replay.py).
+# The whole state of a game can be copied to a GameState (see game_state.py)
+# and set back, or saved to bytes and loaded back, for jumping to a loop of a
+# replay without playing all loops before it.
 #
 # Main Function: runs the game with a parameter of asteroids amount, that
-# will determine number of asteroids in the game.
+# will determine number of asteroids in the game, and optional "--canvas"
+# for drawing with the canvas render backend (see canvas_screen.py),
+# "--seed N" for the seed of the game, "--record PATH" to record a replay and
+# "--rewind-mb MB" for the memory cap of the rewind buffer and "--profile"
+# for timing the phases of loops and frames (see profiler.py).
+#
+# The states of the last loops are kept in a rewind buffer (see rewind.py),
+# "," and "." keys scrub back and forward through them (game is paused while
+# scrubbed back), and Enter goes on with the game from the shown state.
+#
+# Objects args are kept in a World (see world.py), a table of contiguous arrays
+# for each kind of object, so movement and collisions are checked for all
+# asteroids / torpedoes at once and not with method calls for each object.
+#
+# Headless mode: GameRunner can be given another render backend (see
+# headless_screen.py) and stepped one loop at a time with step method, for
+# running the game without a display (and without importing tkinter).
+# Importing this file imports no GUI module (tkinter, turtle) and no argparse,
+# they are imported only when the GUI or the command line is used, so
+# headless tools start fast (see startup_bench.py).
 ############################################################
 # Imports
 ############################################################
 import sys
 import random
-from screen import Screen
+import time
+
+import controls
 from ship import Ship
 from asteroid import Asteroid
 from torpedo import Torpedo
+from world import World
+from game_state import GameState
+from collision import SpatialHash, find_collisions, find_hits
+from scheduler import FixedStepScheduler
+from pool import Pool
+from rewind import RewindBuffer
+from profiler import TickProfiler
 
 DEFAULT_ASTEROIDS_NUM = 5
+MAX_SEED = 2**64
+MB = 2**20
+DEFAULT_REWIND_MB = 32
+# version of the Mersenne Twister state of random.Random
+RANDOM_VERSION = 3
 ############################################################
 # GameRunner class
 ############################################################
@@ -51,7 +95,8 @@ class GameRunner:
     asteroid and its speed could be changed or given randomly.
     * Torpedo's limit on screen and torpedo lifetime (defined by loops of the
     main runner) is also defined in consts as part of the gameplay.
-    * Initial user/ship lives is set in consts.
+    * Initial user/ship lives is set in consts, and the number of loops the
+    ship is invulnerable after a collision (0 for none).
     * Points for each asteroid hit, defined in dict const. according to asteroid's
     size.
     * consts relating to splitting asteroids due torpedo hit, are defined as const.
@@ -76,34 +121,74 @@ class GameRunner:
     INTERCEPTION_POINTS = {1: 100, 2: 50, 3: 20}
     MIN_SPLIT_SIZE = 2
     SPLIT_VALUES = [-1, 1]
+    TICK_MS = 10
+    INVULNERABLE_TICKS = 0
+    REWIND_STEP = 10
+    PROFILER_OVERLAY_FRAMES = 10
+    GAME_INPUT = controls.LEFT | controls.RIGHT | controls.UP | controls.FIRE
 
-    def __init__(self, asteroids_amnt):
+    def __init__(self, asteroids_amnt, screen=None, seed=None):
         """
         This is the constructor for GameRunner
         :param asteroids_amnt: number of asteroids to add to the game
         :type asteroids_amnt: int
+        :param screen: render backend to use instead of the tkinter Screen,
+        for ex. CanvasScreen or HeadlessScreen. With a headless backend, end
+        of game is kept in game over arg instead of exiting.
+        :param seed: seed of the game's random generator, random if not given
+        :type seed: int
         :return: a new GameRunner obj. with args in field incl.:
         Screen object - GUI, and its screen min & max values for each axis in 2D.
         Ship object, responsive to user input keyboard press.
         Ship lives defining lives in game and score to keep track of points.
-        Also, a list of asteroids in the game, in the amount as give in param,
-        and are constructed in this method!
-        Dictionary of torpedoes, with object as keys and remaining "lifetime"
-        as dict value, torpedoes are set by user presses on "space" in keyboard,
-        dict is limited to 15 torpedoes.
-        """
-        self._screen = Screen()
-
-        self.screen_max_x = Screen.SCREEN_MAX_X
-        self.screen_max_y = Screen.SCREEN_MAX_Y
-        self.screen_min_x = Screen.SCREEN_MIN_X
-        self.screen_min_y = Screen.SCREEN_MIN_Y
-
+        World of the game, holding a table of asteroids in the game, in the
+        amount as give in param, and are constructed in this method!
+        And a table of torpedoes, with remaining "lifetime" kept in table,
+        torpedoes are set by user presses on "space" in keyboard,
+        table is limited to 15 torpedoes.
+        """
+        if screen is None:
+            # tkinter is imported only when the GUI is actually used
+            from screen import Screen
+            screen = Screen()
+        self._screen = screen
+        self.__headless = screen.HEADLESS
+        self.__game_over = False
+        if seed is None:
+            seed = random.randrange(MAX_SEED)
+        self.__seed = seed
+        self.__random = random.Random(seed)
+        # words of the random generator state, kept until a random value is
+        # drawn (None if one was drawn since), see snapshot
+        self.__random_state = None
+        self.__recorder = None
+        self.__rewind = None
+        self.__profiler = None
+        self.__loop = self._game_loop
+        self.__ticks = 0
+
+        self.screen_max_x = screen.SCREEN_MAX_X
+        self.screen_max_y = screen.SCREEN_MAX_Y
+        self.screen_min_x = screen.SCREEN_MIN_X
+        self.screen_min_y = screen.SCREEN_MIN_Y
+
+        self.__world = World(self.get_screen_bounds())
+        self.__asteroids = self.__world.asteroids
+        self.__torpedoes = self.__world.torpedoes
+        self.__grid = SpatialHash(self.get_screen_bounds(),
+                                  self.get_collision_cell_size())
+        self.__scheduler = FixedStepScheduler(self._game_loop,
+                                              self.__render_frame, self.TICK_MS)
+        self.__asteroid_pool = Pool(self.__new_asteroid,
+                                    self.get_max_asteroids(asteroids_amnt))
+        self.__torpedo_pool = Pool(self.__new_torpedo, self.TORPEDO_LIMIT)
+        self.__destroyed = dict.fromkeys(self.INTERCEPTION_POINTS, 0)
         self.ship = self.__set_ship()
         self.__ship_life = self.INITIAL_LIVES
+        self.__invulnerable_until = 0
         self.__score = self.INITIAL_SCORE
-        self.__asteroids = [self.__set_asteroids() for i in range(asteroids_amnt)]
-        self.__torpedoes = dict()
+        for i in range(asteroids_amnt):
+            self.__set_asteroids()
 
     def get_screen_bounds(self):
         """
@@ -116,6 +201,33 @@ class GameRunner:
         return [(self.screen_min_x, self.screen_max_x),
                 (self.screen_min_y, self.screen_max_y)]
 
+    def get_world(self):
+        """
+        game world getter
+        :return: World obj. holding the tables of ship, asteroids and torpedoes
+        """
+        return self.__world
+
+    def get_collision_cell_size(self):
+        """
+        This method gets the size of a cell in the collision grid, the
+        diameter of the biggest asteroid in game, so that objects only need
+        to look in cells next to them.
+        :return: cell size (number)
+        """
+        return 2 * (self.ASTEROID_INITIAL_SIZE * Asteroid.SIZE_COEFFICIENT
+                    - Asteroid.NORMALIZING_FACTOR)
+
+    def get_max_asteroids(self, asteroids_amnt):
+        """
+        This method gets the max number of asteroids that can be in game at
+        once, when all asteroids are split to the smallest size.
+        :param asteroids_amnt: number of asteroids game started with
+        :return: max number of asteroids (int)
+        """
+        return asteroids_amnt * len(self.SPLIT_VALUES) ** \
+            (self.ASTEROID_INITIAL_SIZE - 1)
+
     def get_lives(self):
         """
         ship lives getter
@@ -130,14 +242,81 @@ class GameRunner:
         """
         return self.__score
 
+    def get_destroyed(self):
+        """
+        destroyed asteroids getter
+        :return: dict of asteroid size to number of asteroids of that size
+        destroyed (by torpedoes, split ones included, or by the ship)
+        """
+        return dict(self.__destroyed)
+
+    def is_game_over(self):
+        """
+        game over getter
+        :return: True if the game has ended (win, lose or quit), else False
+        """
+        return self.__game_over
+
+    def get_seed(self):
+        """
+        seed getter
+        :return: seed of the game's random generator (int)
+        """
+        return self.__seed
+
+    def get_ticks(self):
+        """
+        ticks getter
+        :return: number of loops the game ran (int)
+        """
+        return self.__ticks
+
+    def set_recorder(self, recorder):
+        """
+        This method sets a recorder of the game input, the input bitmask of
+        each loop is given to its record method (see replay.py).
+        :param recorder: recorder obj., or None to stop recording
+        """
+        self.__recorder = recorder
+
+    def set_profiler(self, profiler):
+        """
+        This method sets a profiler timing each phase of the loops and frames
+        of the game (see profiler.py), and showing an overlay of frame times
+        next to the game.
+        Loop and frame functions are swapped with timed ones only while a
+        profiler is set, so with no profiler the game runs as is.
+        :param profiler: TickProfiler obj., or None to stop profiling
+        """
+        self.__profiler = profiler
+        if profiler is None:
+            self.__loop = self._game_loop
+            self.__scheduler.set_callbacks(self._game_loop, self.__render_frame)
+        else:
+            self.__loop = self.__profiled_game_loop
+            self.__scheduler.set_callbacks(self.__profiled_game_loop,
+                                           self.__profiled_render_frame)
+
+    def set_rewind(self, rewind):
+        """
+        This method sets a rewind buffer, the state of the game is pushed to
+        it at the end of each loop, and the rewind keys scrub through it while
+        the game runs with its GUI (see rewind.py).
+        :param rewind: RewindBuffer obj., or None to stop
+        """
+        self.__rewind = rewind
+        if rewind is not None:
+            rewind.push(self.snapshot())
+
     def get_random_coordinates(self):
         """
         This method gets pseudo-random (x, y) coordinates
         for initiating ship and asteroids start positions.
         :return: coordinates within screen bounds, tuple in the format of (x, y).
         """
-        x = random.randint(self.screen_min_x, self.screen_max_x)
-        y = random.randint(self.screen_min_y, self.screen_max_y)
+        self.__random_state = None
+        x = self.__random.randint(self.screen_min_x, self.screen_max_x)
+        y = self.__random.randint(self.screen_min_y, self.screen_max_y)
         return (x, y)
 
     def get_random_asteroid_speed(self):
@@ -146,19 +325,21 @@ class GameRunner:
         defined in class consts.
         :return: random speed for each axis, tuple in the format of (x, y).
         """
-        return (random.randint(self.MIN_ASTEROID_SPEED, self.MAX_ASTEROID_SPEED),
-                random.randint(self.MIN_ASTEROID_SPEED, self.MAX_ASTEROID_SPEED))
+        self.__random_state = None
+        return (self.__random.randint(self.MIN_ASTEROID_SPEED, self.MAX_ASTEROID_SPEED),
+                self.__random.randint(self.MIN_ASTEROID_SPEED, self.MAX_ASTEROID_SPEED))
 
     def __set_ship(self):
         """
         This method sets ship in class arg
         :return: new Ship object with randomized coordinates
         """
-        return Ship(self.get_random_coordinates(), self.get_screen_bounds())
+        return Ship(self.get_random_coordinates(), self.get_screen_bounds(),
+                    self.__world.ships)
 
     def __set_asteroids(self):
         """
-        This method sets new asteroid in list of asteroids class arg.
+        This method sets new asteroid in table of asteroids in world.
         This method also registers it to Screen!
         Note that asteroids get random position BUT will not have the same
         position as ship in initialization.
@@ -168,25 +349,44 @@ class GameRunner:
         x, y = self.get_random_coordinates()
         while (x, y) == self.ship.get_coordinates():
             x, y = self.get_random_coordinates()
-        new_asteroid = Asteroid((x, y), self.get_random_asteroid_speed(),
-                                self.ASTEROID_INITIAL_SIZE, self.get_screen_bounds())
-        self._screen.register_asteroid(new_asteroid, new_asteroid.get_size())
+        new_asteroid = self.__asteroid_pool.acquire(
+            (x, y), self.get_random_asteroid_speed(), self.ASTEROID_INITIAL_SIZE)
+        self._screen.register_asteroid(
+            self.__asteroids.get_handle(new_asteroid), new_asteroid.get_size())
         return new_asteroid
 
+    def __new_asteroid(self, pos, speed, size):
+        """
+        This method constructs a new asteroid in table of asteroids in world,
+        used by asteroids pool when it has no free asteroid.
+        :return: new Asteroid obj
+        """
+        return Asteroid(pos, speed, size, self.get_screen_bounds(),
+                        self.__asteroids)
+
+    def __new_torpedo(self, pos, heading, speed, lifetime):
+        """
+        This method constructs a new torpedo in table of torpedoes in world,
+        used by torpedoes pool when it has no free torpedo.
+        :return: new Torpedo obj
+        """
+        return Torpedo(pos, heading, speed, self.get_screen_bounds(),
+                       self.__torpedoes, lifetime)
+
     def set_torpedo(self):
         """
-        This method sets new torpedo in game, adds it to dict in torpedoes class
-        arg with lifetime as in class consts.
+        This method sets new torpedo in game, adds it to table of torpedoes
+        in world with lifetime as in class consts.
         This method also registers the torpedo to Screen!
         Torpedoes are launched as they are set and note that method
         will not set new torpedo if user reached torpedoes limit.
         """
         if len(self.__torpedoes) == self.TORPEDO_LIMIT:
             return
-        new_torpedo = Torpedo(self.ship.get_coordinates(), self.ship.get_heading(),
-                              self.ship.get_speed(), self.get_screen_bounds())
-        self.__torpedoes[new_torpedo] = self.TORPEDO_LIFETIME
-        self._screen.register_torpedo(new_torpedo)
+        new_torpedo = self.__torpedo_pool.acquire(
+            self.ship.get_coordinates(), self.ship.get_heading(),
+            self.ship.get_speed(), self.TORPEDO_LIFETIME)
+        self._screen.register_torpedo(self.__torpedoes.get_handle(new_torpedo))
 
     def __kill_one_life(self):
         """This method subtracts one life from ship life"""
@@ -194,102 +394,242 @@ class GameRunner:
 
     def __destroy_asteroid(self, asteroid):
         """
-        This method removes asteroid from both class arg list of asteroids and
+        This method removes asteroid from both table of asteroids in world and
         screen (un-register), and then checks game status.
+        Asteroid row is removed from table (and asteroid goes back to pool) at
+        the end of the loop, it is not in game from now on.
         :param asteroid: this is the asteroid meant for disposal
         :type asteroid: Asteroid
         """
-        self._screen.unregister_asteroid(asteroid)
-        self.__asteroids.remove(asteroid)
+        self.__destroyed[asteroid.get_size()] += 1
+        self._screen.unregister_asteroid(self.__asteroids.get_handle(asteroid))
+        self.__asteroids.defer_remove(asteroid)
         self.check_game_status()
 
     def ship_asteroid_collision(self):
         """
         This method responds to a ship-asteroid collision scenario in the game.
-        It will kill one ship life, update screen lives and give output msg.
+        It will kill one ship life, update screen lives and give output msg
+        (a notification, the game goes on while it is shown).
+        Ship is then invulnerable for INVULNERABLE_TICKS loops (the loop of
+        the collision included).
         """
         self.__kill_one_life()
+        self.__invulnerable_until = self.__ticks + self.INVULNERABLE_TICKS
         self._screen.remove_life()
-        self._screen.show_message(self.TITLE_COLLISION, self.MSG_COLLISION + str(self.get_lives()))
+        self._screen.notify(self.TITLE_COLLISION, self.MSG_COLLISION + str(self.get_lives()))
+
+    def is_invulnerable(self):
+        """
+        :return: True if ship is in its invulnerability window after a
+        collision (asteroids pass through it), else False
+        """
+        return self.__ticks < self.__invulnerable_until
 
     def __disarm_torpedo(self, torpedo):
         """
-        This method will un-register a torpedo from screen & delete it from
-        class arg torpedoes dict.
+        This method will un-register a torpedo from screen & remove it from
+        table of torpedoes in world.
+        Torpedo row is removed from table (and torpedo goes back to pool) at
+        the end of the loop.
         :param torpedo: this is the torpedo for disposal
         :type torpedo: Torpedo
         """
-        self._screen.unregister_torpedo(torpedo)
-        del self.__torpedoes[torpedo]
+        self._screen.unregister_torpedo(self.__torpedoes.get_handle(torpedo))
+        self.__torpedoes.defer_remove(torpedo)
+
+    def snapshot(self):
+        """
+        This method copies the whole state of the game: loops count, score,
+        lives, ship, asteroids, torpedoes (with remaining lifetime) and the
+        random generator.
+        Only the columns of the world tables are copied (not the objects), so
+        it is cheap enough to take every loop. The random generator state is
+        only taken again after random values were drawn, states taken in
+        between share the same tuple.
+        :return: GameState obj., see restore
+        """
+        world = self.__world
+        if self.__random_state is None:
+            self.__random_state = self.__random.getstate()[1]
+        return GameState(self.__ticks, self.__score, self.__ship_life,
+                         self.__invulnerable_until, world.ships.snapshot(),
+                         world.asteroids.snapshot(),
+                         world.torpedoes.snapshot(), self.__random_state)
+
+    def restore(self, state):
+        """
+        This method sets the game to a state taken with snapshot.
+        Asteroids and torpedoes in game are kept for the rows of the state,
+        extra ones are removed and missing ones are taken from pools, then
+        all columns of the tables are set at once. Only added asteroids and
+        torpedoes (and kept asteroids that changed size) are registered
+        again to screen, in one batch call for each kind.
+        :param state: GameState obj.
+        """
+        world = self.__world
+        asteroids, torpedoes = self.__asteroids, self.__torpedoes
+        sizes = asteroids.get_snapshot_column(state.asteroids, "size")
+        old_sizes = list(asteroids.size)
+        kept_asteroids = self.__resize_table(
+            asteroids, len(sizes), self.__asteroid_pool,
+            self._screen.unregister_asteroids, (0, 0), (0, 0), 0)
+        kept_torpedoes = self.__resize_table(
+            torpedoes, len(state.torpedoes) // len(torpedoes.COLUMNS),
+            self.__torpedo_pool, self._screen.unregister_torpedoes,
+            (0, 0), 0, (0, 0), 0)
+        world.ships.restore(state.ships)
+        asteroids.restore(state.asteroids)
+        torpedoes.restore(state.torpedoes)
+        resized = [i for i in range(kept_asteroids)
+                   if old_sizes[i] != sizes[i]]
+        self._screen.unregister_asteroids(
+            [asteroids.handles[i] for i in resized])
+        added = resized + list(range(kept_asteroids, len(asteroids)))
+        self._screen.register_asteroids([asteroids.handles[i] for i in added],
+                                        [int(sizes[i]) for i in added])
+        self._screen.register_torpedoes(torpedoes.handles[kept_torpedoes:])
+        self.__random.setstate((RANDOM_VERSION, state.random_state, None))
+        self.__random_state = state.random_state
+        self.__ticks = state.ticks
+        self.__score = state.score
+        self.__ship_life = state.lives
+        self.__invulnerable_until = state.invulnerable_until
+        self.__game_over = False
+        self._screen.set_score(state.score)
+        self._screen.set_lives(state.lives)
+
+    def __resize_table(self, table, rows, pool, unregister, *args):
+        """
+        This method removes objects from the end of a table, or adds objects
+        from pool (re-set with args), until table has the given number of rows.
+        Removed objects are un-registered from screen (in one call) and given
+        back to pool, added objects are not registered.
+        :param unregister: screen method un-registering many objects of table
+        by entity ids
+        :return: number of objects that were kept in table
+        """
+        unregister(table.handles[rows:])
+        while len(table) > rows:
+            obj = table.views[-1]
+            table.remove(obj)
+            pool.release(obj)
+        kept = len(table)
+        while len(table) < rows:
+            pool.acquire(*args)
+        return kept
+
+    def save_state(self):
+        """
+        This method saves the whole state of the game as bytes (see snapshot).
+        :return: state as bytes, see load_state
+        """
+        return self.snapshot().to_bytes()
+
+    def load_state(self, data):
+        """
+        This method loads a state saved with save_state (see restore).
+        :param data: state bytes (or buffer)
+        """
+        self.restore(GameState.from_bytes(data))
+
+    def __recycle(self):
+        """
+        This method removes the asteroids and torpedoes marked for removal in
+        this loop from their tables, and gives them back to their pools.
+        It is called at the end of the loop, so rows do not move and objects
+        are not re-used while the loop may still hold them (for ex. in a list
+        of collisions).
+        """
+        for asteroid in self.__asteroids.flush():
+            self.__asteroid_pool.release(asteroid)
+        for torpedo in self.__torpedoes.flush():
+            self.__torpedo_pool.release(torpedo)
 
     def split_asteroid(self, asteroid, torpedo):
         """
         This method handles with splitting an asteroid after hit by torpedo.
-        This method will construct new asteroid based on given asteroid parameters,
+        This method will set new asteroid (from pool) based on given asteroid parameters,
         then will set new speed in motion and set values to adjust new asteroid
         path to part ways from other new asteroids.
-        This method registers the asteroid to Screen and after constructing
-        new asteroids, sends the asteroid param for disposal.
+        This method registers the new asteroids to Screen (in one call) and
+        after constructing them, sends the asteroid param for disposal.
         :param asteroid: This is the asteroid that needs to split
         :type asteroid: Asteroid
         :param torpedo: this is the torpedo that hit the asteroid
         :type torpedo: Torpedo
         :return:
         """
+        new_ids = []
         for i in range(len(self.SPLIT_VALUES)):
-            new_asteroid = Asteroid(asteroid.get_coordinates(),
-                                    asteroid.get_speed(), asteroid.get_size() - 1,
-                                    self.get_screen_bounds())
+            new_asteroid = self.__asteroid_pool.acquire(
+                asteroid.get_coordinates(), asteroid.get_speed(),
+                asteroid.get_size() - 1)
             # Sets new speed in motion
             new_asteroid.collision_acceleration(torpedo)
             # Sets speed for asteroids to part ways
             new_asteroid.set_split_ways(self.SPLIT_VALUES[i])
-            self._screen.register_asteroid(new_asteroid,
-                                           new_asteroid.get_size())
-            self.__asteroids.append(new_asteroid)
+            new_ids.append(self.__asteroids.get_handle(new_asteroid))
+        self._screen.register_asteroids(
+            new_ids, [asteroid.get_size() - 1] * len(new_ids))
         self.__destroy_asteroid(asteroid)
 
     def interact_user_input(self):
         """
-        This method interacts with user input on key presses
-        using Screen methods. It comprises of if conditions, each responds
-        according to user's input.
+        This method interacts with user input, the keys that act in this loop
+        (pressed since last loop, or turn and thrust keys held down, at a set
+        rate), taken from Screen in one call (poll_input). It comprises of
+        if conditions, each responds according to user's input.
         If user pressed 'left' - ship turns left
         If user pressed 'right' - ship turns right
         if user pressed 'up' - ship accelerates
         if user pressed 'space' - torpedo is launched
+        :return: input bitmask of the keys pressed, as defined in controls.py
         """
-        if self._screen.is_left_pressed():
+        inputs = self._screen.poll_input()
+        if inputs & controls.LEFT:
             self.ship.turn_left()
-        if self._screen.is_right_pressed():
+        if inputs & controls.RIGHT:
             self.ship.turn_right()
-        if self._screen.is_up_pressed():
+        if inputs & controls.UP:
             self.ship.accelerate()
-        if self._screen.is_space_pressed():
+        if inputs & controls.FIRE:
             self.set_torpedo()
+        return inputs & self.GAME_INPUT
 
     def asteroid_sequence(self):
         """
         This initiates asteroids sequence in game loop.
         For each loop method will:
-        Draw asteroids to screen, adjust their movement, check if asteroids
+        Adjust asteroids movement, check if asteroids
         had collision with ship and if it did will send to to corresponding method
         and then will destroy the asteroid.
-        """
-        for asteroid in self.__asteroids:
-            self._screen.draw_asteroid(asteroid, asteroid.get_x(),
-                                       asteroid.get_y())
-            asteroid.move()
+        Movement and collision check are done for the whole asteroids table
+        at once (see collision.py), collisions are checked across screen edges
+        and along the way ship and asteroids moved in this loop.
+        The collision grid is built with the asteroids once they moved, and
+        is used by torpedo_sequence too (asteroids do not move until then).
+        """
+        asteroids = self.__asteroids
+        asteroids.move(self.get_screen_bounds())
+        self.__grid.build(asteroids.x, asteroids.y)
+        if self.is_invulnerable():
+            return
 
-            if asteroid.has_intersection(self.ship):
-                self.ship_asteroid_collision()
-                self.__destroy_asteroid(asteroid)
+        hit = find_hits(self.__grid, asteroids, self.ship.get_x(),
+                        self.ship.get_y(), self.ship.get_radius(),
+                        self.ship.get_speed())
+        for asteroid in hit:
+            if self.__game_over or self.is_invulnerable():
+                return
+            self.ship_asteroid_collision()
+            self.__destroy_asteroid(asteroid)
 
     def torpedo_sequence(self):
         """
         This initiates torpedoes sequence in game loop.
         For each loop method will:
-        Draw torpedoes to screen, adjust their movement, check if a torpedo
+        Adjust torpedoes movement, check if a torpedo
         hit an asteroid.
         If hit:
         1) will update user score.
@@ -298,23 +638,33 @@ class GameRunner:
         4) disarm torpedo - del from dict. and un-register from screen.
         In any case, it will subtract one "life"(life=loop) from torpedo
         remaining lifetime and will disarm it if reached zero.
-        """
-        # listed the items in dict to be able to change dict size within loop
-        for torpedo, rounds in list(self.__torpedoes.items()):
-            self._screen.draw_torpedo(torpedo, torpedo.get_x(),
-                                      torpedo.get_y(), torpedo.get_heading())
-            torpedo.move()
-            exploded = False
-            for asteroid in self.__asteroids:
-                if asteroid.has_intersection(torpedo):
-                    self.update_score(asteroid.get_size())
-                    if asteroid.get_size() >= self.MIN_SPLIT_SIZE:
-                        self.split_asteroid(asteroid, torpedo)
-                    else:
-                        self.__destroy_asteroid(asteroid)
-                    exploded = True
-            rounds -= 1
-            if rounds == 0 or exploded:
+        Movement and lifetime are updated for the whole torpedoes table at once,
+        and hits are found with the collision grid (see collision.py).
+        An asteroid that was already destroyed by another torpedo in this
+        loop does not explode the torpedo.
+        """
+        torpedoes = self.__torpedoes
+        asteroids = self.__asteroids
+        torpedoes.move(self.get_screen_bounds())
+        torpedoes.count_down()
+
+        exploded = set()
+        for torpedo, asteroid in find_collisions(self.__grid, asteroids, torpedoes):
+            if self.__game_over:
+                return
+            if not asteroids.has(asteroid):
+                continue
+            size = asteroid.get_size()
+            self.update_score(size)
+            if size >= self.MIN_SPLIT_SIZE:
+                self.split_asteroid(asteroid, torpedo)
+            else:
+                self.__destroy_asteroid(asteroid)
+            exploded.add(torpedo)
+
+        # removed torpedoes stay in table until the end of the loop
+        for torpedo in torpedoes.views:
+            if torpedo.get_lifetime() <= 0 or torpedo in exploded:
                 self.__disarm_torpedo(torpedo)
 
     def check_game_status(self):
@@ -328,7 +678,7 @@ class GameRunner:
         title, msg = "", ""
         if self._screen.should_end():
             title, msg = self.TITLE_QUIT_GAME, self.MSG_QUIT_GAME
-        if not self.__asteroids:
+        if not len(self.__asteroids):
             title, msg = self.TITLE_WIN, self.MSG_WIN + str(self.get_score())
         elif self.__ship_life == self.DEAD:
             self.end_game(self.TITLE_LOST, self.MSG_LOST)
@@ -352,58 +702,288 @@ class GameRunner:
         This method will end the game with an informative msg as given in param
         according to scenarios listed in check game status method,
         and end the game (exit GUI).
+        In headless mode the game is only flagged as over, and the process
+        is not exited.
         :param title: title for windowed msg
         :param msg: msg for windowed msg
         """
+        if self.__game_over:
+            return
+        self.__game_over = True
+        if self.__recorder:
+            self.__recorder.close()
+        if self.__profiler is not None and not self.__headless:
+            print(self.__profiler.get_report())
         self._screen.show_message(title, msg)
         self._screen.end_game()
-        sys.exit()
+        if not self.__headless:
+            sys.exit()
 
     def run(self):
         self._do_loop()
         self._screen.start_screen()
 
+    def step(self, inputs, draw=True):
+        """
+        This method runs one loop of the game in headless mode, and draws it.
+        :param inputs: input bitmask of keys pressed in this loop, as defined
+        in controls.py
+        :type inputs: int
+        :param draw: False to skip drawing (for ex. when no one looks at it)
+        :return: True if game is still on after this loop, else False
+        """
+        if self.__game_over:
+            return False
+        self._screen.set_input(inputs)
+        self.__loop()
+        if draw:
+            self.render()
+        return not self.__game_over
+
     def _do_loop(self):
-        # You don't need to change this method!
-        self._game_loop()
+        if self.__rewind is not None and self.__scrub():
+            # Game is paused on a rewound state
+            wait = self.TICK_MS
+        else:
+            # Steps the loops that are due and draws, see scheduler.py
+            wait = self.__scheduler.advance()
+
+        # Set the timer to go off when next loop is due
+        self._screen.ontimer(self._do_loop, wait)
+
+    def __scrub(self):
+        """
+        This method moves the cursor of the rewind buffer by the rewind and
+        forward keys pressed (REWIND_STEP loops for each press), and shows
+        the state at cursor.
+        Game is paused as long as cursor is before the newest state. Resume
+        key goes on with the game from the state at cursor, newer states are
+        dropped and recording stops, since the game no longer follows the
+        recorded input.
+        When the game goes on, the scheduler is reset, so the time it was
+        paused is not stepped as loops that are due.
+        :return: True if game is paused on a rewound state, else False
+        """
+        rewind = self.__rewind
+        was_paused = rewind.is_rewound()
+        steps = 0
+        while self._screen.is_rewind_pressed():
+            steps -= self.REWIND_STEP
+        while self._screen.is_forward_pressed():
+            steps += self.REWIND_STEP
+        if steps:
+            self.restore(rewind.move(steps))
+            self.render()
+            self._screen.update()
+        if self._screen.is_resume_pressed() and rewind.is_rewound():
+            rewind.resume()
+            if self.__recorder:
+                self.__recorder.close()
+                self.__recorder = None
+        if self._screen.should_end():
+            self.check_game_status()
+        paused = rewind.is_rewound()
+        if was_paused and not paused:
+            self.__scheduler.reset()
+        return paused
+
+    def __render_frame(self, alpha):
+        """
+        This method draws a frame and updates the screen.
+        :param alpha: fraction of a loop passed since last loop, in [0, 1)
+        """
+        self.render(alpha)
+        self._screen.update()
 
-        # Set the timer to go off again
+    def __profiled_render_frame(self, alpha):
+        """
+        This method draws a frame and updates the screen (see __render_frame),
+        timed by the profiler. Every PROFILER_OVERLAY_FRAMES frames, the
+        profiler overlay next to the game is updated.
+        :param alpha: fraction of a loop passed since last loop, in [0, 1)
+        """
+        profiler = self.__profiler
+        clock = time.perf_counter_ns
+        start = clock()
+        self.render(alpha)
+        render_end = clock()
         self._screen.update()
-        self._screen.ontimer(self._do_loop,5)
+        end = clock()
+        profiler.add("render", render_end - start)
+        profiler.add("update", end - render_end)
+        profiler.add_frame(end)
+        if self.__scheduler.frames % self.PROFILER_OVERLAY_FRAMES == 0:
+            self._screen.set_overlay(profiler.get_overlay(
+                len(self.__asteroids), len(self.__torpedoes)))
+
+    def render(self, alpha=1):
+        """
+        This method draws ship, asteroids and torpedoes on screen, as one
+        frame (Screen.draw_frame gets the arrays of all objects at once).
+        Objects are drawn in between their previous and current positions,
+        according to alpha, so the movement looks smooth when drawing is not
+        at the same times as the loops.
+        :param alpha: fraction of the way from previous positions to current
+        positions, 1 (default) draws current positions.
+        """
+        bounds = self.get_screen_bounds()
+        ships, asteroids, torpedoes = self.__world.ships, self.__asteroids, \
+            self.__torpedoes
+        xs, ys = ships.interpolate(bounds, alpha)
+        ship_state = (xs[0], ys[0], ships.heading[0]) if len(ships) else None
+        xs, ys = asteroids.interpolate(bounds, alpha)
+        asteroid_array = (asteroids.handles, xs, ys)
+        xs, ys = torpedoes.interpolate(bounds, alpha)
+        torpedo_array = (torpedoes.handles, xs, ys, torpedoes.heading)
+        self._screen.draw_frame(ship_state, asteroid_array, torpedo_array)
 
     def _game_loop(self):
         """
         This method is the game loop. it runs on set times and so reacting
         passively to user.
         For each loop this method:
-        1) Draws the ship on screen and adjusts ship movement.
+        1) Adjusts ship movement.
         2) Initiates asteroid sequence.
         3) Initiates torpedo sequence.
         4) Checks game status.
+        5) Removes the objects destroyed in this loop from the world tables,
+        and gives them back to their pools.
+        Input of the loop is recorded if a recorder is set, and the recorder
+        is told when the loop ended (for saving state of the game).
+        State of the game is pushed to the rewind buffer if one is set.
+        Drawing is not part of the loop, see render method.
+        Same phases are run by __profiled_game_loop, timed.
+        """
+        self.__start_loop()
+        self.ship.move()
+        self.asteroid_sequence()
+        self.torpedo_sequence()
+        self.check_game_status()
+        self.__end_loop()
+
+    def __start_loop(self):
+        """
+        This method starts a loop: counts it, and reacts to (and records)
+        user input.
         """
-        self._screen.draw_ship(self.ship.get_x(),
-                               self.ship.get_y(), self.ship.get_heading())
-        self.interact_user_input()
+        self.__ticks += 1
+        inputs = self.interact_user_input()
+        if self.__recorder:
+            self.__recorder.record(inputs)
+
+    def __end_loop(self):
+        """
+        This method ends a loop: gives removed objects back to their pools,
+        and tells the recorder and rewind buffer the loop ended.
+        """
+        self.__recycle()
+        if self.__recorder and not self.__game_over:
+            self.__recorder.end_tick(self)
+        if self.__rewind is not None and not self.__game_over:
+            self.__rewind.push(self.snapshot())
+
+    def __profiled_game_loop(self):
+        """
+        This method is the game loop (see _game_loop) with each of its phases
+        timed by the profiler.
+        """
+        profiler = self.__profiler
+        clock = time.perf_counter_ns
+        start = clock()
+        self.__start_loop()
+        input_end = clock()
         self.ship.move()
+        ship_end = clock()
         self.asteroid_sequence()
+        asteroids_end = clock()
         self.torpedo_sequence()
+        torpedoes_end = clock()
         self.check_game_status()
+        status_end = clock()
+        self.__end_loop()
+        end = clock()
+        event_ns = self._screen.input_event_ns
+        if event_ns is not None:
+            profiler.add("latency", input_end - event_ns)
+        profiler.add("input", input_end - start)
+        profiler.add("ship", ship_end - input_end)
+        profiler.add("asteroids", asteroids_end - ship_end)
+        profiler.add("torpedoes", torpedoes_end - asteroids_end)
+        profiler.add("status", status_end - torpedoes_end)
+        profiler.add("end", end - status_end)
+        profiler.add_tick(end - start)
 
 ############################################################
 # MAIN
 ############################################################
 
 
-def main(amnt):
+def main(amnt, canvas=False, seed=None, record=None,
+         rewind_mb=DEFAULT_REWIND_MB, profile=False):
     """
     main func. runs game.
     :param amnt: number of asteroids
+    :param canvas: True to draw with CanvasScreen instead of turtles
+    :param seed: seed of the game, random if not given
+    :param record: path of a replay file to record the game to
+    :param rewind_mb: memory cap of the rewind buffer in MB, 0 for no rewind
+    :param profile: True to time the phases of loops and frames, and show
+    frame times next to the game
     """
-    runner = GameRunner(amnt)
+    screen = None
+    if canvas:
+        from canvas_screen import CanvasScreen
+        screen = CanvasScreen()
+    runner = GameRunner(amnt, screen, seed)
+    if record:
+        from replay import ReplayRecorder
+        runner.set_recorder(ReplayRecorder(record, runner, amnt))
+    if rewind_mb > 0:
+        runner.set_rewind(RewindBuffer(int(rewind_mb * MB)))
+    if profile:
+        runner.set_profiler(TickProfiler())
     runner.run()
 
+
+def parse_args(argv):
+    """
+    This function parses command line args of main.
+    :param argv: command line args (without program name)
+    :return: parsed args namespace
+    """
+    # argparse is imported only for the command line, it is slow to import
+    # and GameRunner does not need it
+    import argparse
+
+    def seed_type(text):
+        """
+        :return: the seed in text as int
+        :raise argparse.ArgumentTypeError: if it is not an int a replay header
+        can hold (0 to MAX_SEED - 1)
+        """
+        seed = int(text)
+        if not 0 <= seed < MAX_SEED:
+            raise argparse.ArgumentTypeError(
+                "seed must be between 0 and %d" % (MAX_SEED - 1))
+        return seed
+
+    parser = argparse.ArgumentParser(description="Asteroids!")
+    parser.add_argument("amnt", type=int, nargs="?",
+                        default=DEFAULT_ASTEROIDS_NUM, help="number of asteroids")
+    parser.add_argument("--canvas", action="store_true",
+                        help="draw with the canvas render backend")
+    parser.add_argument("--seed", type=seed_type, help="seed of the game")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record a replay of the game to PATH")
+    parser.add_argument("--rewind-mb", type=float, default=DEFAULT_REWIND_MB,
+                        help="memory cap of the rewind buffer in MB, "
+                             "0 for no rewind")
+    parser.add_argument("--profile", action="store_true",
+                        help="time loops and frames, show frame times next to "
+                             "the game and print them at the end")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        main( int( sys.argv[1] ) )
-    else:
-        main( DEFAULT_ASTEROIDS_NUM )
+    args = parse_args(sys.argv[1:])
+    main(args.amnt, args.canvas, args.seed, args.record, args.rewind_mb,
+         args.profile)
@@ -0,0 +1,426 @@
+############################################################
+# FILE : batch_env.py
+
+# DESCRIPTION: This file contains BatchEnv class, N games of Asteroids! run
+# headless in lockstep, for training and evaluating autopilots (bots).
+# Each step takes an action for each game (an input bitmask, see controls.py:
+# left, right, thrust (up) and fire, as in GameRunner.interact_user_input),
+# runs one loop of every game, and returns:
+# observations - for each kind of object (ships, asteroids, torpedoes) and
+#                each column of its table (see world.py), an array shaped
+#                [N, entities] (row i holds game i), empty slots are all 0
+#                (radius 0 marks an empty slot)
+# rewards - points each game got in this loop (see INTERCEPTION_POINTS)
+# dones - for each game, True if it ended in this loop
+# A game that ended is started again (with a new seed) at the next step.
+#
+# The objects of all games are kept in NumPy arrays shaped [N, rows], one for
+# each column of each kind, and a loop of all games is a few whole-batch
+# operations on them: moving, counting down torpedoes lifetime, and the
+# collisions of every ship with the asteroids of its game ([N, asteroids])
+# and of every torpedo with the asteroids of its game ([N, torpedoes,
+# asteroids]), so games never collide with each other. The rules are the ones
+# of GameRunner (same formulas, same order), only the per game choices (which
+# hits count, which asteroids split and where new rows go) are made with
+# masks and cumulative sums over the batch.
+# Games are started by a GameRunner with the game's seed (so a game starts
+# as GameRunner starts it) and then copied to the arrays.
+# NumPy is only needed by this file, the game itself does not use it.
+############################################################
+# Imports
+############################################################
+import math
+import random
+
+import numpy as np
+
+import controls
+from asteroid import Asteroid
+from asteroids_main import GameRunner, MAX_SEED
+from headless_screen import HeadlessScreen
+from ship import Ship
+from torpedo import Torpedo
+from world import EntityTable
+############################################################
+# BatchEnv class
+############################################################
+
+
+class BatchEnv:
+    """
+    A class representing a batch of N headless games run in lockstep.
+    Observation arrays are NumPy arrays shaped [N, entities]: column c of
+    object j of game i is observations[kind][c][i, j], while entities is the
+    max number of objects of that kind in a game (see get_entities).
+    Observation arrays are views of the arrays the games are kept in, each
+    step overwrites them (and they must not be written to).
+    Asteroids arrays have more rows than entities: asteroids split in a loop
+    are added before the destroyed ones are removed at the end of it.
+    """
+    KINDS = ("ships", "asteroids", "torpedoes")
+    DEGREES_TO_RAD = math.pi / 180
+
+    def __init__(self, n, asteroids_amnt, seed=None):
+        """
+        BatchEnv object constructor, starts N games.
+        :param n: number of games
+        :param asteroids_amnt: number of asteroids each game starts with
+        :param seed: seed of the seeds of the games, random if not given
+        """
+        self.n = n
+        self.asteroids_amnt = asteroids_amnt
+        self.__seeds = random.Random(seed)
+        runner = self.__new_runner()
+        self.__bounds = runner.get_screen_bounds()
+        max_asteroids = runner.get_max_asteroids(asteroids_amnt)
+        self.__entities = {"ships": 1,
+                           "asteroids": max_asteroids,
+                           "torpedoes": GameRunner.TORPEDO_LIMIT}
+        rows = dict(self.__entities, asteroids=2 * max_asteroids)
+        self.__tables = {
+            kind: {column: np.zeros((n, kind_rows))
+                   for column in EntityTable.COLUMNS}
+            for kind, kind_rows in rows.items()}
+        self.__counts = {kind: np.zeros(n, dtype=np.intp)
+                         for kind in self.KINDS}
+        self.observations = {
+            kind: {column: values[:, :self.__entities[kind]]
+                   for column, values in self.__tables[kind].items()}
+            for kind in self.KINDS}
+        self.__ticks = np.zeros(n, dtype=np.int64)
+        self.__scores = np.zeros(n, dtype=np.int64)
+        self.__lives = np.zeros(n, dtype=np.int64)
+        self.__invulnerable_until = np.zeros(n, dtype=np.int64)
+        self.__points = np.zeros(max(GameRunner.INTERCEPTION_POINTS) + 1,
+                                 dtype=np.int64)
+        for size, points in GameRunner.INTERCEPTION_POINTS.items():
+            self.__points[size] = points
+        self.rewards = np.zeros(n)
+        self.dones = np.zeros(n, dtype=bool)
+        self.__start(0, runner)
+        for i in range(1, n):
+            self.__start(i, self.__new_runner())
+
+    def get_entities(self, kind):
+        """
+        :param kind: kind of objects, one of KINDS
+        :return: max number of objects of kind in a game, the size of a row
+        in observation arrays of kind
+        """
+        return self.__entities[kind]
+
+    def get_counts(self, kind):
+        """
+        :param kind: kind of objects, one of KINDS
+        :return: number of objects of kind in each game (array of N ints)
+        """
+        return self.__counts[kind]
+
+    def get_scores(self):
+        """
+        :return: score of each game (array of N ints)
+        """
+        return self.__scores
+
+    def get_lives(self):
+        """
+        :return: ship lives of each game (array of N ints)
+        """
+        return self.__lives
+
+    def reset(self, i=None):
+        """
+        This method starts game i (all games if not given) again, with a new
+        seed.
+        :return: observations
+        """
+        for j in range(self.n) if i is None else [i]:
+            self.__start(j, self.__new_runner())
+        return self.observations
+
+    def __new_runner(self):
+        """
+        :return: a new headless GameRunner, with the next seed
+        """
+        return GameRunner(self.asteroids_amnt, HeadlessScreen(),
+                          self.__seeds.randrange(MAX_SEED))
+
+    def __start(self, i, runner):
+        """
+        This method copies a new game to row i of the arrays.
+        :param runner: GameRunner of the new game
+        """
+        state = runner.snapshot()
+        for kind in self.KINDS:
+            values = getattr(state, kind)
+            rows = len(values) // len(EntityTable.COLUMNS)
+            for column, table_values in self.__tables[kind].items():
+                table_values[i, :rows] = \
+                    EntityTable.get_snapshot_column(values, column)
+                table_values[i, rows:] = 0
+            self.__counts[kind][i] = rows
+        self.__ticks[i] = state.ticks
+        self.__scores[i] = state.score
+        self.__lives[i] = state.lives
+        self.__invulnerable_until[i] = state.invulnerable_until
+        self.dones[i] = False
+
+    def step(self, actions):
+        """
+        This method runs one loop of every game, games that ended in the
+        previous step are started again first.
+        Phases are the ones of GameRunner._game_loop, each one for all games
+        at once.
+        :param actions: input bitmask for each game (sequence of N ints)
+        :return: observations, rewards, dones
+        """
+        for i in np.flatnonzero(self.dones):
+            self.reset(i)
+        actions = np.asarray(actions)
+        scores = self.__scores.copy()
+        self.__ticks += 1
+        self.__interact(actions)
+        ships = self.__tables["ships"]
+        self.__move(ships)
+        self.__move(self.__tables["asteroids"])
+        removed = self.__ship_hits()
+        self.__move(self.__tables["torpedoes"])
+        self.__tables["torpedoes"]["life"] -= 1
+        removed, exploded = self.__torpedo_hits(removed)
+        self.__remove("asteroids", *removed)
+        self.__remove("torpedoes", *self.__get_disarmed(exploded))
+        np.subtract(self.__scores, scores, out=self.rewards)
+        return self.observations, self.rewards, self.dones
+
+    def __interact(self, actions):
+        """
+        This method turns, accelerates and fires for all games, as
+        GameRunner.interact_user_input does with the input of a game.
+        :param actions: array of N input bitmasks
+        """
+        ships = self.__tables["ships"]
+        heading = ships["heading"][:, 0]
+        heading[(actions & controls.LEFT) != 0] += Ship.TURN_LEFT_DEGREE
+        heading[(actions & controls.RIGHT) != 0] += Ship.TURN_RIGHT_DEGREE
+        up = (actions & controls.UP) != 0
+        rad = heading[up] * self.DEGREES_TO_RAD
+        ships["vx"][up, 0] += np.cos(rad)
+        ships["vy"][up, 0] += np.sin(rad)
+
+        counts = self.__counts["torpedoes"]
+        games = np.flatnonzero(((actions & controls.FIRE) != 0) &
+                               (counts < GameRunner.TORPEDO_LIMIT))
+        rows = counts[games]
+        torpedoes = self.__tables["torpedoes"]
+        rad = heading[games] * self.DEGREES_TO_RAD
+        torpedoes["x"][games, rows] = ships["x"][games, 0]
+        torpedoes["y"][games, rows] = ships["y"][games, 0]
+        torpedoes["vx"][games, rows] = ships["vx"][games, 0] + \
+            Torpedo.ACCELERATION_FACTOR * np.cos(rad)
+        torpedoes["vy"][games, rows] = ships["vy"][games, 0] + \
+            Torpedo.ACCELERATION_FACTOR * np.sin(rad)
+        torpedoes["radius"][games, rows] = Torpedo.RADIUS
+        torpedoes["life"][games, rows] = GameRunner.TORPEDO_LIFETIME
+        torpedoes["heading"][games, rows] = heading[games]
+        counts[games] += 1
+
+    def __move(self, table):
+        """
+        This method moves all objects of a kind in all games, with the
+        formula of EntityTable.move (empty slots stay at 0).
+        :param table: dict of column arrays
+        """
+        (min_x, max_x), (min_y, max_y) = self.__bounds
+        table["x"][:] = (table["vx"] + table["x"] - min_x) % (max_x - min_x) \
+            + min_x
+        table["y"][:] = (table["vy"] + table["y"] - min_y) % (max_y - min_y) \
+            + min_y
+
+    def __get_swept(self, dx, dy, dvx, dvy):
+        """
+        This method is collision.get_swept_distance for arrays: closest
+        squared distance of pairs during the last loop. dx, dy are wrapped
+        to the shortest distance on the screen first.
+        :return: array of closest squared distances
+        """
+        (min_x, max_x), (min_y, max_y) = self.__bounds
+        for d, dif in ((dx, max_x - min_x), (dy, max_y - min_y)):
+            d[d > dif / 2] -= dif
+            d[d < -dif / 2] += dif
+        squared_speed = dvx * dvx + dvy * dvy
+        moving = squared_speed != 0
+        t = np.zeros_like(squared_speed)
+        np.divide(-(dx * dvx + dy * dvy), squared_speed, out=t, where=moving)
+        np.clip(t, -1, 0, out=t)
+        dx += dvx * t
+        dy += dvy * t
+        return dx * dx + dy * dy
+
+    def __ship_hits(self):
+        """
+        This method finds the asteroids hitting the ship of each game, as
+        GameRunner.asteroid_sequence: hits count in row order, while the game
+        is not over (lives or asteroids run out) and the ship is not
+        invulnerable (after a hit, if INVULNERABLE_TICKS).
+        :return: (games, rows) of the destroyed asteroids
+        """
+        ships = self.__tables["ships"]
+        asteroids = self.__tables["asteroids"]
+        counts = self.__counts["asteroids"]
+        used = counts.max()
+        x, y = asteroids["x"][:, :used], asteroids["y"][:, :used]
+        vx, vy = asteroids["vx"][:, :used], asteroids["vy"][:, :used]
+        hit = self.__get_swept(x - ships["x"], y - ships["y"],
+                               vx - ships["vx"], vy - ships["vy"]) <= \
+            (asteroids["radius"][:, :used] + Ship.RADIUS) ** 2
+        hit &= np.arange(used) < counts[:, None]
+        hit &= (self.__ticks >= self.__invulnerable_until)[:, None]
+        if GameRunner.INVULNERABLE_TICKS > 0:
+            limit = 1
+        else:
+            limit = np.minimum(self.__lives, counts)[:, None]
+        hit &= np.cumsum(hit, axis=1) <= limit
+        hits = hit.sum(axis=1)
+        self.__lives -= hits
+        self.__invulnerable_until[hits > 0] = \
+            self.__ticks[hits > 0] + GameRunner.INVULNERABLE_TICKS
+        self.dones |= (self.__lives == GameRunner.DEAD) | (hits == counts)
+        return np.nonzero(hit)
+
+    def __torpedo_hits(self, removed):
+        """
+        This method finds the torpedoes hitting the asteroids of each game
+        that is not over, as GameRunner.torpedo_sequence: an asteroid hit by
+        several torpedoes is hit by the first one (by row), which explodes,
+        and the score is updated and asteroids split or are destroyed.
+        Asteroids destroyed by the ship in this loop are not hit.
+        :param removed: (games, rows) of asteroids destroyed in this loop
+        :return: (games, rows) of all asteroids destroyed in this loop, in
+        order of destruction in each game, and [N, rows] mask of exploded
+        torpedoes
+        """
+        asteroids = self.__tables["asteroids"]
+        torpedoes = self.__tables["torpedoes"]
+        counts = self.__counts["asteroids"]
+        used = counts.max()
+        used_torpedoes = self.__counts["torpedoes"].max()
+        exploded = np.zeros(torpedoes["x"].shape, dtype=bool)
+        if not used or not used_torpedoes:
+            return removed, exploded
+        x, y = asteroids["x"][:, None, :used], asteroids["y"][:, None, :used]
+        vx = asteroids["vx"][:, None, :used]
+        vy = asteroids["vy"][:, None, :used]
+        tx = torpedoes["x"][:, :used_torpedoes, None]
+        ty = torpedoes["y"][:, :used_torpedoes, None]
+        tvx = torpedoes["vx"][:, :used_torpedoes, None]
+        tvy = torpedoes["vy"][:, :used_torpedoes, None]
+        hit = self.__get_swept(x - tx, y - ty, vx - tvx, vy - tvy) <= \
+            (asteroids["radius"][:, None, :used] +
+             torpedoes["radius"][:, :used_torpedoes, None]) ** 2
+        alive = np.arange(used) < counts[:, None]
+        alive[removed] = False
+        alive &= ~self.dones[:, None]
+        hit &= alive[:, None, :]
+        hit &= (np.arange(used_torpedoes) <
+                self.__counts["torpedoes"][:, None])[:, :, None]
+        is_hit = hit.any(axis=1)
+        first = hit.argmax(axis=1)
+        games, rows = np.nonzero(is_hit)
+        if not len(games):
+            return removed, exploded
+        by_torpedo = first[games, rows]
+        exploded[games, by_torpedo] = True
+        # by torpedo, then by asteroid row (GameRunner takes the asteroids
+        # of a torpedo in grid order, so split rows may be in another order)
+        order = np.lexsort((rows, by_torpedo, games))
+        games, rows, by_torpedo = games[order], rows[order], by_torpedo[order]
+        sizes = asteroids["size"][games, rows].astype(np.intp)
+        np.add.at(self.__scores, games, self.__points[sizes])
+        split = sizes >= GameRunner.MIN_SPLIT_SIZE
+        self.__split(games[split], rows[split], by_torpedo[split])
+        counts_after = counts - np.bincount(games[~split], minlength=self.n)
+        counts_after -= np.bincount(removed[0], minlength=self.n)
+        self.dones |= counts_after == 0
+        return (np.concatenate((removed[0], games)),
+                np.concatenate((removed[1], rows))), exploded
+
+    def __split(self, games, rows, by_torpedo):
+        """
+        This method adds the asteroids split from hit asteroids, as
+        GameRunner.split_asteroid (with Asteroid.collision_acceleration and
+        set_split_ways): each one gets SPLIT_VALUES new asteroids, added
+        after the last rows of its game in order.
+        :param games, rows: hit asteroids, in order of hits in each game
+        :param by_torpedo: row of the torpedo that hit each asteroid
+        """
+        if not len(games):
+            return
+        asteroids = self.__tables["asteroids"]
+        torpedoes = self.__tables["torpedoes"]
+        counts = self.__counts["asteroids"]
+        splits = len(GameRunner.SPLIT_VALUES)
+        first = np.searchsorted(games, games)
+        new_rows = counts[games] + (np.arange(len(games)) - first) * splits
+        vx, vy = asteroids["vx"][games, rows], asteroids["vy"][games, rows]
+        # same pow as collision_acceleration, so speeds are the same floats
+        divisor = np.array([(speed_x ** 2 + speed_y ** 2) ** 0.5 for
+                            speed_x, speed_y in zip(vx.tolist(), vy.tolist())])
+        new_vx = (torpedoes["vx"][games, by_torpedo] + vx) / divisor
+        new_vy = (torpedoes["vy"][games, by_torpedo] + vy) / divisor
+        size = asteroids["size"][games, rows] - 1
+        x, y = asteroids["x"][games, rows], asteroids["y"][games, rows]
+        for i, split_value in enumerate(GameRunner.SPLIT_VALUES):
+            new = new_rows + i
+            asteroids["x"][games, new] = x
+            asteroids["y"][games, new] = y
+            asteroids["vx"][games, new] = new_vx * split_value
+            asteroids["vy"][games, new] = new_vy * split_value
+            asteroids["size"][games, new] = size
+            asteroids["radius"][games, new] = \
+                size * Asteroid.SIZE_COEFFICIENT - Asteroid.NORMALIZING_FACTOR
+        counts += np.bincount(games, minlength=self.n) * splits
+
+    def __get_disarmed(self, exploded):
+        """
+        :param exploded: [N, rows] mask of torpedoes exploded in this loop
+        :return: (games, rows) of torpedoes out of lifetime or exploded in
+        this loop, in row order in each game
+        """
+        torpedoes = self.__tables["torpedoes"]
+        disarmed = (torpedoes["life"] <= 0) | exploded
+        disarmed &= np.arange(disarmed.shape[1]) < \
+            self.__counts["torpedoes"][:, None]
+        return np.nonzero(disarmed)
+
+    def __remove(self, kind, games, rows):
+        """
+        This method removes rows of objects of a kind, as EntityTable.flush
+        does: in order, each row by moving the last row of its game to its
+        place, so rows end in the same order as in the game's tables. Empty
+        slots are set to 0.
+        :param games, rows: removed rows (as they were before removing),
+        in order of removal in each game
+        """
+        table = self.__tables[kind]
+        counts = self.__counts[kind]
+        if len(games):
+            order = np.argsort(games, kind="stable")
+            games, rows = games[order], rows[order]
+            ranks = np.arange(len(games)) - np.searchsorted(games, games)
+            # row each row moves from, and row each original row is at
+            moved_from = np.tile(np.arange(table["x"].shape[1]), (self.n, 1))
+            rows_now = moved_from.copy()
+            for rank in range(ranks.max() + 1):
+                at_rank = ranks == rank
+                rank_games = games[at_rank]
+                row = rows_now[rank_games, rows[at_rank]]
+                last = counts[rank_games] - 1
+                moved = moved_from[rank_games, last]
+                moved_from[rank_games, row] = moved
+                rows_now[rank_games, moved] = row
+                counts[rank_games] -= 1
+            for values in table.values():
+                values[:] = np.take_along_axis(values, moved_from, axis=1)
+        empty = np.arange(table["x"].shape[1]) >= counts[:, None]
+        for values in table.values():
+            values[empty] = 0
@@ -0,0 +1,266 @@
+############################################################
+# FILE : bench.py
+
+# DESCRIPTION: This file contains Scenario and PhaseTimer classes and the
+# benchmark of the main loop of the Asteroids! game.
+# Each scenario runs a headless GameRunner (see headless_screen.py) with a
+# fixed seed and input, calling _game_loop and then render for a number of
+# loops, and reports:
+# ticks per second, p50 / p99 latency of a loop (_game_loop), the time of
+# asteroid_sequence, torpedo_sequence and render in each loop, and peak
+# memory (tracemalloc) of the game.
+# Memory is measured in a second run of the scenario, since tracemalloc
+# slows the game down.
+# Ship lives are not limited in scenarios, so the game does not end before
+# the scenario does.
+#
+# Main Function: runs all scenarios (or the given ones), prints a table and
+# writes results as json (--output), for comparing between commits
+# (--compare OLD.json prints the change in ticks per second).
+############################################################
+# Imports
+############################################################
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import controls
+from asteroids_main import GameRunner
+from headless_screen import HeadlessScreen
+
+SEED = 1
+NS_IN_SECOND = 10 ** 9
+NS_IN_MS = 10 ** 6
+MEMORY_TICKS = 100
+############################################################
+# Scenario class
+############################################################
+
+
+class Scenario:
+    """
+    A class representing a benchmark scenario: number of asteroids, number of
+    loops, the input bitmask of every loop and GameRunner consts to change.
+    """
+
+    def __init__(self, name, asteroids_amnt, ticks, inputs=controls.NO_INPUT,
+                 **constants):
+        """
+        Scenario object constructor
+        :param constants: GameRunner consts of the scenario, for ex.
+        TORPEDO_LIMIT=200
+        """
+        self.name = name
+        self.asteroids_amnt = asteroids_amnt
+        self.ticks = ticks
+        self.inputs = inputs
+        self.constants = dict(INITIAL_LIVES=sys.maxsize, **constants)
+
+    def new_runner(self):
+        """
+        :return: a new headless GameRunner of the scenario, a GameRunner
+        sub-class with the scenario consts
+        """
+        runner_class = type("BenchRunner", (GameRunner,), self.constants)
+        return runner_class(self.asteroids_amnt, HeadlessScreen(), SEED)
+
+
+SPIN_AND_FIRE = controls.LEFT | controls.FIRE
+SCENARIOS = [
+    Scenario("asteroids_5", 5, 5000),
+    Scenario("asteroids_100", 100, 2000),
+    Scenario("asteroids_1000", 1000, 300),
+    Scenario("asteroids_10000", 10000, 30),
+    Scenario("torpedo_saturation", 20, 3000, SPIN_AND_FIRE,
+             TORPEDO_LIFETIME=1000),
+    Scenario("split_cascade", 300, 300, SPIN_AND_FIRE, TORPEDO_LIMIT=300),
+]
+############################################################
+# PhaseTimer class
+############################################################
+
+
+class PhaseTimer:
+    """
+    A class representing a timed method of an object: it is set on the object
+    (instead of the class method) and keeps the time of each call, in ns.
+    """
+
+    def __init__(self, obj, name):
+        self.__method = getattr(obj, name)
+        self.times = []
+        setattr(obj, name, self)
+
+    def __call__(self, *args):
+        start = time.perf_counter_ns()
+        result = self.__method(*args)
+        self.times.append(time.perf_counter_ns() - start)
+        return result
+
+############################################################
+# Functions
+############################################################
+
+
+def percentile(times, fraction):
+    """
+    :param times: sorted list of numbers
+    :param fraction: in [0, 1]
+    :return: the number at fraction of times (nearest rank)
+    """
+    return times[min(len(times) - 1, int(fraction * len(times)))]
+
+
+def summarize(times):
+    """
+    :param times: list of times in ns
+    :return: dict of mean, p50 and p99 in ms
+    """
+    if not times:
+        return {"mean_ms": 0, "p50_ms": 0, "p99_ms": 0}
+    ordered = sorted(times)
+    return {"mean_ms": sum(times) / len(times) / NS_IN_MS,
+            "p50_ms": percentile(ordered, 0.5) / NS_IN_MS,
+            "p99_ms": percentile(ordered, 0.99) / NS_IN_MS}
+
+
+def run_ticks(runner, scenario, ticks):
+    """
+    This function runs loops of a scenario, each one is _game_loop and then
+    render, like a step in headless mode.
+    :return: list of time of each _game_loop (ns)
+    """
+    times = []
+    screen = runner._screen
+    for i in range(ticks):
+        if runner.is_game_over():
+            break
+        screen.set_input(scenario.inputs)
+        start = time.perf_counter_ns()
+        runner._game_loop()
+        times.append(time.perf_counter_ns() - start)
+        runner.render()
+    return times
+
+
+def measure_memory(scenario):
+    """
+    This function runs a scenario under tracemalloc.
+    :return: peak memory of the game (construction included) in bytes
+    """
+    tracemalloc.start()
+    runner = scenario.new_runner()
+    run_ticks(runner, scenario, min(scenario.ticks, MEMORY_TICKS))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def run_scenario(scenario):
+    """
+    This function runs a scenario.
+    :return: dict of its results
+    """
+    runner = scenario.new_runner()
+    phases = {name: PhaseTimer(runner, name)
+              for name in ("asteroid_sequence", "torpedo_sequence", "render")}
+    start = time.perf_counter_ns()
+    times = run_ticks(runner, scenario, scenario.ticks)
+    total = time.perf_counter_ns() - start
+    result = {"asteroids": scenario.asteroids_amnt,
+              "ticks": len(times),
+              "ticks_per_second": len(times) * NS_IN_SECOND / sum(times)
+              if times else 0,
+              "wall_seconds": total / NS_IN_SECOND,
+              "tick": summarize(times),
+              "phases": {name: summarize(timer.times)
+                         for name, timer in phases.items()},
+              "final_asteroids": len(runner.get_world().asteroids),
+              "final_torpedoes": len(runner.get_world().torpedoes),
+              "peak_memory_bytes": measure_memory(scenario)}
+    return result
+
+
+def get_commit():
+    """
+    :return: git commit hash of the code, None if not known
+    """
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"],
+                                       stderr=subprocess.DEVNULL,
+                                       universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(names=None):
+    """
+    This function runs the benchmark scenarios.
+    :param names: names of scenarios to run, all if not given
+    :return: dict of results (json ready)
+    """
+    results = {}
+    for scenario in SCENARIOS:
+        if not names or scenario.name in names:
+            results[scenario.name] = run_scenario(scenario)
+    return {"commit": get_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": SEED,
+            "scenarios": results}
+
+
+def print_results(report, old=None):
+    """
+    This function prints results as a table, with the change of ticks per
+    second from old results if given.
+    """
+    print("%-20s %8s %10s %9s %9s %9s %9s %9s %10s" %
+          ("scenario", "ticks", "ticks/s", "p50 ms", "p99 ms", "ast ms",
+           "torp ms", "render ms", "peak KB"))
+    for name, result in report["scenarios"].items():
+        phases = result["phases"]
+        line = "%-20s %8d %10.1f %9.3f %9.3f %9.3f %9.3f %9.3f %10.1f" % (
+            name, result["ticks"], result["ticks_per_second"],
+            result["tick"]["p50_ms"], result["tick"]["p99_ms"],
+            phases["asteroid_sequence"]["mean_ms"],
+            phases["torpedo_sequence"]["mean_ms"],
+            phases["render"]["mean_ms"], result["peak_memory_bytes"] / 1024)
+        if old and name in old["scenarios"]:
+            before = old["scenarios"][name]["ticks_per_second"]
+            if before:
+                line += " %+7.1f%%" % ((result["ticks_per_second"] / before - 1)
+                                       * 100)
+        print(line)
+
+
+def main(argv):
+    """
+    main func. runs benchmark and prints / writes its results.
+    :param argv: command line args (without program name)
+    """
+    parser = argparse.ArgumentParser(description="Asteroids! loop benchmark")
+    parser.add_argument("scenarios", nargs="*",
+                        help="scenarios to run (all by default): " +
+                             ", ".join(scenario.name for scenario in SCENARIOS))
+    parser.add_argument("--output", metavar="PATH",
+                        help="write results (json) to PATH")
+    parser.add_argument("--compare", metavar="PATH",
+                        help="results (json) of an older run to compare to")
+    args = parser.parse_args(argv)
+    old = None
+    if args.compare:
+        with open(args.compare) as old_file:
+            old = json.load(old_file)
+    report = run_benchmark(args.scenarios)
+    print_results(report, old)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,139 @@
+############################################################
+# FILE : canvas_screen.py
+
+# DESCRIPTION: This file contains CanvasScreen class, a render backend of the
+# Asteroids! game that draws ship, asteroids and torpedoes straight on the
+# tkinter canvas, instead of with a turtle for each object.
+# Each object gets one canvas polygon, made from its ShapesMaster layout,
+# and drawing it is a single coords() call, only if the object moved or
+# turned since it was last drawn (a whole frame is drawn with draw_frame).
+# Layouts rotated to a heading are taken from a cache (see shape_cache.py),
+# so drawing only adds the position.
+# Un-registered polygons are hidden and kept for re-use by the next object
+# of the same shape.
+# Public methods are the same as Screen's (it is a Screen), so GameRunner
+# does not need to know which backend it runs with.
+############################################################
+# Imports
+############################################################
+from screen import Screen, ShapesMaster
+from shape_cache import RotatedShapeCache
+############################################################
+# CanvasScreen class
+############################################################
+
+
+class CanvasScreen(Screen):
+    """
+    A class representing a retained-mode canvas render backend.
+    Sprites are kept by entity id like in Screen, each sprite is a list of:
+    [canvas item, shape name, last x, last y, last heading]
+    Shapes are drawn like turtle does: layout is in pixels, its y axis is
+    the heading direction, and it is rotated to the heading.
+    """
+    ITEM = 0
+    SHAPE = 1
+    LAST_X = 2
+    LAST_Y = 3
+    LAST_HEADING = 4
+    ASTEROID_COLOR = "black"
+    SHIP_COLOR = "purple"
+    TORPEDO_COLOR = "blue"
+    OUTLINE_WIDTH = 1
+
+    def __init__(self):
+        """
+        This inits the canvas graphics, on top of Screen's widgets.
+        The turtle of the ship is hidden, ship is drawn as a polygon as well.
+        """
+        Screen.__init__(self)
+        self._rotated = RotatedShapeCache(self._shapeMaster.get_shapes_dict())
+        self._rotated.preload(ShapesMaster.SHIP_SHAPE)
+        self._rotated.preload(ShapesMaster.TORPEDO_SHAPE)
+        self._ship.ht()
+        self._ship_sprite = self._new_sprite(ShapesMaster.SHIP_SHAPE,
+                                             CanvasScreen.SHIP_COLOR)
+
+    def _new_sprite(self, shape, color):
+        free = self._free_sprites.get(shape)
+        if free:
+            sprite = free.pop()
+            self._cv.itemconfigure(sprite[CanvasScreen.ITEM], state="normal")
+            self._dirty = True
+            return sprite
+        item = self._cv.create_polygon(0, 0, 0, 0, 0, 0, fill=color,
+                                       outline=color,
+                                       width=CanvasScreen.OUTLINE_WIDTH)
+        return [item, shape, None, None, None]
+
+    def _remove_sprite(self, sprite):
+        """
+        Hides the polygon of a sprite and keeps the sprite for re-use.
+        """
+        self._cv.itemconfigure(sprite[CanvasScreen.ITEM], state="hidden")
+        self._dirty = True
+        sprite[CanvasScreen.LAST_X] = None
+        self._free_sprites.setdefault(sprite[CanvasScreen.SHAPE], []).append(sprite)
+
+    def _draw_sprite(self, sprite, x, y, heading=0):
+        """
+        Moves the polygon of a sprite to (x, y) with the given heading,
+        with one coords() call. Does nothing if sprite did not move.
+        """
+        if sprite[CanvasScreen.LAST_X] == x and \
+                sprite[CanvasScreen.LAST_Y] == y and \
+                sprite[CanvasScreen.LAST_HEADING] == heading:
+            return
+        sprite[CanvasScreen.LAST_X] = x
+        sprite[CanvasScreen.LAST_Y] = y
+        sprite[CanvasScreen.LAST_HEADING] = heading
+        px, py = x * self._screen.xscale, -y * self._screen.yscale
+        cords = []
+        for ox, oy in self._rotated.get(sprite[CanvasScreen.SHAPE], heading):
+            cords.append(px + ox)
+            cords.append(py + oy)
+        self._cv.coords(sprite[CanvasScreen.ITEM], *cords)
+        self._dirty = True
+
+    def register_asteroid(self, asteroid_id, size):
+        if size not in [1,2,3]:
+            raise ValueError("Wrong asteroid size: %d" % size)
+        if asteroid_id in self._asteroids:
+            raise ValueError("Asteroid id (%d) already exists" % asteroid_id)
+        self._asteroids.add(asteroid_id, self._new_sprite(
+            ShapesMaster.ASTEROID_BASE_SHAPE%size, CanvasScreen.ASTEROID_COLOR))
+
+    def register_torpedo(self, torpedo_id):
+        if torpedo_id in self._torpedos:
+            raise ValueError("Torpedo id (%d) already exists" % torpedo_id)
+        self._torpedos.add(torpedo_id, self._new_sprite(
+            ShapesMaster.TORPEDO_SHAPE, CanvasScreen.TORPEDO_COLOR))
+
+    def draw_ship(self, x, y, heading):
+        self._draw_sprite(self._ship_sprite, x, y, heading)
+
+    def draw_frame(self, ship_state, asteroid_array, torpedo_array):
+        if ship_state is not None:
+            self._draw_sprite(self._ship_sprite, *ship_state)
+        for sprite, x, y, heading in self._asteroids.iter_moved(
+                *asteroid_array):
+            self._draw_sprite(sprite, x, y)
+        for sprite, x, y, heading in self._torpedos.iter_moved(
+                *torpedo_array):
+            self._draw_sprite(sprite, x, y, heading)
+
+    def draw_asteroid(self, asteroid_id, x, y):
+        sprite = self._asteroids.get_moved(asteroid_id, x, y)
+        if sprite is not None:
+            self._draw_sprite(sprite, x, y)
+
+    def draw_torpedo(self, torpedo_id, x, y, heading):
+        sprite = self._torpedos.get_moved(torpedo_id, x, y, heading)
+        if sprite is not None:
+            self._draw_sprite(sprite, x, y, heading)
+
+    def unregister_torpedo(self, torpedo_id):
+        self._remove_sprite(self._torpedos.pop(torpedo_id))
+
+    def unregister_asteroid(self, asteroid_id):
+        self._remove_sprite(self._asteroids.pop(asteroid_id))
@@ -0,0 +1,246 @@
+############################################################
+# FILE : collision.py
+
+# DESCRIPTION: This file contains SpatialHash class and find_collisions, find_hits
+# and helper funcs. for collision detection between objects in the Asteroids! game.
+# Broad phase: objects of one table are put in the cells of a uniform grid
+# over the screen bounds (once a loop, after they moved), and objects of the
+# other table, or the ship, only look in the cells around them, so only
+# nearby pairs are checked. Pairs further apart than the reach on one axis
+# are dropped before the narrow phase.
+# Narrow phase: objects collide if their squared distance is less/equal
+# than/to their squared radius sum (no square root is taken). The distance
+# checked is the closest one along the straight way both objects moved in the
+# last loop (swept), so fast torpedoes or ship do not pass through asteroids.
+# Screen wraps around on both axis (as objects move), so both phases use the
+# shortest distance on the wrapped screen: grid cells next to the edge are
+# neighbors of the cells on the other edge, and a distance on an axis that is
+# more than half the screen is taken the other way around.
+############################################################
+# Imports
+############################################################
+import math
+############################################################
+# SpatialHash class
+############################################################
+
+
+class SpatialHash:
+    """
+    A class representing a uniform grid over the screen bounds, wrapping
+    around on both axis. Cells are at least of the given cell size, and fit
+    the screen exactly so that wrapping keeps the cells in place.
+    Each cell holds the row indices of the objects whose center is in it.
+    consts AXIS_X, AXIS_Y, MIN, MAX are used for the structural implementation
+    of bounds arg.
+    """
+    AXIS_X = 0
+    AXIS_Y = 1
+    MIN = 0
+    MAX = 1
+
+    def __init__(self, bounds, cell_size):
+        """
+        SpatialHash object constructor
+        :param bounds: screen bounds as [(min_x, max_x), (min_y, max_y)]
+        :type bounds: list
+        :param cell_size: length of the side of one cell
+        :return: a new empty SpatialHash obj.
+        """
+        self.min_x = bounds[self.AXIS_X][self.MIN]
+        self.min_y = bounds[self.AXIS_Y][self.MIN]
+        self.dif_x = bounds[self.AXIS_X][self.MAX] - self.min_x
+        self.dif_y = bounds[self.AXIS_Y][self.MAX] - self.min_y
+        self.cols = max(1, int(self.dif_x // cell_size))
+        self.rows = max(1, int(self.dif_y // cell_size))
+        self.cell_width = self.dif_x / self.cols
+        self.cell_height = self.dif_y / self.rows
+        # cells in a unit of length, points are put in cells by multiplying
+        self.x_scale = self.cols / self.dif_x
+        self.y_scale = self.rows / self.dif_y
+        self.cells = dict()
+
+    def get_cell(self, x, y):
+        """
+        :return: (col, row) of the cell holding the (x, y) point, not wrapped
+        """
+        return math.floor((x - self.min_x) * self.x_scale), \
+            math.floor((y - self.min_y) * self.y_scale)
+
+    def build(self, xs, ys):
+        """
+        This method re-builds the grid from positions of objects. Cell of
+        each object is found as in get_cell (and wrapped), for all objects
+        at once.
+        :param xs: x coordinates of objects, by row index
+        :param ys: y coordinates of objects, by row index
+        """
+        floor = math.floor
+        cols, rows = self.cols, self.rows
+        min_x, min_y = self.min_x, self.min_y
+        x_scale, y_scale = self.x_scale, self.y_scale
+        keys = [floor((y - min_y) * y_scale) % rows * cols
+                + floor((x - min_x) * x_scale) % cols for x, y in zip(xs, ys)]
+        cells = dict()
+        for i, key in enumerate(keys):
+            if key in cells:
+                cells[key].append(i)
+            else:
+                cells[key] = [i]
+        self.cells = cells
+
+    def query(self, x, y, reach):
+        """
+        This method gets the objects that may be within reach of a point,
+        cells past the screen edge are taken from the other edge.
+        :param reach: max distance to look in, from point (x, y)
+        :return: list of row indices of objects in the cells around point
+        """
+        min_col, min_row = self.get_cell(x - reach, y - reach)
+        max_col, max_row = self.get_cell(x + reach, y + reach)
+        cols = [col % self.cols for col in
+                range(min_col, min(max_col, min_col + self.cols - 1) + 1)]
+        rows = [row % self.rows for row in
+                range(min_row, min(max_row, min_row + self.rows - 1) + 1)]
+        found = []
+        for row in rows:
+            for col in cols:
+                found.extend(self.cells.get(row * self.cols + col, ()))
+        return found
+
+
+############################################################
+# Functions
+############################################################
+
+
+def get_swept_distance(dx, dy, dvx, dvy):
+    """
+    This function gets the closest squared distance of two objects during
+    the last loop, as both moved in a straight line from their previous
+    position to their current one.
+    Distance at time t (t in [-1, 0], 0 is now): d + dv * t
+    Closest at t = -(d . dv) / (dv . dv), limited to [-1, 0].
+    :param dx, dy: current distance on each axis (wrapped)
+    :param dvx, dvy: speed of one object relative to the other
+    :return: closest squared distance
+    """
+    squared_speed = dvx * dvx + dvy * dvy
+    if squared_speed:
+        t = -(dx * dvx + dy * dvy) / squared_speed
+        t = min(max(t, -1), 0)
+        dx += dvx * t
+        dy += dvy * t
+    return dx * dx + dy * dy
+
+
+def get_max_speed(table):
+    """
+    :return: an upper bound of the speed of the fastest object in table
+    (from the fastest speed on each axis, so no speed is computed for each
+    object)
+    """
+    if not len(table.vx):
+        return 0
+    max_x = max(max(table.vx), -min(table.vx))
+    max_y = max(max(table.vy), -min(table.vy))
+    return (max_x * max_x + max_y * max_y)**0.5
+
+
+def get_reach(table):
+    """
+    :return: max distance at which an object of table can collide with a
+    point object that did not move: the biggest radius plus the max speed
+    """
+    return max(table.radius, default=0) + get_max_speed(table)
+
+
+def find_collisions(grid, table, others):
+    """
+    This function finds the collisions between objects of two tables.
+    Each object of others only checks the objects of table that are in the
+    cells of grid within its reach.
+    Collisions are checked along the way both objects moved in the last loop
+    (see get_swept_distance), so fast objects can not pass through others.
+    :param grid: grid built with the positions of table objects (see
+    SpatialHash.build)
+    :type grid: SpatialHash
+    :param table: table of objects, for ex. asteroids
+    :type table: EntityTable
+    :param others: table of objects to check against table, for ex. torpedoes
+    :type others: EntityTable
+    :return: list of (other view, table view) for each colliding pair
+    """
+    xs, ys, radii = table.x, table.y, table.radius
+    if not len(table) or not len(others):
+        return []
+    max_reach = get_reach(table)
+    candidates = [(j, i) for j, (x, y, radius, vx, vy) in
+                  enumerate(zip(others.x, others.y, others.radius,
+                                others.vx, others.vy))
+                  for i in grid.query(x, y, radius + max_reach
+                                      + (vx * vx + vy * vy)**0.5)]
+    dif_x, dif_y = grid.dif_x, grid.dif_y
+    half_x, half_y = dif_x / 2, dif_y / 2
+    pairs = []
+    for j, i in candidates:
+        dx = xs[i] - others.x[j]
+        dy = ys[i] - others.y[j]
+        if dx > half_x:
+            dx -= dif_x
+        elif dx < -half_x:
+            dx += dif_x
+        if dy > half_y:
+            dy -= dif_y
+        elif dy < -half_y:
+            dy += dif_y
+        if get_swept_distance(dx, dy, table.vx[i] - others.vx[j],
+                              table.vy[i] - others.vy[j]) \
+                <= (radii[i] + others.radius[j])**2:
+            pairs.append((others.views[j], table.views[i]))
+    return pairs
+
+
+def find_hits(grid, table, x, y, radius, speed):
+    """
+    This function finds the objects of a table colliding with one object,
+    for ex. the asteroids hitting the ship. Only the objects in the cells of
+    grid within reach of the object are checked, and of them only the ones
+    within reach on both axis get to the swept check (see find_collisions).
+    :param grid: grid built with the positions of table objects (see
+    SpatialHash.build)
+    :type grid: SpatialHash
+    :param x, y: coordinates of the object
+    :param radius: radius of the object
+    :param speed: speed of the object, (x, y)
+    :return: list of views of colliding objects in table, in table order
+    """
+    if not len(table):
+        return []
+    speed_x, speed_y = speed
+    reach = radius + (speed_x * speed_x + speed_y * speed_y)**0.5 + \
+        get_reach(table)
+    dif_x, dif_y = grid.dif_x, grid.dif_y
+    half_x, half_y = dif_x / 2, dif_y / 2
+    xs, ys, radii = table.x, table.y, table.radius
+    hits = []
+    for i in sorted(grid.query(x, y, reach)):
+        dx = xs[i] - x
+        if dx > half_x:
+            dx -= dif_x
+        elif dx < -half_x:
+            dx += dif_x
+        if dx > reach or dx < -reach:
+            continue
+        dy = ys[i] - y
+        if dy > half_y:
+            dy -= dif_y
+        elif dy < -half_y:
+            dy += dif_y
+        if dy > reach or dy < -reach:
+            continue
+        if get_swept_distance(dx, dy, table.vx[i] - speed_x,
+                              table.vy[i] - speed_y) \
+                <= (radii[i] + radius)**2:
+            hits.append(table.views[i])
+    return hits
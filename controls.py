@@ -0,0 +1,17 @@
+############################################################
+# FILE : controls.py
+
+# DESCRIPTION: This file contains the user input bitmask of the Asteroids! game.
+# Each key the game responds to has one bit, so the input of one loop of
+# the game (one "tick") is a single small int. It is the format GameRunner
+# steps with in headless mode, and the format replays are recorded in.
+############################################################
+# Input bits
+############################################################
+LEFT = 1
+RIGHT = 2
+UP = 4
+FIRE = 8
+SPECIAL = 16
+NO_INPUT = 0
+
@@ -0,0 +1,315 @@
+############################################################
+# FILE : episodes.py
+
+# DESCRIPTION: This file contains EpisodeStats and RunningStat classes, and
+# functions for running many headless games (episodes) of Asteroids! in
+# parallel, for tuning the balance of the game (GameRunner consts).
+# Episodes are played by a policy, a function that gets the GameRunner and a
+# random generator and returns the input bitmask of the loop (see
+# controls.py). Episode i gets seed (seed + i), both for the game and for the
+# policy's random generator, so every episode can be played again.
+# Episodes are run over a pool of processes, one for each core, and the
+# result of each episode (score, loops survived, asteroids destroyed by size,
+# lives lost) is streamed back to the main process as soon as it is done,
+# where it is written out (json line) and added to summary statistics.
+#
+# Main Function: runs episodes by command line args, for ex.
+# python episodes.py --episodes 10000 --asteroids 5 --policy random
+#                    --set TORPEDO_LIFETIME=300 --output results.jsonl
+# and prints (or writes) the summary as json.
+############################################################
+# Imports
+############################################################
+import argparse
+import ast
+import importlib
+import json
+import math
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import controls
+from asteroids_main import GameRunner, DEFAULT_ASTEROIDS_NUM
+from headless_screen import HeadlessScreen
+
+DEFAULT_EPISODES = 1000
+DEFAULT_MAX_TICKS = 100000
+DEFAULT_POLICY = "random"
+############################################################
+# Policies
+############################################################
+
+
+def random_policy(runner, rng):
+    """Presses each of left, right, up and fire at random"""
+    return rng.getrandbits(4)
+
+
+def spin_policy(runner, rng):
+    """Turns left and fires"""
+    return controls.LEFT | controls.FIRE
+
+
+def idle_policy(runner, rng):
+    """Presses nothing"""
+    return controls.NO_INPUT
+
+
+POLICIES = {"random": random_policy, "spin": spin_policy, "idle": idle_policy}
+
+
+def get_policy(name):
+    """
+    This function gets a policy by name, one of POLICIES or "module:function".
+    :param name: policy name
+    :return: policy function
+    """
+    if name in POLICIES:
+        return POLICIES[name]
+    module, sep, function = name.partition(":")
+    if not sep:
+        raise ValueError("Unknown policy: %s (not one of %s or module:function)"
+                         % (name, ", ".join(POLICIES)))
+    return getattr(importlib.import_module(module), function)
+
+
+def is_constant(name):
+    """
+    :return: True if name is a GameRunner const (upper case attribute),
+    else False
+    """
+    return name.isupper() and hasattr(GameRunner, name)
+
+
+def set_constants(constants):
+    """
+    This function sets GameRunner consts (in this process).
+    :param constants: dict of const name to value
+    """
+    for name, value in constants.items():
+        if not is_constant(name):
+            raise ValueError("Not a GameRunner const: %s" % name)
+        setattr(GameRunner, name, value)
+
+
+def run_episode(seed, asteroids_amnt, policy, max_ticks=DEFAULT_MAX_TICKS):
+    """
+    This function plays one headless game with a policy, until it is over or
+    max ticks loops passed.
+    :param seed: seed of the game and of the policy's random generator
+    :param asteroids_amnt: number of asteroids
+    :param policy: policy name, see get_policy
+    :param max_ticks: max number of loops
+    :return: dict of episode result
+    """
+    act = get_policy(policy)
+    rng = random.Random(seed)
+    runner = GameRunner(asteroids_amnt, HeadlessScreen(), seed)
+    while runner.get_ticks() < max_ticks and \
+            runner.step(act(runner, rng), False):
+        pass
+    return {"seed": seed,
+            "score": runner.get_score(),
+            "ticks": runner.get_ticks(),
+            "destroyed": runner.get_destroyed(),
+            "lives_lost": GameRunner.INITIAL_LIVES - runner.get_lives(),
+            "won": not len(runner.get_world().asteroids)}
+
+
+def _run_episode(args):
+    # run_episode with one tuple of args, for the process pool
+    return run_episode(*args)
+
+
+def run_episodes(episodes, asteroids_amnt, policy, seed=0,
+                 max_ticks=DEFAULT_MAX_TICKS, constants=None, workers=None):
+    """
+    This generator function runs episodes over a pool of processes.
+    :param episodes: number of episodes
+    :param seed: seed of the first episode, episode i gets seed + i
+    :param constants: dict of GameRunner consts to set in every process
+    :param workers: number of processes, number of cores if not given
+    :return: results of episodes (see run_episode), in order of seeds, each
+    one as soon as it (and the ones before it) is done
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = ((seed + i, asteroids_amnt, policy, max_ticks)
+             for i in range(episodes))
+    chunk = max(1, min(64, episodes // (workers * 8)))
+    with ProcessPoolExecutor(workers, initializer=set_constants,
+                             initargs=(constants or {},)) as executor:
+        for result in executor.map(_run_episode, tasks, chunksize=chunk):
+            yield result
+
+############################################################
+# RunningStat class
+############################################################
+
+
+class RunningStat:
+    """
+    A class representing summary statistics of a stream of numbers, updated
+    one number at a time (Welford's method), without keeping the numbers.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.__m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        """
+        This method adds a number to the statistics.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.__m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def get_stdev(self):
+        """
+        :return: sample standard deviation, 0 for less than two numbers
+        """
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self.__m2 / (self.count - 1))
+
+    def to_dict(self):
+        return {"mean": self.mean, "stdev": self.get_stdev(),
+                "min": self.min, "max": self.max}
+
+############################################################
+# EpisodeStats class
+############################################################
+
+
+class EpisodeStats:
+    """
+    A class representing the aggregated results of episodes.
+    Keeps running statistics of score, ticks and lives lost, totals of
+    asteroids destroyed by size and number of episodes won.
+    """
+
+    def __init__(self):
+        self.episodes = 0
+        self.won = 0
+        self.score = RunningStat()
+        self.ticks = RunningStat()
+        self.lives_lost = RunningStat()
+        self.destroyed = {}
+
+    def add(self, result):
+        """
+        This method adds the result of an episode (see run_episode).
+        """
+        self.episodes += 1
+        self.won += bool(result["won"])
+        self.score.add(result["score"])
+        self.ticks.add(result["ticks"])
+        self.lives_lost.add(result["lives_lost"])
+        for size, count in result["destroyed"].items():
+            self.destroyed[size] = self.destroyed.get(size, 0) + count
+
+    def to_dict(self):
+        """
+        :return: summary as a dict (json ready)
+        """
+        return {"episodes": self.episodes,
+                "won": self.won,
+                "score": self.score.to_dict(),
+                "ticks": self.ticks.to_dict(),
+                "lives_lost": self.lives_lost.to_dict(),
+                "destroyed": {str(size): count for size, count
+                              in sorted(self.destroyed.items())}}
+
+############################################################
+# MAIN
+############################################################
+
+
+def parse_constant(text):
+    """
+    This function parses a "NAME=VALUE" command line arg.
+    :return: (name, value)
+    """
+    name, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError("expected NAME=VALUE: %s" % text)
+    if not is_constant(name):
+        raise argparse.ArgumentTypeError("not a GameRunner const: %s" % name)
+    try:
+        return name, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        raise argparse.ArgumentTypeError("bad value: %s" % text)
+
+
+def parse_args(argv):
+    """
+    This function parses command line args of main.
+    :param argv: command line args (without program name)
+    :return: parsed args namespace
+    """
+    parser = argparse.ArgumentParser(
+        description="Run headless Asteroids! episodes in parallel")
+    parser.add_argument("--episodes", type=int, default=DEFAULT_EPISODES)
+    parser.add_argument("--asteroids", type=int, default=DEFAULT_ASTEROIDS_NUM,
+                        help="number of asteroids")
+    parser.add_argument("--policy", default=DEFAULT_POLICY,
+                        help="one of %s, or module:function"
+                             % ", ".join(POLICIES))
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the first episode")
+    parser.add_argument("--max-ticks", type=int, default=DEFAULT_MAX_TICKS,
+                        help="max loops of an episode")
+    parser.add_argument("--workers", type=int,
+                        help="number of processes, number of cores by default")
+    parser.add_argument("--set", type=parse_constant, action="append",
+                        default=[], metavar="NAME=VALUE",
+                        help="set a GameRunner const, for ex. "
+                             "MAX_ASTEROID_SPEED=4")
+    parser.add_argument("--output", metavar="PATH",
+                        help="write the result of each episode (json lines)")
+    parser.add_argument("--summary", metavar="PATH",
+                        help="write summary (json) to PATH instead of printing it")
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    """
+    main func. runs episodes and writes their results and summary.
+    :param argv: command line args (without program name)
+    """
+    args = parse_args(argv)
+    constants = dict(args.set)
+    set_constants(constants)
+    get_policy(args.policy)
+    stats = EpisodeStats()
+    output = open(args.output, "w") if args.output else None
+    try:
+        for result in run_episodes(args.episodes, args.asteroids, args.policy,
+                                   args.seed, args.max_ticks, constants,
+                                   args.workers):
+            stats.add(result)
+            if output:
+                output.write(json.dumps(result) + "\n")
+    finally:
+        if output:
+            output.close()
+    summary = stats.to_dict()
+    summary["constants"] = constants
+    summary["policy"] = args.policy
+    summary["asteroids"] = args.asteroids
+    if args.summary:
+        with open(args.summary, "w") as summary_file:
+            json.dump(summary, summary_file, indent=2)
+    else:
+        print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
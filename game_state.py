@@ -0,0 +1,95 @@
+############################################################
+# FILE : game_state.py
+
+# DESCRIPTION: This file contains GameState class, the full state of a game
+# of Asteroids! at the end of a loop, as made by GameRunner.snapshot and
+# loaded back by GameRunner.restore.
+# The objects of each table in world are kept as one flat float array of the
+# table columns (see EntityTable.snapshot), so making and copying a state is
+# copying a few arrays, not objects.
+# A state can also be turned to bytes (for replay files) and back.
+############################################################
+# Imports
+############################################################
+import struct
+from array import array
+
+from world import EntityTable
+############################################################
+# GameState class
+############################################################
+
+
+class GameState:
+    """
+    A class representing the state of a game:
+    ticks (loops count), score, lives, invulnerable_until (loop the ship is
+    invulnerable until), ships, asteroids, torpedoes (flat column arrays of
+    their tables) and random_state (the words of the game's random generator).
+    Bytes format: header (ticks, score, lives, invulnerable until and number
+    of rows of each table), then the column arrays and random words (native
+    byte order).
+    """
+    __slots__ = ("ticks", "score", "lives", "invulnerable_until", "ships",
+                 "asteroids", "torpedoes", "random_state")
+    HEADER = struct.Struct("<QqiQIII")
+    RANDOM_STATE = struct.Struct("<625I")
+
+    def __init__(self, ticks, score, lives, invulnerable_until, ships,
+                 asteroids, torpedoes, random_state):
+        """
+        GameState object constructor
+        :param ships, asteroids, torpedoes: flat column arrays of tables
+        :type ships, asteroids, torpedoes: array
+        :param random_state: tuple of the random generator words
+        """
+        self.ticks = ticks
+        self.score = score
+        self.lives = lives
+        self.invulnerable_until = invulnerable_until
+        self.ships = ships
+        self.asteroids = asteroids
+        self.torpedoes = torpedoes
+        self.random_state = random_state
+
+    def __len__(self):
+        """
+        :return: size of the state in bytes
+        """
+        return self.HEADER.size + self.RANDOM_STATE.size + \
+            (len(self.ships) + len(self.asteroids) + len(self.torpedoes)) \
+            * self.ships.itemsize
+
+    def to_bytes(self):
+        """
+        :return: state as bytes, see from_bytes
+        """
+        rows = len(EntityTable.COLUMNS)
+        return self.HEADER.pack(self.ticks, self.score, self.lives,
+                                self.invulnerable_until,
+                                len(self.ships) // rows,
+                                len(self.asteroids) // rows,
+                                len(self.torpedoes) // rows) + \
+            self.ships.tobytes() + self.asteroids.tobytes() + \
+            self.torpedoes.tobytes() + self.RANDOM_STATE.pack(*self.random_state)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        This method makes a state from bytes made by to_bytes.
+        :param data: bytes (or buffer)
+        :return: GameState obj.
+        """
+        ticks, score, lives, invulnerable_until, ships_num, asteroids_num, \
+            torpedoes_num = cls.HEADER.unpack_from(data)
+        offset = cls.HEADER.size
+        tables = []
+        for num in (ships_num, asteroids_num, torpedoes_num):
+            values = array(EntityTable.TYPECODE)
+            length = num * len(EntityTable.COLUMNS) * values.itemsize
+            values.frombytes(data[offset:offset + length])
+            tables.append(values)
+            offset += length
+        return cls(ticks, score, lives, invulnerable_until, tables[0],
+                   tables[1], tables[2],
+                   cls.RANDOM_STATE.unpack_from(data, offset))
@@ -0,0 +1,237 @@
+############################################################
+# FILE : headless_screen.py
+
+# DESCRIPTION: This file contains HeadlessScreen and RecordingScreen classes,
+# render backends for running the Asteroids! game without a display.
+# They have the same public methods as Screen (register, draw, un-register,
+# score, lives, messages and key presses) but never import tkinter.
+# HeadlessScreen does nothing with draw calls, RecordingScreen keeps them
+# in a list, for checking what the game would have drawn.
+# Key presses are given as an input bitmask (see controls.py) for every tick.
+############################################################
+# Imports
+############################################################
+import controls
+############################################################
+# HeadlessScreen class
+############################################################
+
+
+class HeadlessScreen:
+    """
+    A class representing a no-op render backend for the Asteroids! game.
+    Screen bounds are the same as in Screen class.
+    Input is set for each tick with set_input, poll_input and is-pressed
+    methods answer according to the bits of the given input bitmask.
+    """
+    HEADLESS = True
+    SCREEN_MIN_X = -500
+    SCREEN_MIN_Y = -500
+    SCREEN_MAX_X = 500
+    SCREEN_MAX_Y = 500
+    LIVES = 3
+
+    def __init__(self):
+        """
+        HeadlessScreen object constructor
+        :return: a new HeadlessScreen obj. with no input, score of 0 and no
+        messages.
+        """
+        self._input = controls.NO_INPUT
+        self.input_event_ns = None
+        self._endGame = False
+        self._score = 0
+        self._lives_removed = 0
+        self.overlay = ""
+        self.messages = []
+
+    def set_input(self, inputs):
+        """
+        Sets the input bitmask for the coming tick
+        :param inputs: input bitmask as defined in controls.py
+        :type inputs: int
+        """
+        self._input = inputs
+
+    def quit(self):
+        """Acts as if "q" was pressed"""
+        self._endGame = True
+
+    def ontimer(self, func, milli):
+        pass
+
+    def start_screen(self):
+        pass
+
+    def update(self):
+        pass
+
+    def set_score(self, val):
+        self._score = val
+
+    def set_overlay(self, text):
+        self.overlay = text
+
+    def remove_life(self):
+        self._lives_removed += 1
+
+    def set_lives(self, lives):
+        self._lives_removed = max(self.LIVES - lives, 0)
+
+    def register_asteroid(self, asteroid_id, size):
+        pass
+
+    def register_asteroids(self, asteroid_ids, sizes):
+        for asteroid_id, size in zip(asteroid_ids, sizes):
+            self.register_asteroid(asteroid_id, size)
+
+    def register_torpedo(self, torpedo_id):
+        pass
+
+    def register_torpedoes(self, torpedo_ids):
+        for torpedo_id in torpedo_ids:
+            self.register_torpedo(torpedo_id)
+
+    def unregister_asteroid(self, asteroid_id):
+        pass
+
+    def unregister_asteroids(self, asteroid_ids):
+        for asteroid_id in asteroid_ids:
+            self.unregister_asteroid(asteroid_id)
+
+    def unregister_torpedo(self, torpedo_id):
+        pass
+
+    def unregister_torpedoes(self, torpedo_ids):
+        for torpedo_id in torpedo_ids:
+            self.unregister_torpedo(torpedo_id)
+
+    def draw_ship(self, x, y, heading):
+        pass
+
+    def draw_frame(self, ship_state, asteroid_array, torpedo_array):
+        pass
+
+    def draw_asteroid(self, asteroid_id, x, y):
+        pass
+
+    def draw_torpedo(self, torpedo_id, x, y, heading):
+        pass
+
+    def should_end(self):
+        """
+        :returns: True if the game should end or not (if quit was called or not)
+        """
+        return self._endGame
+
+    def poll_input(self):
+        """
+        :returns: input bitmask given to set_input
+        """
+        return self._input
+
+    def is_left_pressed(self):
+        return bool(self._input & controls.LEFT)
+
+    def is_right_pressed(self):
+        return bool(self._input & controls.RIGHT)
+
+    def is_up_pressed(self):
+        return bool(self._input & controls.UP)
+
+    def is_space_pressed(self):
+        return bool(self._input & controls.FIRE)
+
+    def is_special_pressed(self):
+        return bool(self._input & controls.SPECIAL)
+
+    def is_rewind_pressed(self):
+        return False
+
+    def is_forward_pressed(self):
+        return False
+
+    def is_resume_pressed(self):
+        return False
+
+    def show_message(self, title, msg):
+        """
+        Messages are not shown, only kept in messages list as (title, msg).
+        """
+        self.messages.append((str(title), str(msg)))
+
+    def notify(self, title, msg, duration=None):
+        """
+        Notifications are kept in messages list as well.
+        """
+        self.messages.append((str(title), str(msg)))
+
+    def end_game(self):
+        pass
+
+
+############################################################
+# RecordingScreen class
+############################################################
+
+
+class RecordingScreen(HeadlessScreen):
+    """
+    A headless render backend that records every call to the screen.
+    calls list holds tuples of (method name, args...) in calling order.
+    """
+
+    def __init__(self):
+        HeadlessScreen.__init__(self)
+        self.calls = []
+
+    def set_score(self, val):
+        HeadlessScreen.set_score(self, val)
+        self.calls.append(("set_score", val))
+
+    def remove_life(self):
+        HeadlessScreen.remove_life(self)
+        self.calls.append(("remove_life",))
+
+    def set_lives(self, lives):
+        HeadlessScreen.set_lives(self, lives)
+        self.calls.append(("set_lives", lives))
+
+    def register_asteroid(self, asteroid_id, size):
+        self.calls.append(("register_asteroid", asteroid_id, size))
+
+    def register_torpedo(self, torpedo_id):
+        self.calls.append(("register_torpedo", torpedo_id))
+
+    def unregister_asteroid(self, asteroid_id):
+        self.calls.append(("unregister_asteroid", asteroid_id))
+
+    def unregister_torpedo(self, torpedo_id):
+        self.calls.append(("unregister_torpedo", torpedo_id))
+
+    def draw_ship(self, x, y, heading):
+        self.calls.append(("draw_ship", x, y, heading))
+
+    def draw_frame(self, ship_state, asteroid_array, torpedo_array):
+        """
+        A frame is recorded as the draw calls of each object in it.
+        """
+        if ship_state is not None:
+            self.draw_ship(*ship_state)
+        for asteroid_id, x, y in zip(*asteroid_array):
+            self.draw_asteroid(asteroid_id, x, y)
+        for torpedo_id, x, y, heading in zip(*torpedo_array):
+            self.draw_torpedo(torpedo_id, x, y, heading)
+
+    def draw_asteroid(self, asteroid_id, x, y):
+        self.calls.append(("draw_asteroid", asteroid_id, x, y))
+
+    def draw_torpedo(self, torpedo_id, x, y, heading):
+        self.calls.append(("draw_torpedo", torpedo_id, x, y, heading))
+
+    def notify(self, title, msg, duration=None):
+        HeadlessScreen.notify(self, title, msg, duration)
+        self.calls.append(("notify", title, msg))
+
+    def end_game(self):
+        self.calls.append(("end_game",))
@@ -0,0 +1,56 @@
+############################################################
+# FILE : pool.py
+
+# DESCRIPTION: This file contains Pool class, a free-list of objects of the
+# Asteroids! game (torpedoes, asteroids) for re-use.
+# An object that is done with (disarmed torpedo, destroyed asteroid) is
+# released to the pool, and the next acquire re-sets it with new args
+# instead of constructing a new object. So after the game got to its peak
+# number of objects, it does not construct objects any more.
+############################################################
+# Pool class
+############################################################
+
+
+class Pool:
+    """
+    A class representing a pool of re-usable objects of one class.
+    Objects in pool must have a reset method with the same args as factory.
+    Pool keeps up to capacity free objects, more released objects are dropped.
+    """
+
+    def __init__(self, factory, capacity):
+        """
+        Pool object constructor
+        :param factory: function constructing a new object
+        :param capacity: max number of free objects kept
+        :type capacity: int
+        """
+        self.__factory = factory
+        self.__capacity = capacity
+        self.__free = []
+        self.created = 0
+
+    def __len__(self):
+        return len(self.__free)
+
+    def acquire(self, *args):
+        """
+        This method gets an object with the given args, a free one re-set
+        if there is one, else a new one.
+        :return: object
+        """
+        if self.__free:
+            obj = self.__free.pop()
+            obj.reset(*args)
+            return obj
+        self.created += 1
+        return self.__factory(*args)
+
+    def release(self, obj):
+        """
+        This method gives an object back to the pool, object must not be used
+        until acquired again.
+        """
+        if len(self.__free) < self.__capacity:
+            self.__free.append(obj)
@@ -0,0 +1,159 @@
+############################################################
+# FILE : profiler.py
+
+# DESCRIPTION: This file contains TickProfiler class, timing of the phases of
+# the main loop of the Asteroids! game (input, ship move, asteroid sequence,
+# torpedo sequence, status check, end of loop bookkeeping: recycling removed
+# objects, replay and rewind states) and of drawing (render, screen update),
+# for finding slow loops and frames while the game runs.
+# For each phase the last HISTORY times (ns, from perf_counter_ns) are kept
+# in a ring buffer, with a histogram of them that is updated as times come in
+# and drop out (rolling histogram), so mean, max, percentiles and histogram
+# are of the last HISTORY times only.
+# GameRunner only calls the profiler when one is set (see
+# GameRunner.set_profiler), with no profiler the loop is not timed at all.
+############################################################
+# Imports
+############################################################
+import bisect
+from array import array
+from collections import deque
+############################################################
+# TickProfiler class
+############################################################
+
+
+class TickProfiler:
+    """
+    A class representing the rolling timing of loop and frame phases.
+    PHASES: phases of the main loop ("end" is the bookkeeping at the end of
+    it: recycling, replay and rewind states), then of drawing a frame, and
+    latency: time from a key press to the end of the input phase of the loop
+    that took it.
+    BUCKETS_MS: upper bounds of histogram buckets in ms, a last bucket holds
+    the times above the last bound.
+    """
+    PHASES = ("input", "ship", "asteroids", "torpedoes", "status", "end",
+              "render", "update", "latency")
+    HISTORY = 1000
+    BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33)
+    NS_IN_MS = 10 ** 6
+    NS_IN_SECOND = 10 ** 9
+
+    def __init__(self, history=HISTORY):
+        """
+        TickProfiler object constructor
+        :param history: number of last times kept for each phase
+        """
+        self.__history = history
+        self.__bounds = [bound * self.NS_IN_MS for bound in self.BUCKETS_MS]
+        self.__times = {phase: array("q", [0]) * history
+                        for phase in self.PHASES + ("tick",)}
+        self.__counts = dict.fromkeys(self.__times, 0)
+        self.__histograms = {phase: [0] * (len(self.BUCKETS_MS) + 1)
+                             for phase in self.__times}
+        # times (ns) of the frames of the last second
+        self.__frames = deque()
+        self.ticks = 0
+
+    def add(self, phase, ns):
+        """
+        This method adds the time of a phase, dropping the oldest time of
+        it if history is full.
+        :param phase: one of PHASES, or "tick" for a whole loop
+        :param ns: time in ns
+        """
+        count = self.__counts[phase]
+        times = self.__times[phase]
+        histogram = self.__histograms[phase]
+        i = count % self.__history
+        if count >= self.__history:
+            histogram[bisect.bisect_left(self.__bounds, times[i])] -= 1
+        times[i] = ns
+        histogram[bisect.bisect_left(self.__bounds, ns)] += 1
+        self.__counts[phase] = count + 1
+
+    def add_tick(self, ns):
+        """This method adds the time of a whole loop"""
+        self.ticks += 1
+        self.add("tick", ns)
+
+    def add_frame(self, now):
+        """
+        This method counts a frame that was drawn.
+        :param now: time of the frame in ns
+        """
+        frames = self.__frames
+        frames.append(now)
+        while now - frames[0] > self.NS_IN_SECOND:
+            frames.popleft()
+
+    def get_fps(self):
+        """
+        :return: number of frames drawn in the last second
+        """
+        return len(self.__frames)
+
+    def __get_times(self, phase):
+        # the kept times of phase
+        return self.__times[phase][:min(self.__counts[phase], self.__history)]
+
+    def get_mean_ms(self, phase):
+        """
+        :return: mean of the kept times of phase, in ms
+        """
+        times = self.__get_times(phase)
+        return sum(times) / len(times) / self.NS_IN_MS if times else 0.0
+
+    def get_max_ms(self, phase):
+        """
+        :return: max of the kept times of phase, in ms
+        """
+        times = self.__get_times(phase)
+        return max(times) / self.NS_IN_MS if times else 0.0
+
+    def get_percentile_ms(self, phase, fraction):
+        """
+        :param fraction: in [0, 1], for ex. 0.99 for p99
+        :return: time of phase at fraction of the kept times, in ms
+        """
+        times = sorted(self.__get_times(phase))
+        if not times:
+            return 0.0
+        return times[min(len(times) - 1, int(fraction * len(times)))] / \
+            self.NS_IN_MS
+
+    def get_histogram(self, phase):
+        """
+        :return: list of number of kept times of phase in each bucket of
+        BUCKETS_MS (and above it)
+        """
+        return list(self.__histograms[phase])
+
+    def get_overlay(self, asteroids_num, torpedoes_num):
+        """
+        :return: short text of fps, loop time and objects count, for showing
+        next to the game
+        """
+        return "FPS: %d\nTick: %.2f ms (max %.2f)\nFrame: %.2f ms\n" \
+               "Input: %.2f ms\nAsteroids: %d\nTorpedoes: %d" % (
+                   self.get_fps(), self.get_mean_ms("tick"),
+                   self.get_max_ms("tick"),
+                   self.get_mean_ms("render") + self.get_mean_ms("update"),
+                   self.get_mean_ms("latency"), asteroids_num,
+                   torpedoes_num)
+
+    def get_report(self):
+        """
+        :return: text of mean, p99, max and histogram of each phase
+        """
+        header = "%-10s %9s %9s %9s  %s" % (
+            "phase", "mean ms", "p99 ms", "max ms",
+            " ".join("<=%g" % bound for bound in self.BUCKETS_MS) + " more")
+        lines = ["loops: %d" % self.ticks, header]
+        for phase in self.PHASES + ("tick",):
+            lines.append("%-10s %9.3f %9.3f %9.3f  %s" % (
+                phase, self.get_mean_ms(phase),
+                self.get_percentile_ms(phase, 0.99), self.get_max_ms(phase),
+                " ".join(str(count) for count in self.get_histogram(phase))))
+        return "\n".join(lines)
@@ -0,0 +1,267 @@
+############################################################
+# FILE : replay.py
+
+# DESCRIPTION: This file contains ReplayRecorder and ReplayFile classes, and
+# play_replay func. for recording a game of Asteroids! and playing it again.
+# A game is fully defined by its seed (GameRunner's random generator),
+# number of asteroids and the input bitmask of every loop (see controls.py).
+# On top of that, the full state of the game (see GameRunner.save_state) is
+# saved every SNAPSHOT_INTERVAL loops, so a replay can jump to any loop by
+# loading the closest state before it and playing only the loops after it.
+#
+# File format (numbers in little endian, states in native byte order):
+# header - magic, version, seed, asteroids amount, snapshot interval
+# records - one after the other, each one is (kind, loop, length) and then
+#           length bytes:
+#           state - saved state of the game at loop
+#           inputs - one byte of input bitmask for each loop after loop
+# The file is written as the game goes: header and first state when
+# recording starts, and the inputs of every interval loops and the state
+# after them at the end of the interval (flushed to disk). So a file of a
+# game that never closed its recorder (crash, killed process) is still a
+# replay, up to its last whole record.
+# Replay files are read through mmap, so jumping to a loop only reads the
+# state and inputs it needs.
+#
+# Main Function: plays a replay file given as argument (or jumps to a given
+# loop of it), and prints the result.
+############################################################
+# Imports
+############################################################
+import bisect
+import mmap
+import struct
+import sys
+import time
+
+from asteroids_main import GameRunner
+from headless_screen import HeadlessScreen
+
+MAGIC = b"ASTR"
+VERSION = 5
+HEADER = struct.Struct("<4sHQII")
+RECORD = struct.Struct("<BQI")
+STATE_RECORD = 1
+INPUTS_RECORD = 2
+SNAPSHOT_INTERVAL = 1000
+############################################################
+# ReplayRecorder class
+############################################################
+
+
+class ReplayRecorder:
+    """
+    A class representing a replay file being recorded.
+    Inputs are kept in memory (one byte a loop) until the end of the
+    interval, then written to file with the state after them, and file is
+    flushed. Inputs left are written when recorder is closed.
+    A state is saved when recording starts, so replay starts at that loop.
+    """
+
+    def __init__(self, path, runner, asteroids_amnt,
+                 interval=SNAPSHOT_INTERVAL):
+        """
+        ReplayRecorder object constructor, creates the file and saves the
+        current state of the game.
+        :param path: path of replay file
+        :param runner: the recorded game
+        :type runner: GameRunner
+        :param asteroids_amnt: number of asteroids the game started with
+        :param interval: number of loops between saved states
+        """
+        self.__file = open(path, "wb")
+        self.__interval = interval
+        self.__inputs = bytearray()
+        # loop before the first input kept in inputs
+        self.__inputs_tick = runner.get_ticks()
+        self.__file.write(HEADER.pack(MAGIC, VERSION, runner.get_seed(),
+                                      asteroids_amnt, interval))
+        self.__save(runner)
+
+    def __write(self, kind, tick, data):
+        """This method writes a record to file"""
+        self.__file.write(RECORD.pack(kind, tick, len(data)))
+        self.__file.write(data)
+
+    def __save(self, runner):
+        """This method writes the current state of the game to file"""
+        self.__write(STATE_RECORD, runner.get_ticks(), runner.save_state())
+        self.__file.flush()
+
+    def __write_inputs(self):
+        """This method writes the inputs kept in memory to file"""
+        if self.__inputs:
+            self.__write(INPUTS_RECORD, self.__inputs_tick, self.__inputs)
+            self.__inputs_tick += len(self.__inputs)
+            self.__inputs = bytearray()
+
+    def record(self, inputs):
+        """
+        This method records the input of one loop of the game.
+        :param inputs: input bitmask as defined in controls.py
+        :type inputs: int
+        """
+        self.__inputs.append(inputs)
+
+    def end_tick(self, runner):
+        """
+        This method is called at the end of each loop, and every interval
+        loops writes the inputs of the interval and the state of the game.
+        :param runner: the recorded game
+        """
+        if len(self.__inputs) == self.__interval:
+            self.__write_inputs()
+            self.__save(runner)
+
+    def close(self):
+        """This method writes the inputs left to file and closes it"""
+        if self.__file.closed:
+            return
+        self.__write_inputs()
+        self.__file.close()
+
+
+############################################################
+# ReplayFile class
+############################################################
+
+
+class ReplayFile:
+    """
+    A class representing a replay file opened for reading, through mmap.
+    Loops are counted like GameRunner.get_ticks: start tick is the loop
+    recording started at, input i is the input of loop start tick + i + 1.
+    Records are read up to the end of file, a record cut off at the end (of
+    a recorder that was not closed) is ignored.
+    """
+
+    def __init__(self, path):
+        """
+        ReplayFile object constructor, maps the file and reads its header
+        and index.
+        :param path: path of replay file
+        """
+        with open(path, "rb") as replay_file:
+            self.__data = mmap.mmap(replay_file.fileno(), 0,
+                                    access=mmap.ACCESS_READ)
+        size = len(self.__data)
+        if size < HEADER.size:
+            self.close()
+            raise ValueError("Not a replay file (version %d): %s" % (VERSION, path))
+        magic, version, self.seed, self.asteroids_amnt, self.interval = \
+            HEADER.unpack_from(self.__data)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError("Not a replay file (version %d): %s" % (VERSION, path))
+        # (loop, offset, length) of states and of inputs
+        self.__states = []
+        self.__inputs = []
+        offset = HEADER.size
+        while offset + RECORD.size <= size:
+            kind, tick, length = RECORD.unpack_from(self.__data, offset)
+            offset += RECORD.size
+            if offset + length > size:
+                break
+            if kind == STATE_RECORD:
+                self.__states.append((tick, offset, length))
+            elif kind == INPUTS_RECORD:
+                self.__inputs.append((tick, offset, length))
+            offset += length
+        if not self.__states:
+            self.close()
+            raise ValueError("Replay file has no saved state: %s" % path)
+        self.__state_ticks = [state[0] for state in self.__states]
+        self.start_tick = self.__states[0][0]
+        self.ticks = sum(length for tick, offset, length in self.__inputs)
+
+    def close(self):
+        self.__data.close()
+
+    def get_inputs(self, first, last):
+        """
+        :return: input bitmasks (bytes) of loops first + 1 to last
+        """
+        inputs = []
+        for tick, offset, length in self.__inputs:
+            begin = max(first, tick)
+            end = min(last, tick + length)
+            if begin < end:
+                inputs.append(self.__data[offset + begin - tick:
+                                          offset + end - tick])
+        return b"".join(inputs)
+
+    def get_state(self, tick):
+        """
+        This method finds the closest saved state at or before a loop.
+        :param tick: loop number
+        :return: loop number of the state, state bytes
+        """
+        i = bisect.bisect_right(self.__state_ticks, tick) - 1
+        state_tick, offset, length = self.__states[max(i, 0)]
+        return state_tick, self.__data[offset:offset + length]
+
+    def seek(self, tick, screen=None):
+        """
+        This method gets a game at the state after a given loop, by loading
+        the closest saved state and playing the loops left headless.
+        :param tick: loop number, from start tick to start tick + ticks
+        :param screen: headless render backend, a new HeadlessScreen if not given
+        :return: GameRunner at given loop
+        """
+        tick = min(max(tick, self.start_tick), self.start_tick + self.ticks)
+        runner = GameRunner(self.asteroids_amnt, screen or HeadlessScreen(),
+                            self.seed)
+        state_tick, state = self.get_state(tick)
+        runner.load_state(state)
+        for tick_input in self.get_inputs(state_tick, tick):
+            if not runner.step(tick_input):
+                break
+        return runner
+
+
+############################################################
+# Functions
+############################################################
+
+
+def play_replay(path, screen=None):
+    """
+    This function plays a whole replay file, in headless mode, from the
+    seed of the game and the recorded input of every loop.
+    Game stops when it is over or when there is no more recorded input.
+    :param path: path of replay file
+    :param screen: headless render backend, a new HeadlessScreen if not given
+    :return: the GameRunner after playing
+    """
+    replay = ReplayFile(path)
+    runner = GameRunner(replay.asteroids_amnt, screen or HeadlessScreen(),
+                        replay.seed)
+    runner.load_state(replay.get_state(replay.start_tick)[1])
+    for tick_input in replay.get_inputs(replay.start_tick,
+                                        replay.start_tick + replay.ticks):
+        if not runner.step(tick_input):
+            break
+    replay.close()
+    return runner
+
+
+def main(path, tick=None):
+    """
+    main func. plays a replay and prints its result.
+    :param path: path of replay file
+    :param tick: loop to jump to, whole replay if not given
+    """
+    start = time.perf_counter()
+    if tick is None:
+        runner = play_replay(path)
+    else:
+        replay = ReplayFile(path)
+        runner = replay.seek(tick)
+        replay.close()
+    seconds = time.perf_counter() - start
+    print("tick: %d, score: %d, lives: %d, game over: %s (%.3f s)" %
+          (runner.get_ticks(), runner.get_score(), runner.get_lives(),
+           runner.is_game_over(), seconds))
+
+if __name__ == "__main__":
+    main(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else None)
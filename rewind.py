@@ -0,0 +1,129 @@
+############################################################
+# FILE : rewind.py
+
+# DESCRIPTION: This file contains RewindBuffer class, a ring buffer of the
+# last states of a running game of Asteroids!, for scrubbing back and forward
+# in time while looking into a bug in gameplay.
+# States are GameState objects (see game_state.py): the columns of the world
+# tables as flat arrays, not copies of the Asteroid and Torpedo objects.
+# The random generator state of a game only changes when random values are
+# drawn, so a state that has the same random state as the state before it
+# shares it, and it is counted once: in the memory of the oldest state in
+# buffer that holds it.
+# Buffer is capped by memory: when the states in it take more than max bytes,
+# the oldest states are dropped.
+############################################################
+# Imports
+############################################################
+from collections import deque
+############################################################
+# RewindBuffer class
+############################################################
+
+
+class RewindBuffer:
+    """
+    A class representing a bounded buffer of game states, one for each loop.
+    Buffer has a cursor, the state being looked at: it is on the newest state
+    as long as the game runs, and move moves it back and forward.
+    Memory of a state is its size in bytes (see GameState), without the
+    random state when it is shared with the state before it. When the oldest
+    state is dropped, the random state it shares is counted in the next one.
+    """
+    DEFAULT_MAX_BYTES = 32 * 2 ** 20
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        RewindBuffer object constructor
+        :param max_bytes: max memory of states kept in buffer, at least the
+        newest state is always kept
+        :type max_bytes: int
+        """
+        self.__max_bytes = max_bytes
+        # (state, memory of state)
+        self.__states = deque()
+        self.__bytes = 0
+        self.__cursor = -1
+        self.__last_random = None
+
+    def __len__(self):
+        return len(self.__states)
+
+    def get_bytes(self):
+        """
+        :return: memory of the states in buffer (int)
+        """
+        return self.__bytes
+
+    def push(self, state):
+        """
+        This method adds the state of the loop that ended as newest state, and
+        drops the oldest states that do not fit in max bytes.
+        If cursor was moved back, the states after it are dropped first (the
+        game goes on from the state at cursor).
+        :param state: GameState obj.
+        """
+        self.resume()
+        states = self.__states
+        size = len(state)
+        # GameRunner gives the same tuple while random state did not change,
+        # so it is mostly found by identity
+        if state.random_state is self.__last_random or \
+                state.random_state == self.__last_random:
+            state.random_state = self.__last_random
+            size -= state.RANDOM_STATE.size
+        else:
+            self.__last_random = state.random_state
+        states.append((state, size))
+        self.__bytes += size
+        while self.__bytes > self.__max_bytes and len(states) > 1:
+            self.__drop_oldest()
+        self.__cursor = len(states) - 1
+
+    def __drop_oldest(self):
+        """
+        This method drops the oldest state. If the next state shares its
+        random state, the random state is counted in the next state.
+        """
+        states = self.__states
+        dropped, size = states.popleft()
+        self.__bytes -= size
+        oldest, oldest_size = states[0]
+        if oldest.random_state is dropped.random_state and \
+                oldest_size < len(oldest):
+            size = dropped.RANDOM_STATE.size
+            states[0] = (oldest, oldest_size + size)
+            self.__bytes += size
+
+    def resume(self):
+        """
+        This method drops the states after cursor, so the state at cursor is
+        the newest state.
+        """
+        states = self.__states
+        if len(states) - 1 > self.__cursor:
+            while len(states) - 1 > self.__cursor:
+                self.__bytes -= states.pop()[1]
+            # next state shares the random state of the state at cursor
+            self.__last_random = states[-1][0].random_state
+
+    def is_rewound(self):
+        """
+        :return: True if cursor is before the newest state, else False
+        """
+        return self.__cursor < len(self.__states) - 1
+
+    def move(self, steps):
+        """
+        This method moves the cursor, back (negative steps) or forward,
+        up to the oldest and newest states.
+        :param steps: number of loops to move by
+        :type steps: int
+        :return: GameState at cursor, None if buffer is empty
+        """
+        if not self.__states:
+            return None
+        self.__cursor = min(max(self.__cursor + steps, 0),
+                            len(self.__states) - 1)
+        return self.__states[self.__cursor][0]
+
@@ -0,0 +1,98 @@
+############################################################
+# FILE : scheduler.py
+
+# DESCRIPTION: This file contains FixedStepScheduler class, which runs
+# the loops of the Asteroids! game at a fixed rate, apart from drawing.
+# Time that passed since last call is added to an accumulator, and one loop
+# (tick) of the game is stepped for every tick length in it. If the machine
+# fell behind, several ticks are stepped to catch up (up to a limit), and
+# drawing is done once after them, with the fraction of a tick left over
+# (alpha) to draw objects in between their last two positions.
+# If no tick was stepped, nothing is drawn, and the caller is told how long
+# to wait until the next tick is due.
+# After a pause, the scheduler is reset, so the paused time is not stepped.
+############################################################
+# Imports
+############################################################
+import math
+import time
+############################################################
+# FixedStepScheduler class
+############################################################
+
+
+class FixedStepScheduler:
+    """
+    A class representing a fixed timestep scheduler.
+    MAX_CATCH_UP_TICKS: max ticks stepped in one call, time behind more than
+    that is dropped (game slows down instead of freezing to catch up).
+    """
+    MS_IN_SECOND = 1000
+    MAX_CATCH_UP_TICKS = 5
+
+    def __init__(self, step, render, tick_ms, max_steps=MAX_CATCH_UP_TICKS,
+                 clock=time.perf_counter):
+        """
+        FixedStepScheduler object constructor
+        :param step: function running one tick, no args
+        :param render: function drawing a frame, gets alpha in [0, 1)
+        :param tick_ms: length of one tick in milliseconds
+        :param max_steps: max ticks to step in one call
+        :param clock: function returning current time in seconds
+        """
+        self.__step = step
+        self.__render = render
+        self.__tick = tick_ms / self.MS_IN_SECOND
+        self.__max_steps = max_steps
+        self.__clock = clock
+        self.__last = None
+        self.__accumulator = 0.0
+        self.ticks = 0
+        self.frames = 0
+
+    def set_callbacks(self, step, render):
+        """
+        This method replaces the functions of running a tick and drawing a
+        frame, for ex. with timed ones.
+        """
+        self.__step = step
+        self.__render = render
+
+    def reset(self):
+        """
+        This method forgets the time of last call, for ex. after the game was
+        paused, so the time that passed is not stepped: next call steps one
+        tick, as the first call.
+        """
+        self.__last = None
+        self.__accumulator = 0.0
+
+    def advance(self):
+        """
+        This method steps all ticks that are due since last call, and draws
+        a frame if any tick was stepped.
+        First call steps one tick.
+        :return: milliseconds to wait until next tick is due (int)
+        """
+        now = self.__clock()
+        if self.__last is None:
+            self.__accumulator = self.__tick
+        else:
+            self.__accumulator += now - self.__last
+        self.__last = now
+
+        steps = 0
+        while self.__accumulator >= self.__tick and steps < self.__max_steps:
+            self.__step()
+            self.__accumulator -= self.__tick
+            steps += 1
+        if self.__accumulator >= self.__tick:
+            # too far behind, drop the rest
+            self.__accumulator %= self.__tick
+        self.ticks += steps
+
+        if steps:
+            self.__render(self.__accumulator / self.__tick)
+            self.frames += 1
+        wait = self.__tick - self.__accumulator - (self.__clock() - now)
+        return max(0, int(math.ceil(wait * self.MS_IN_SECOND)))
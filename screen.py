@@ -1,6 +1,10 @@
-import sys
+import time
 import tkinter
 import tkinter.messagebox
+from collections import deque
+
+import controls
+from sprite_index import SpriteIndex
 
 from turtle import *
 
@@ -43,11 +47,23 @@ class ShapesMaster:
 
     def _add_base_shapes(self):
         for i in range(ShapesMaster.ASTEROIDS_TYPES):
-            self.add_shape(ShapesMaster.ASTEROID_BASE_SHAPE%(i+1), \
-                        ShapesMaster.ASTEROIDS_LAYOUTS[i])
+            self._shapes[ShapesMaster.ASTEROID_BASE_SHAPE%(i+1)] = \
+                ShapesMaster.ASTEROIDS_LAYOUTS[i]
+
+        self._shapes[ShapesMaster.SHIP_SHAPE] = ShapesMaster.SHIP_LAYOUT
+        self._shapes[ShapesMaster.TORPEDO_SHAPE] = ShapesMaster.TORPEDO_LAYOUT
+        self.register_shapes(self.screen)
 
-        self.add_shape(ShapesMaster.SHIP_SHAPE, ShapesMaster.SHIP_LAYOUT)
-        self.add_shape(ShapesMaster.TORPEDO_SHAPE, ShapesMaster.TORPEDO_LAYOUT)
+    def register_shapes(self, screen, names=None):
+        """
+        Registers shapes to a turtle screen, all in one pass (and not one
+        call for each shape from all over the code).
+
+        :param screen: turtle screen
+        :param names: names of shapes to register, all shapes if not given
+        """
+        for name in self._shapes if names is None else names:
+            screen.register_shape(name, self._shapes[name])
 
     def get_shapes_dict(self):
         """
@@ -60,10 +76,30 @@ class ShapesMaster:
 
 class Screen:
 
+    HEADLESS = False
     SCREEN_MIN_X = -500
     SCREEN_MIN_Y = -500
     SCREEN_MAX_X = 500
     SCREEN_MAX_Y = 500
+    # keys of the game and their bit in input bitmask
+    KEY_BITS = {"Left": controls.LEFT, "Right": controls.RIGHT,
+                "Up": controls.UP, "space": controls.FIRE,
+                "s": controls.SPECIAL}
+    # turn and thrust keys act when pressed, and while held they act again
+    # after KEY_REPEAT_DELAY_MS, then KEY_REPEAT_HZ times a second (in real
+    # time, whatever the length of a loop is). Other keys act only when
+    # pressed.
+    REPEAT_KEYS = (controls.LEFT, controls.RIGHT, controls.UP)
+    KEY_REPEAT_DELAY_MS = 250
+    KEY_REPEAT_HZ = 30
+    NS_IN_MS = 10 ** 6
+    NOTIFICATION_MS = 2000
+    NOTIFICATION_COLOR = "red"
+    NOTIFICATION_FONT = ("Arial", 14, "bold")
+    NOTIFICATION_MARGIN = 10
+    # display refresh rate, the canvas is not redrawn more often than that
+    REFRESH_HZ = 60
+    MS_IN_SECOND = 1000
 
     def __init__(self):
         """
@@ -77,17 +113,44 @@ class Screen:
         self._screen.listen()
 
         self._ship = self._get_ship_obj(self._cv)
+        self._touch(self._ship)
 
     def _init_keys_values(self):
-        self._specialTorpedFired = 0
-        self._rightClicks = 0
-        self._leftClicks = 0
-        self._upClicks = 0
-        self._fireClicks = 0
+        # (time in ns, input bit, True for key-down) of key events since
+        # last poll_input
+        self._key_events = deque()
+        self._held_keys = controls.NO_INPUT
+        # time in ns a held key of REPEAT_KEYS acts again, by input bit
+        self._repeat_ns = dict.fromkeys(Screen.REPEAT_KEYS, 0)
+        self._input = controls.NO_INPUT
+        self.input_event_ns = None
+        self._rewindClicks = 0
+        self._forwardClicks = 0
+        self._resumeClicks = 0
         self._endGame = False
         self._lives = []
-        self._asteroids = {}
-        self._torpedos = {}
+        # icons of removed lives, for showing them again (see set_lives)
+        self._dead_lives = []
+        # sprites by entity id, see sprite_index.py
+        self._asteroids = SpriteIndex()
+        self._torpedos = SpriteIndex()
+        # (x, y, heading) the ship was last drawn at
+        self._ship_drawn = None
+        # un-registered turtles, by shape name, for re-use
+        self._free_sprites = {}
+        self._overlay_val = None
+        # canvas text items of notifications shown, oldest first
+        self._notifications = []
+        self._score = 0
+        # turtles of the game canvas that changed since last update (dict
+        # for keeping the order), and if anything else (score, lives, canvas
+        # items) changed
+        self._dirty_sprites = {}
+        self._dirty = False
+        self._last_update = None
+        self._update_pending = False
+        # lives icons and quit button are made, see _init_side_widgets
+        self._side_widgets = False
 
     def _init_graphics(self):
         self._root = tkinter.Tk()
@@ -104,7 +167,6 @@ class Screen:
                                         Screen.SCREEN_MAX_X
                                         )
         self._shapeMaster = ShapesMaster(self._screen)
-        shapes = self._shapeMaster.get_shapes_dict()
 
         frame = tkinter.Frame(self._root)
         frame.pack(side = tkinter.RIGHT,fill=tkinter.BOTH)
@@ -117,6 +179,8 @@ class Screen:
         scoreFrame = tkinter.Frame(frame,height=2, bd=1, \
             relief=tkinter.SUNKEN)
         scoreFrame.pack()
+        self._side_frame = frame
+        self._score_frame = scoreFrame
         score = tkinter.Label(scoreFrame,height=2,width=20,\
             textvariable=self._score_val,fg="Yellow",bg="black")
 
@@ -124,20 +188,21 @@ class Screen:
 
         score.pack()
 
-        # Add Lives Frame
-        # livesTitle = tkinter.Label(frame, \
-        #    text="Extra Lives Remaining")
-        # livesTitle.pack()
-
-        # livesFrame = tkinter.Frame(frame, \
-        #     height=30,width=60,relief=tkinter.SUNKEN)
-        # livesFrame.pack()
-        # self._lives_canvas = ScrolledCanvas(livesFrame,150,40,150,40)
-        # self._lives_canvas.pack()
-        # livesTurtle = RawTurtle(self._lives_canvas)
-        # livesTurtle.ht()
-        # livesScreen = livesTurtle.getscreen()
-        # livesScreen.register_shape(ShapesMaster.SHIP_SHAPE, shapes[ShapesMaster.SHIP_SHAPE])
+        self._t.ht()
+
+        self._screen.tracer(0)
+
+    def _init_side_widgets(self):
+        """
+        Makes the widgets next to the game that are not needed for the first
+        frame: lives icons and quit button. They are made after the first
+        update (so the game shows up sooner), or when lives are first
+        changed, whichever comes first.
+        """
+        if self._side_widgets:
+            return
+        self._side_widgets = True
+        frame = self._side_frame
 
         # Add Lives Frame
         livesTitle = tkinter.Label(frame, \
@@ -152,25 +217,20 @@ class Screen:
         livesTurtle = RawTurtle(livesCanvas)
         livesTurtle.ht()
         livesScreen = livesTurtle.getscreen()
-        livesScreen.register_shape(ShapesMaster.SHIP_SHAPE, shapes[ShapesMaster.SHIP_SHAPE])
-
-        life1 = self._get_ship_obj(livesCanvas) #   SpaceShip(livesCanvas,-35,0,0,0)
-        life2 = self._get_ship_obj(livesCanvas) #SpaceShip(livesCanvas,0,0,0,0)
-        life3 = self._get_ship_obj(livesCanvas) #SpaceShip(livesCanvas,35,0,0,0)
-
-        self._draw_object(life1,-35,0)
-        self._draw_object(life2,0,0)
-        self._draw_object(life3,35,0)
+        self._shapeMaster.register_shapes(livesScreen, [ShapesMaster.SHIP_SHAPE])
 
-        self._lives = [life1, life2, life3]
-
-        self._t.ht()
+        # lives screen draws its turtles right away (no tracer), so they
+        # are not drawn with _draw_object, and are moved with no animation
+        self._lives = []
+        for x in (-35, 0, 35):
+            life = self._get_ship_obj(livesCanvas)
+            life.speed(0)
+            life.goto(x, 0)
+            self._lives.append(life)
 
         quitButton = tkinter.Button(frame, text = "Quit", command=self._handle_exit)
         quitButton.pack()
 
-        self._screen.tracer(0)
-
     def ontimer(self, func, milli):
         """
         This method is used to create a repeating action in your game.
@@ -204,31 +264,40 @@ class Screen:
             self._screen.onkeypress(func,key)
             self._boundKeys.append(key)
 
+    def _bind_key_release(self, key, func):
+        """
+        Binds the provided function to the release of the desired input key,
+        if nothing is bound to its release yet.
+        """
+        if "release-" + key not in self._boundKeys:
+            self._screen.onkeyrelease(func, key)
+            self._boundKeys.append("release-" + key)
+
     def _bind_keys(self):
-        self._bind_key("Left", self._handle_left)
-        self._bind_key("Right", self._handle_right)
-        self._bind_key("Up", self._handle_up)
-        self._bind_key("space", self._handle_space)
+        for key, bit in Screen.KEY_BITS.items():
+            self._bind_key(key, lambda bit=bit: self._handle_key(bit, True))
+            self._bind_key_release(key,
+                                   lambda bit=bit: self._handle_key(bit, False))
         self._bind_key("q", self._handle_exit)
-        self._bind_key("s", self._handle_special_torpedo)
+        # scrubbing back and forward in time, see rewind.py
+        self._bind_key("comma", self._handle_rewind)
+        self._bind_key("period", self._handle_forward)
+        self._bind_key("Return", self._handle_resume)
 
-    def _handle_special_torpedo(self):
-        self._specialTorpedFired += 1
+    def _handle_key(self, bit, down):
+        self._key_events.append((time.perf_counter_ns(), bit, down))
 
     def _handle_exit(self):
         self._endGame = True
 
-    def _handle_left(self):
-        self._leftClicks += 1
-
-    def _handle_right(self):
-        self._rightClicks += 1
+    def _handle_rewind(self):
+        self._rewindClicks += 1
 
-    def _handle_up(self):
-        self._upClicks += 1
+    def _handle_forward(self):
+        self._forwardClicks += 1
 
-    def _handle_space(self):
-        self._fireClicks += 1
+    def _handle_resume(self):
+        self._resumeClicks += 1
 
     def start_screen(self):
         """
@@ -238,90 +307,227 @@ class Screen:
 
             **This method should not be called by you**
         """
+        self._init_side_widgets()
         tkinter.mainloop()
 
     def update(self):
         """
         This is called to update our game (grphaics-wise).
+        Nothing is done if nothing changed since last update. Updates are
+        at most REFRESH_HZ a second, an update that comes too soon is done
+        later (once), when it is due.
 
         .. warning::
 
             **This method should not be called by you**
         """
-        self._screen.update()
+        if not self._dirty_sprites and not self._dirty:
+            return
+        now = time.perf_counter()
+        if self._last_update is not None:
+            wait = self._last_update + 1 / Screen.REFRESH_HZ - now
+            if wait > 0:
+                if not self._update_pending:
+                    self._update_pending = True
+                    self._root.after(int(wait * Screen.MS_IN_SECOND) + 1,
+                                     self._delayed_update)
+                return
+        self._last_update = now
+        self._draw_turtles(self._dirty_sprites)
+        self._dirty_sprites.clear()
+        self._dirty = False
+        if not self._side_widgets:
+            self._init_side_widgets()
+
+    def _draw_turtles(self, turtles):
+        """
+        Draws the given turtles and updates the canvas, like turtle's
+        TurtleScreen.update, but only the turtles that changed are drawn
+        (it draws all of them).
+        This uses the same turtle internals TurtleScreen.update uses (the
+        screen's _tracing and _update, and RawTurtle's _update_data and
+        _drawturtle), which are in the turtle module of python 2.6 up to
+        at least 3.13. If they are missing, all turtles are drawn with
+        TurtleScreen.update.
+
+        :param turtles: the turtles to draw
+        """
+        screen = self._screen
+        if not (hasattr(screen, "_tracing") and hasattr(screen, "_update")
+                and hasattr(RawTurtle, "_update_data")
+                and hasattr(RawTurtle, "_drawturtle")):
+            screen.update()
+            return
+        tracing = screen._tracing
+        screen._tracing = True
+        for obj in turtles:
+            obj._update_data()
+            obj._drawturtle()
+        screen._tracing = tracing
+        screen._update()
+
+    def _delayed_update(self):
+        self._update_pending = False
+        self.update()
+
+    def _touch(self, obj):
+        """
+        Marks a turtle of the game canvas as changed, it is drawn on next
+        update
+        """
+        self._dirty_sprites[obj] = None
 
     def set_score(self, val):
         """
-        Sets the current game score
+        Sets the current game score, the score label is only set if it
+        changed
 
         :param val: The game score
         :type val: int
         """
+        if val == self._score:
+            return
+        self._score = val
         self._score_val.set(str(val))
+        self._dirty = True
+
+    def set_overlay(self, text):
+        """
+        Shows a text (for ex. frame times of the profiler) under the score,
+        the label is made on first call
+        """
+        if self._overlay_val is None:
+            self._overlay_val = tkinter.StringVar()
+            overlay = tkinter.Label(self._side_frame,
+                                    textvariable=self._overlay_val,
+                                    justify=tkinter.LEFT, font="TkFixedFont")
+            overlay.pack(after=self._score_frame)
+        elif self._overlay_val.get() == text:
+            return
+        self._overlay_val.set(text)
+        self._dirty = True
 
     def _get_ship_obj(self, canvas):
         ship = RawTurtle(canvas)
+        ship.penup()
         ship.shape(ShapesMaster.SHIP_SHAPE)
         ship.color("purple")
         return ship
 
     def _get_asteroid_object(self, size):
+        asteroid = self._reuse_object(ShapesMaster.ASTEROID_BASE_SHAPE%size)
+        if asteroid:
+            return asteroid
         asteroid = RawTurtle(self._cv)
+        asteroid.penup()
         asteroid.shape(ShapesMaster.ASTEROID_BASE_SHAPE%size)
+        self._touch(asteroid)
         return asteroid
 
     def _get_torpedo_object(self):
+        torpedo = self._reuse_object(ShapesMaster.TORPEDO_SHAPE)
+        if torpedo:
+            return torpedo
         torpedo = RawTurtle(self._cv)
+        torpedo.penup()
         torpedo.shape(ShapesMaster.TORPEDO_SHAPE)
         torpedo.color("blue")
+        self._touch(torpedo)
         return torpedo
 
+    def _reuse_object(self, shape):
+        """
+        Takes an un-registered turtle of the given shape and shows it again,
+        returns None if there is no such turtle.
+        """
+        free = self._free_sprites.get(shape)
+        if not free:
+            return None
+        obj = free.pop()
+        obj.st()
+        self._touch(obj)
+        return obj
+
     def _draw_object(self,obj,x,y,heading=None):
-        obj.penup()
+        # turtles are made with pen up, so moving them draws no line
         obj.goto(x,y)
-        if heading:
+        if heading is not None:
             obj.setheading(heading)
-        obj.pendown()
+        self._touch(obj)
 
     def remove_life(self):
         """
         Remove one icon of life (starts with 3 lives)
         """
+        self._init_side_widgets()
         deadship = self._lives.pop()
         deadship.ht()
+        self._dead_lives.append(deadship)
+        self._dirty = True
+
+    def set_lives(self, lives):
+        """
+        Shows icons of the given number of lives (up to the 3 icons), for
+        ex. when a saved game state is loaded
+        """
+        self._init_side_widgets()
+        while len(self._lives) > lives:
+            self.remove_life()
+        while len(self._lives) < lives and self._dead_lives:
+            life = self._dead_lives.pop()
+            life.st()
+            self._lives.append(life)
+            self._dirty = True
 
-    def register_asteroid(self, asteroid, size):
+    def register_asteroid(self, asteroid_id, size):
         """
         This is called to register a new asteroid in our system
 
-        :param asteroid: This is your asteroid object
-        :type asteroid: Asteroid
+        :param asteroid_id: This is the entity id of your asteroid (see world.py)
+        :type asteroid_id: int
 
         :param size: The size of the asteroid (this should be in [1,2,3])
         :type size: int
+        :raise ValueError: if size is wrong or id is already registered
         """
         if size not in [1,2,3]:
-            print("Error: Wrong asteroid size: %d"%size)
-            sys.exit(0)
-        elif id(asteroid) in self._asteroids:
-            print("Error: Asteroid id (%d) already exists"%asteroid_id)
-            sys.exit(0)
-        asteroid_obj = self._get_asteroid_object(size)
-        self._asteroids[ id(asteroid) ] = asteroid_obj
+            raise ValueError("Wrong asteroid size: %d" % size)
+        if asteroid_id in self._asteroids:
+            raise ValueError("Asteroid id (%d) already exists" % asteroid_id)
+        self._asteroids.add(asteroid_id, self._get_asteroid_object(size))
+
+    def register_asteroids(self, asteroid_ids, sizes):
+        """
+        This is called to register many new asteroids at once (for ex. the
+        asteroids of a split), see register_asteroid
 
+        :param asteroid_ids: entity ids of the asteroids
+        :param sizes: sizes of the asteroids, in the same order
+        """
+        for asteroid_id, size in zip(asteroid_ids, sizes):
+            self.register_asteroid(asteroid_id, size)
 
-    def register_torpedo(self, torpedo):
+    def register_torpedo(self, torpedo_id):
         """
         This is called to register a new torpedo in our system
 
-        :param asteroid: This is your torpedo object
-        :type asteroid: Torpedo
+        :param torpedo_id: This is the entity id of your torpedo (see world.py)
+        :type torpedo_id: int
+        :raise ValueError: if id is already registered
+        """
+        if torpedo_id in self._torpedos:
+            raise ValueError("Torpedo id (%d) already exists" % torpedo_id)
+        self._torpedos.add(torpedo_id, self._get_torpedo_object())
+
+    def register_torpedoes(self, torpedo_ids):
+        """
+        This is called to register many new torpedoes at once, see
+        register_torpedo
+
+        :param torpedo_ids: entity ids of the torpedoes
         """
-        if id(torpedo) in self._torpedos:
-            print("Error: Torpedo id (%d) already exists"%torpedo_id)
-            sys.exit(0)
-        torpedo_obj = self._get_torpedo_object()
-        self._torpedos[ id(torpedo) ] = torpedo_obj
+        for torpedo_id in torpedo_ids:
+            self.register_torpedo(torpedo_id)
 
     def draw_ship(self,x,y, heading):
         """
@@ -335,86 +541,113 @@ class Screen:
         :type heading: float
 
         """
+        if self._ship_drawn == (x, y, heading):
+            return
+        self._ship_drawn = (x, y, heading)
         self._draw_object(self._ship, x, y, heading)
 
-    def draw_asteroid(self, asteroid, x, y):
+    def draw_frame(self, ship_state, asteroid_array, torpedo_array):
+        """
+        Draw a whole frame in one call: the ship, all asteroids and all
+        torpedoes. Objects that did not move since they were last drawn are
+        skipped.
+
+        :param ship_state: (x, y, heading) of the ship, None for no ship
+        :type ship_state: tuple
+        :param asteroid_array: (ids, xs, ys) - entity ids and coordinates of
+        the asteroids (remember to register them before), as arrays in the
+        same order
+        :type asteroid_array: tuple
+        :param torpedo_array: (ids, xs, ys, headings) - entity ids,
+        coordinates and headings of the torpedoes, as arrays in the same
+        order
+        :type torpedo_array: tuple
+        :raise KeyError: if an id is not registered
+        """
+        if ship_state is not None:
+            self.draw_ship(*ship_state)
+        for obj, x, y, heading in self._asteroids.iter_moved(*asteroid_array):
+            self._draw_object(obj, x, y)
+        for obj, x, y, heading in self._torpedos.iter_moved(*torpedo_array):
+            self._draw_object(obj, x, y, heading)
+
+    def draw_asteroid(self, asteroid_id, x, y):
         """
         Draw the given asteroid on the specified (x,y) coordinates
 
-        :param asteroid: This is your asteroid object (remember to register it before)
-        :type asteroid: Asteroid
+        :param asteroid_id: This is the entity id of your asteroid (remember to register it before)
+        :type asteroid_id: int
         :param x: This is the X coordinate of the asteroid
         :type x: int
         :param y: This is the Y coordinate of the asteroid
         :type y: int
-
+        :raise KeyError: if id is not registered
         """
-        asteroid_id = id(asteroid)
-        if asteroid_id not in self._asteroids:
-            print("Error: Asteroid id (%d) not found. "%asteroid_id +
-                  "Are you sure there is such an asteroid?")
-            sys.exit(0)
-
-        self._draw_object(self._asteroids[asteroid_id], x, y)
+        asteroid = self._asteroids.get_moved(asteroid_id, x, y)
+        if asteroid is not None:
+            self._draw_object(asteroid, x, y)
 
-    def draw_torpedo(self, torpedo, x, y, heading):
+    def draw_torpedo(self, torpedo_id, x, y, heading):
         """
         Draw the given torpedo on the specified (x,y) coordinates with the given heading
 
-        :param asteroid: This is your torpedo object (remember to register it before)
-        :type asteroid: Torpedo
+        :param torpedo_id: This is the entity id of your torpedo (remember to register it before)
+        :type torpedo_id: int
         :param x: This is the X coordinate of the torpedo
         :type x: int
         :param y: This is the Y coordinate of the torpedo
         :type y: int
         :param heading: This is the heading of the torpedo
         :type heading: float
+        :raise KeyError: if id is not registered
         """
-        torpedo_id = id(torpedo)
-        if torpedo_id not in self._torpedos:
-            print("Torpedo id (%d) not found. "%torpedo_id +
-                  "Are you sure there is such a torpedo?")
-            sys.exit(0)
-
-        self._draw_object(self._torpedos[torpedo_id], x, y, heading)
+        torpedo = self._torpedos.get_moved(torpedo_id, x, y, heading)
+        if torpedo is not None:
+            self._draw_object(torpedo, x, y, heading)
 
     def _remove_object(self, obj):
         obj.penup()
         obj.ht()
         obj.goto(Screen.SCREEN_MAX_X, Screen.SCREEN_MAX_Y*2)
+        self._touch(obj)
+        self._free_sprites.setdefault(obj.shape(), []).append(obj)
 
 
-    def unregister_torpedo(self, torpedo):
+    def unregister_torpedo(self, torpedo_id):
         """
         This is called to un-register an existing torpedo in our system
 
-        :param asteroid: This is your torpedo object
-        :type asteroid: Torpedo
+        :param torpedo_id: This is the entity id of your torpedo
+        :type torpedo_id: int
+        :raise KeyError: if id is not registered
+        """
+        self._remove_object(self._torpedos.pop(torpedo_id))
+
+    def unregister_torpedoes(self, torpedo_ids):
+        """
+        This is called to un-register many torpedoes at once, see
+        unregister_torpedo
         """
-        torpedo_id = id(torpedo)
-        if torpedo_id not in self._torpedos:
-            print("Torpedo id (%d) not found. "%torpedo_id +
-                  "Are you sure there is such a torpedo?")
-            sys.exit(0)
-        torpedo_obj = self._torpedos[ torpedo_id ]
-        self._remove_object( torpedo_obj )
-        self._torpedos.pop( torpedo_id )
+        for torpedo_id in torpedo_ids:
+            self.unregister_torpedo(torpedo_id)
 
-    def unregister_asteroid(self, asteroid):
+    def unregister_asteroid(self, asteroid_id):
         """
         This is called to un-register an existing asteroid in our system
 
-        :param asteroid: This is your asteroid object
-        :type asteroid: Asteroid
+        :param asteroid_id: This is the entity id of your asteroid
+        :type asteroid_id: int
+        :raise KeyError: if id is not registered
+        """
+        self._remove_object(self._asteroids.pop(asteroid_id))
+
+    def unregister_asteroids(self, asteroid_ids):
+        """
+        This is called to un-register many asteroids at once, see
+        unregister_asteroid
         """
-        asteroid_id = id(asteroid)
-        if asteroid_id not in self._asteroids:
-            print("Asteroid id (%d) not found. "%asteroid_id +
-                  "Are you sure there is such an asteroid?")
-            sys.exit(0)
-        asteroid_obj = self._asteroids[ asteroid_id ]
-        self._remove_object( asteroid_obj )
-        self._asteroids.pop( asteroid_id )
+        for asteroid_id in asteroid_ids:
+            self.unregister_asteroid(asteroid_id)
 
     def _clear_screen(self):
         self._cv.delete('all')
@@ -427,44 +660,109 @@ class Screen:
         return self._endGame
 
 
+    def poll_input(self):
+        """
+        Takes all key events since last call, it is called once at the start
+        of each loop of the game.
+        Input of the loop is the keys pressed since last call, even if they
+        were already released (so a short tap is not lost), and the keys of
+        REPEAT_KEYS held down long enough to act again (see KEY_REPEAT_HZ).
+        So a tap of fire launches one torpedo, and holding turn or thrust
+        acts at the same rate whatever the length of a loop is.
+        A key-down of a key that is already held (auto-repeat of the system)
+        acts again only if it is not in REPEAT_KEYS.
+        input_event_ns is set to the time (perf_counter_ns) of the first key
+        press taken, None if there was none, for measuring input latency.
+
+        :returns: input bitmask as defined in controls.py
+        """
+        now = time.perf_counter_ns()
+        held = self._held_keys
+        pressed = controls.NO_INPUT
+        first = None
+        repeat_ns = self._repeat_ns
+        events = self._key_events
+        while events:
+            event_ns, bit, down = events.popleft()
+            if not down:
+                held &= ~bit
+                continue
+            if bit in repeat_ns:
+                if held & bit:
+                    # auto-repeat of a held key, repeated below instead
+                    continue
+                repeat_ns[bit] = event_ns + \
+                    Screen.KEY_REPEAT_DELAY_MS * Screen.NS_IN_MS
+            held |= bit
+            pressed |= bit
+            if first is None:
+                first = event_ns
+        interval = Screen.MS_IN_SECOND * Screen.NS_IN_MS // \
+            Screen.KEY_REPEAT_HZ
+        for bit in Screen.REPEAT_KEYS:
+            if held & bit and not pressed & bit and now >= repeat_ns[bit]:
+                pressed |= bit
+                # next repeat is one interval after this one was due, but
+                # repeats that were missed (for ex. in a long loop) are not
+                # made up for
+                repeat_ns[bit] = max(repeat_ns[bit], now - interval) + interval
+        self._held_keys = held
+        self._input = pressed
+        self.input_event_ns = first
+        return self._input
+
     def is_left_pressed(self):
         """
-        :returns: True if the left key was pressed, else False
+        :returns: True if the left key was pressed in this loop, else False
         """
-        res = self._leftClicks > 0
-        self._leftClicks -= 1 if res else 0
-        return res
+        return bool(self._input & controls.LEFT)
 
     def is_up_pressed(self):
         """
-        :returns: True if the up key was pressed, else False
+        :returns: True if the up key was pressed in this loop, else False
         """
-        res = self._upClicks > 0
-        self._upClicks -= 1 if res else 0
-        return res
+        return bool(self._input & controls.UP)
 
     def is_right_pressed(self):
         """
-        :returns: True if the right key was pressed, else False
+        :returns: True if the right key was pressed in this loop, else False
         """
-        res = self._rightClicks > 0
-        self._rightClicks -= 1 if res else 0
-        return res
+        return bool(self._input & controls.RIGHT)
 
     def is_space_pressed(self):
         """
-        :returns: True if the fire key was pressed, else False
+        :returns: True if the fire key was pressed in this loop, else False
         """
-        res = self._fireClicks > 0
-        self._fireClicks -= 1 if res else 0
-        return res
+        return bool(self._input & controls.FIRE)
 
     def is_special_pressed(self):
         """
-        :returns: True if the fire key was pressed, else False
+        :returns: True if the special key was pressed in this loop, else False
+        """
+        return bool(self._input & controls.SPECIAL)
+
+    def is_rewind_pressed(self):
         """
-        res = self._specialTorpedFired > 0
-        self._specialTorpedFired -= 1 if res else 0
+        :returns: True if the rewind key (",") was pressed, else False
+        """
+        res = self._rewindClicks > 0
+        self._rewindClicks -= 1 if res else 0
+        return res
+
+    def is_forward_pressed(self):
+        """
+        :returns: True if the forward key (".") was pressed, else False
+        """
+        res = self._forwardClicks > 0
+        self._forwardClicks -= 1 if res else 0
+        return res
+
+    def is_resume_pressed(self):
+        """
+        :returns: True if the resume key (Enter) was pressed, else False
+        """
+        res = self._resumeClicks > 0
+        self._resumeClicks -= 1 if res else 0
         return res
 
     def show_message(self,title, msg):
@@ -478,6 +776,46 @@ class Screen:
         """
         tkinter.messagebox.showinfo(str(title), str(msg) )
 
+    def notify(self, title, msg, duration=NOTIFICATION_MS):
+        """
+        This is a method used to show short messages in the game, on top of
+        the game canvas, for some time. Unlike show_message it does not wait
+        for the user, the game goes on while it is shown.
+
+        :param title: The title of the message.
+        :type title: str
+        :param msg: The message to show.
+        :type msg: str
+        :param duration: milliseconds to show the message for.
+        :type duration: int
+        """
+        item = self._cv.create_text(0, 0, text="%s\n%s" % (title, msg),
+                                    fill=Screen.NOTIFICATION_COLOR,
+                                    font=Screen.NOTIFICATION_FONT,
+                                    justify=tkinter.CENTER, anchor=tkinter.N)
+        self._notifications.append(item)
+        self._place_notifications()
+        self._dirty = True
+        self._root.after(duration, self._expire_notification, item)
+
+    def _expire_notification(self, item):
+        self._cv.delete(item)
+        self._notifications.remove(item)
+        self._place_notifications()
+        self._dirty = True
+
+    def _place_notifications(self):
+        """
+        Stacks notifications from the top of the canvas down, oldest first
+        """
+        top = -Screen.SCREEN_MAX_Y * self._screen.yscale + \
+            Screen.NOTIFICATION_MARGIN
+        for item in self._notifications:
+            self._cv.coords(item, 0, top)
+            bbox = self._cv.bbox(item)
+            if bbox:
+                top = bbox[3] + Screen.NOTIFICATION_MARGIN
+
     def end_game(self):
         """
         This ends the current game.
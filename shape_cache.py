@@ -0,0 +1,87 @@
+############################################################
+# FILE : shape_cache.py
+
+# DESCRIPTION: This file contains RotatedShapeCache class, a cache of shape
+# layouts of the Asteroids! game already rotated to a heading.
+# Ship turns in steps of whole degrees (and torpedoes get its heading), so
+# headings are rounded to HEADING_STEP and every heading of the turning
+# shapes can be rotated once at start (preload). Other shapes and headings
+# are rotated when first drawn and kept, up to a max size, dropping the least
+# recently used ones.
+# Drawing a rotated shape is then only adding its position to the points.
+############################################################
+# Imports
+############################################################
+import math
+from collections import OrderedDict
+############################################################
+# RotatedShapeCache class
+############################################################
+
+
+class RotatedShapeCache:
+    """
+    A class representing a cache of rotated shape layouts.
+    Layouts are rotated like turtle shapes: layout y axis is the heading
+    direction, and points are given in canvas pixels (canvas y axis points
+    down), as offsets from the object position.
+    """
+    HEADING_STEP = 1
+    FULL_CIRCLE = 360
+    MAX_SIZE = 1024
+
+    def __init__(self, layouts, heading_step=HEADING_STEP, max_size=MAX_SIZE):
+        """
+        RotatedShapeCache object constructor
+        :param layouts: dict of shape name to layout (tuple of (x, y) points)
+        :type layouts: dict
+        :param heading_step: headings are rounded to multiples of this value
+        :param max_size: max number of rotated layouts kept
+        """
+        self.__layouts = layouts
+        self.__step = heading_step
+        self.__steps = int(round(self.FULL_CIRCLE / heading_step))
+        self.__max_size = max_size
+        self.__cache = OrderedDict()
+
+    def preload(self, name):
+        """
+        This method rotates a shape to all the headings of a full circle
+        (as long as they fit in max size).
+        :param name: shape name
+        """
+        for step in range(self.__steps):
+            if len(self.__cache) >= self.__max_size:
+                return
+            self.__cache[(name, step)] = self.__rotate(name, step)
+
+    def __len__(self):
+        return len(self.__cache)
+
+    def __rotate(self, name, step):
+        """
+        :return: layout of shape name rotated to heading step, as a tuple of
+        (x, y) offsets in canvas pixels
+        """
+        rad = step * self.__step * (math.pi / 180)
+        e0, e1 = math.cos(rad), math.sin(rad)
+        return tuple((e1 * x + e0 * y, e0 * x - e1 * y)
+                     for x, y in self.__layouts[name])
+
+    def get(self, name, heading):
+        """
+        This method gets a shape rotated to a heading.
+        :param name: shape name
+        :param heading: heading in degrees
+        :return: tuple of (x, y) offsets in canvas pixels
+        """
+        key = (name, int(round(heading / self.__step)) % self.__steps)
+        points = self.__cache.get(key)
+        if points is None:
+            points = self.__rotate(*key)
+            self.__cache[key] = points
+            if len(self.__cache) > self.__max_size:
+                self.__cache.popitem(last=False)
+        else:
+            self.__cache.move_to_end(key)
+        return points
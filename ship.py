@@ -5,10 +5,13 @@
 # Ship class has getters for all args, and radius getter (const.),
 # other method are for ship's movement in the 2D game -
 # turning (degrees), accelerating and moving.
+# Ship args are kept in a row of an EntityTable (see world.py), the object
+# is a view to its row.
 ############################################################
 # Imports
 ############################################################
 import math
+from world import EntityTable
 ############################################################
 # Ship class
 ############################################################
@@ -25,7 +28,10 @@ class Ship:
     Degrees for urning the ship are defined with TURN_RIGHT_DEGREE, TURN_LEFT_DEGREE.
     consts AXIS_X, AXIS_Y, MIN, MAX are used for the structural implementation
     of object's bounds arg.
+    Ship only holds its table, row index and bounds (in slots, no
+    per-object dict), all other args are in the table columns.
     """
+    __slots__ = ("_table", "_index", "bounds")
     AXIS_X = 0
     AXIS_Y = 1
     MIN = 0
@@ -36,7 +42,7 @@ class Ship:
     TURN_RIGHT_DEGREE = -7
     TURN_LEFT_DEGREE = 7
 
-    def __init__(self, pos, bounds):
+    def __init__(self, pos, bounds, table=None):
         """
         Asteroid object constructor
         :param pos: location on 2d matrix as (x, y)
@@ -45,12 +51,18 @@ class Ship:
         each tuple incl. min and max values for screen bounds.
         for ex. [(min_x, max_x), (min_y, max_y)]
         :type bounds: list
+        :param table: table of ships to keep args in, if not given
+        ship gets a table of its own.
+        :type table: EntityTable
         :return: a new Ship obj. with given params, and also speed and heading
         as defined in initial consts.
         """
-        self.__pos = pos
-        self.__speed = self.SHIP_INITIAL_SPEED
-        self.__heading = self.SHIP_INITIAL_DEGREE
+        self._table = None
+        self._index = -1
+        if table is None:
+            table = EntityTable()
+        table.add(self, pos, self.SHIP_INITIAL_SPEED, self.RADIUS,
+                  heading=self.SHIP_INITIAL_DEGREE)
         self.bounds = bounds
 
     def get_coordinates(self):
@@ -58,35 +70,35 @@ class Ship:
         Ship's coordinates getter
         :return: ship pos arg (tuple)
         """
-        return self.__pos
+        return self._table.x[self._index], self._table.y[self._index]
 
     def get_speed(self):
         """
         Ship's speed getter
         :return: ship speed arg (tuple)
         """
-        return self.__speed
+        return self._table.vx[self._index], self._table.vy[self._index]
 
     def get_heading(self):
         """
         Ship's heading getter
         :return: ship heading arg (in degrees)
         """
-        return self.__heading
+        return self._table.heading[self._index]
 
     def get_x(self):
         """
         Ship's Y coordinate getter
         :return: Y coordinate of ship's position
         """
-        return self.__pos[self.AXIS_X]
+        return self._table.x[self._index]
 
     def get_y(self):
         """
         Ship's Y coordinate getter
         :return: Y coordinate of ship's position
         """
-        return self.__pos[self.AXIS_Y]
+        return self._table.y[self._index]
 
     def get_radius(self):
         """
@@ -101,14 +113,14 @@ class Ship:
         Turns the ship right (clockwise) with predefined degrees in class consts,
         by adding const.(pos number) to current heading.
         """
-        self.__heading += self.TURN_RIGHT_DEGREE
+        self._table.heading[self._index] += self.TURN_RIGHT_DEGREE
 
     def turn_left(self):
         """
         Turns the ship left (counter-clockwise) with predefined degrees in class
         consts, by adding const.(neg number) to current heading.
         """
-        self.__heading += self.TURN_LEFT_DEGREE
+        self._table.heading[self._index] += self.TURN_LEFT_DEGREE
 
     def get_new_coordinate(self, axis, axis_bounds):
         """
@@ -124,7 +136,7 @@ class Ship:
         :return: new coordination according to formula within a given axis, x or y.
         """
         dif_axis = axis_bounds[self.MAX] - axis_bounds[self.MIN]
-        new_coord = (self.__speed[axis] + self.__pos[axis] - axis_bounds[self.MIN]) % dif_axis + axis_bounds[self.MIN]
+        new_coord = (self.get_speed()[axis] + self.get_coordinates()[axis] - axis_bounds[self.MIN]) % dif_axis + axis_bounds[self.MIN]
         return new_coord
 
     def move(self):
@@ -133,14 +145,15 @@ class Ship:
         """
         new_coord_x = self.get_new_coordinate(self.AXIS_X, self.bounds[self.AXIS_X])
         new_coord_y = self.get_new_coordinate(self.AXIS_Y, self.bounds[self.AXIS_Y])
-        self.__pos = (new_coord_x, new_coord_y)
+        self._table.x[self._index] = new_coord_x
+        self._table.y[self._index] = new_coord_y
 
     def degree_to_rad(self):
         """
         this helper method converts degrees to radians
         :return: heading of ship in radians
         """
-        return self.__heading * (math.pi / 180)
+        return self.get_heading() * (math.pi / 180)
 
     def accelerate(self):
         """
@@ -149,6 +162,5 @@ class Ship:
         Axis X: new speed = current speed + cos(heading in rad)
         Axis X: new speed = current speed + sin(heading in rad)
         """
-        new_x_speed = self.__speed[self.AXIS_X] + math.cos(self.degree_to_rad())
-        new_y_speed = self.__speed[self.AXIS_Y] + math.sin(self.degree_to_rad())
-        self.__speed = (new_x_speed, new_y_speed)
+        self._table.vx[self._index] += math.cos(self.degree_to_rad())
+        self._table.vy[self._index] += math.sin(self.degree_to_rad())
@@ -0,0 +1,131 @@
+############################################################
+# FILE : sprite_index.py
+
+# DESCRIPTION: This file contains SpriteIndex class, the registry of the
+# sprites (turtles, canvas polygons) of one kind of objects of the Asteroids!
+# game in a render backend, by entity id.
+# Entity ids are the handles of the world tables (see world.py): a slot,
+# dense and re-used, and a serial that is never re-used. Sprites are kept in
+# a list by slot, so finding the sprite of an object is a list index, and the
+# full id kept with each sprite tells a live object from a removed one.
+# The place (x, y, heading) each sprite was last drawn at is kept as well, so
+# drawing skips objects that did not move (see get_moved, iter_moved).
+############################################################
+# Imports
+############################################################
+from itertools import repeat
+
+from world import EntityTable
+############################################################
+# SpriteIndex class
+############################################################
+
+
+class SpriteIndex:
+    """
+    A class representing sprites of objects, by entity id.
+    FREE marks a slot with no sprite.
+    """
+    FREE = -1
+
+    def __init__(self):
+        """
+        SpriteIndex object constructor
+        :return: an empty index
+        """
+        self.__ids = []
+        self.__sprites = []
+        # (x, y, heading) each sprite was last drawn at, None if not drawn
+        self.__drawn = []
+        self.__count = 0
+
+    def __len__(self):
+        return self.__count
+
+    def __contains__(self, entity_id):
+        slot = EntityTable.get_slot(entity_id)
+        return slot < len(self.__ids) and self.__ids[slot] == entity_id
+
+    def add(self, entity_id, sprite):
+        """
+        This method keeps the sprite of an entity id.
+        :raise ValueError: if the slot of the id already has a sprite
+        """
+        slot = EntityTable.get_slot(entity_id)
+        ids = self.__ids
+        if slot >= len(ids):
+            grow = slot + 1 - len(ids)
+            ids.extend([self.FREE] * grow)
+            self.__sprites.extend([None] * grow)
+            self.__drawn.extend([None] * grow)
+        elif ids[slot] != self.FREE:
+            raise ValueError("Entity id (%d) already registered, slot taken by "
+                             "entity id (%d)" % (entity_id, ids[slot]))
+        ids[slot] = entity_id
+        self.__sprites[slot] = sprite
+        self.__drawn[slot] = None
+        self.__count += 1
+
+    def get(self, entity_id):
+        """
+        :return: the sprite of an entity id
+        :raise KeyError: if there is no sprite of the id
+        """
+        slot = EntityTable.get_slot(entity_id)
+        if slot >= len(self.__ids) or self.__ids[slot] != entity_id:
+            raise KeyError("Entity id (%d) not registered" % entity_id)
+        return self.__sprites[slot]
+
+    def pop(self, entity_id):
+        """
+        This method removes the sprite of an entity id from index.
+        :return: the sprite
+        :raise KeyError: if there is no sprite of the id
+        """
+        sprite = self.get(entity_id)
+        slot = EntityTable.get_slot(entity_id)
+        self.__ids[slot] = self.FREE
+        self.__sprites[slot] = None
+        self.__drawn[slot] = None
+        self.__count -= 1
+        return sprite
+
+    def get_moved(self, entity_id, x, y, heading=0):
+        """
+        This method is for drawing one object: the place is kept as where
+        its sprite was drawn.
+        :return: the sprite of an entity id, None if it was last drawn at
+        the same place
+        :raise KeyError: if there is no sprite of the id
+        """
+        sprite = self.get(entity_id)
+        slot = EntityTable.get_slot(entity_id)
+        place = (x, y, heading)
+        if self.__drawn[slot] == place:
+            return None
+        self.__drawn[slot] = place
+        return sprite
+
+    def iter_moved(self, entity_ids, xs, ys, headings=None):
+        """
+        This generator method is for drawing many objects in one pass, like
+        get_moved for each object, with no method call for each one.
+        :param entity_ids: entity ids of the objects
+        :param xs, ys: positions of the objects, in the same order
+        :param headings: headings of the objects, all 0 if not given
+        :return: (sprite, x, y, heading) of each object that moved since its
+        sprite was last drawn
+        :raise KeyError: if there is no sprite of an id
+        """
+        ids, sprites, drawn = self.__ids, self.__sprites, self.__drawn
+        mask = EntityTable.SLOT_MASK
+        if headings is None:
+            headings = repeat(0)
+        for entity_id, x, y, heading in zip(entity_ids, xs, ys, headings):
+            slot = entity_id & mask
+            if slot >= len(ids) or ids[slot] != entity_id:
+                raise KeyError("Entity id (%d) not registered" % entity_id)
+            place = (x, y, heading)
+            if drawn[slot] != place:
+                drawn[slot] = place
+                yield sprites[slot], x, y, heading
@@ -0,0 +1,237 @@
+############################################################
+# FILE : startup_bench.py
+
+# DESCRIPTION: This file contains StartupCase class and the benchmark of the
+# startup time of the Asteroids! game.
+# Each case is a short python code run in a new python process (so nothing
+# is imported yet), a number of times, and reports:
+# time of the code in the process (from before its imports to the end of it),
+# wall time of the whole process (python startup included), and which of the
+# slow to import modules (tkinter, turtle, argparse) the code imported.
+# Cases: importing the game, starting a headless game and stepping one loop,
+# the command line help, and starting the GUI (turtles and canvas backends)
+# up to the first frame drawn. GUI cases are skipped where there is no
+# display.
+#
+# Main Function: runs all cases (or the given ones), prints a table and
+# writes results as json (--output), for comparing between commits
+# (--compare OLD.json prints the change in time of the code).
+############################################################
+# Imports
+############################################################
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from bench import get_commit, percentile
+
+NS_IN_MS = 10 ** 6
+DEFAULT_RUNS = 10
+HEAVY_MODULES = ("tkinter", "turtle", "argparse")
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+# code is timed from the end of HEADER to the start of FOOTER
+HEADER = "import time\nstart = time.perf_counter_ns()\n"
+FOOTER = """
+end = time.perf_counter_ns()
+import json, sys
+print(json.dumps({"ns": end - start,
+                  "modules": [name for name in %r if name in sys.modules]}))
+""" % (HEAVY_MODULES,)
+# GUI cases are skipped if tkinter fails (for ex. no display), any other
+# error fails the case
+SKIP = """
+import json, tkinter
+if not isinstance(error, tkinter.TclError):
+    raise
+print(json.dumps({"skip": str(error)}))
+"""
+############################################################
+# StartupCase class
+############################################################
+
+
+class StartupCase:
+    """
+    A class representing a startup benchmark case: python code run in a new
+    process, with the game directory as working directory.
+    setup: code run before the timed code (not timed)
+    teardown: code run after the timed code (not timed)
+    gui: True for a case that opens the GUI, it is skipped if tkinter fails
+    (for ex. no display). An error in any other case fails the benchmark.
+    """
+
+    def __init__(self, name, code, setup="", teardown="", gui=False):
+        self.name = name
+        self.code = code
+        self.setup = setup
+        self.teardown = teardown
+        self.gui = gui
+
+    def get_script(self):
+        """
+        :return: the python code run in the process
+        """
+        body = HEADER + self.code + FOOTER + self.teardown
+        if not self.gui:
+            return self.setup + body
+        return self.setup + "try:\n" + indent(body) + \
+            "except Exception as error:\n" + indent(SKIP)
+
+    def run(self):
+        """
+        This method runs the case once in a new process.
+        :return: (result of the code as dict, wall time of process in ns)
+        :raise subprocess.CalledProcessError: if the code failed
+        """
+        start = time.perf_counter_ns()
+        output = subprocess.check_output([sys.executable, "-c",
+                                          self.get_script()],
+                                         cwd=GAME_DIR, universal_newlines=True)
+        wall = time.perf_counter_ns() - start
+        return json.loads(output.splitlines()[-1]), wall
+
+
+GUI_TEARDOWN = "runner._screen._root.destroy()\n"
+CASES = [
+    StartupCase("python", "pass"),
+    StartupCase("import_game", "import asteroids_main"),
+    StartupCase("headless_first_loop",
+                "from asteroids_main import GameRunner\n"
+                "from headless_screen import HeadlessScreen\n"
+                "runner = GameRunner(5, HeadlessScreen(), 1)\n"
+                "runner.step(0)"),
+    StartupCase("cli_help",
+                "import runpy, sys\n"
+                "sys.argv = ['asteroids_main.py', '--help']\n"
+                "try:\n"
+                "    with contextlib.redirect_stdout(io.StringIO()):\n"
+                "        runpy.run_path('asteroids_main.py', run_name='__main__')\n"
+                "except SystemExit:\n"
+                "    pass",
+                setup="import contextlib, io\n"),
+    StartupCase("gui_first_frame",
+                "from asteroids_main import GameRunner\n"
+                "runner = GameRunner(5, None, 1)\n"
+                "runner.render()\n"
+                "runner._screen.update()", teardown=GUI_TEARDOWN, gui=True),
+    StartupCase("canvas_first_frame",
+                "from asteroids_main import GameRunner\n"
+                "from canvas_screen import CanvasScreen\n"
+                "runner = GameRunner(5, CanvasScreen(), 1)\n"
+                "runner.render()\n"
+                "runner._screen.update()", teardown=GUI_TEARDOWN, gui=True),
+]
+############################################################
+# Functions
+############################################################
+
+
+def indent(code):
+    """
+    :return: code with every line indented one level
+    """
+    return "".join("    " + line + "\n" for line in code.strip("\n").split("\n"))
+
+
+def summarize(times):
+    """
+    :param times: list of times in ns
+    :return: dict of median and min in ms
+    """
+    ordered = sorted(times)
+    return {"median_ms": percentile(ordered, 0.5) / NS_IN_MS,
+            "min_ms": ordered[0] / NS_IN_MS}
+
+
+def run_case(case, runs):
+    """
+    This function runs a case a number of times.
+    :return: dict of its results, or of the reason it was skipped
+    """
+    times = []
+    walls = []
+    modules = []
+    for i in range(runs):
+        result, wall = case.run()
+        if "skip" in result:
+            return {"skipped": result["skip"]}
+        times.append(result["ns"])
+        walls.append(wall)
+        modules = result["modules"]
+    return {"runs": runs,
+            "code": summarize(times),
+            "wall": summarize(walls),
+            "modules": modules}
+
+
+def run_benchmark(names=None, runs=DEFAULT_RUNS):
+    """
+    This function runs the benchmark cases.
+    :param names: names of cases to run, all if not given
+    :param runs: number of times each case is run
+    :return: dict of results (json ready)
+    """
+    results = {}
+    for case in CASES:
+        if not names or case.name in names:
+            results[case.name] = run_case(case, runs)
+    return {"commit": get_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cases": results}
+
+
+def print_results(report, old=None):
+    """
+    This function prints results as a table, with the change of time of the
+    code from old results if given.
+    """
+    print("%-20s %10s %10s %10s %8s  %s" %
+          ("case", "code ms", "min ms", "wall ms", "change", "imported"))
+    for name, result in report["cases"].items():
+        if "skipped" in result:
+            print("%-20s skipped: %s" % (name, result["skipped"]))
+            continue
+        change = ""
+        before = old["cases"].get(name, {}).get("code") if old else None
+        if before and before["median_ms"]:
+            change = "%+7.1f%%" % ((result["code"]["median_ms"] /
+                                    before["median_ms"] - 1) * 100)
+        print("%-20s %10.2f %10.2f %10.2f %8s  %s" % (
+            name, result["code"]["median_ms"], result["code"]["min_ms"],
+            result["wall"]["median_ms"], change,
+            ",".join(result["modules"]) or "-"))
+
+
+def main(argv):
+    """
+    main func. runs benchmark and prints / writes its results.
+    :param argv: command line args (without program name)
+    """
+    parser = argparse.ArgumentParser(description="Asteroids! startup benchmark")
+    parser.add_argument("cases", nargs="*",
+                        help="cases to run (all by default): " +
+                             ", ".join(case.name for case in CASES))
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS,
+                        help="number of times each case is run")
+    parser.add_argument("--output", metavar="PATH",
+                        help="write results (json) to PATH")
+    parser.add_argument("--compare", metavar="PATH",
+                        help="results (json) of an older run to compare to")
+    args = parser.parse_args(argv)
+    old = None
+    if args.compare:
+        with open(args.compare) as old_file:
+            old = json.load(old_file)
+    report = run_benchmark(args.cases, args.runs)
+    print_results(report, old)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,111 @@
+############################################################
+# FILE : test_batch_env.py
+
+# DESCRIPTION: Tests of the batched games (see batch_env.py), against the
+# same games run by GameRunner. Skipped if NumPy is not installed.
+############################################################
+# Imports
+############################################################
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+    from batch_env import BatchEnv
+except ImportError:
+    np = None
+
+import controls
+from asteroids_main import GameRunner, MAX_SEED
+from headless_screen import HeadlessScreen
+from world import EntityTable
+############################################################
+# BatchEnvTest class
+############################################################
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class BatchEnvTest(unittest.TestCase):
+    N = 8
+    ASTEROIDS = 6
+    STEPS = 400
+    SEED = 3
+
+    def new_runners(self, seeds):
+        return [GameRunner(self.ASTEROIDS, HeadlessScreen(),
+                           seeds.randrange(MAX_SEED)) for i in range(self.N)]
+
+    def assert_same_game(self, env, i, runner):
+        """
+        This method checks that game i of env has the objects, score and
+        lives of runner.
+        """
+        world = runner.get_world()
+        self.assertEqual(env.get_scores()[i], runner.get_score())
+        self.assertEqual(env.get_lives()[i], runner.get_lives())
+        for kind in BatchEnv.KINDS:
+            table = getattr(world, kind)
+            rows = len(table)
+            self.assertEqual(env.get_counts(kind)[i], rows, kind)
+            expected = np.array([getattr(table, column)
+                                 for column in EntityTable.COLUMNS]).T
+            values = np.array([env.observations[kind][column][i]
+                               for column in EntityTable.COLUMNS]).T
+            self.assertFalse(values[rows:].any())
+            values = values[:rows]
+            if kind == "asteroids":
+                # asteroids split by a torpedo are added in grid order in
+                # GameRunner, rows may be in another order
+                expected = expected[np.lexsort(expected.T[::-1])]
+                values = values[np.lexsort(values.T[::-1])]
+            np.testing.assert_allclose(
+                values, expected, atol=1e-9,
+                err_msg="%s of game %d" % (kind, i))
+
+    def test_same_as_runners(self):
+        env = BatchEnv(self.N, self.ASTEROIDS, self.SEED)
+        seeds = random.Random(self.SEED)
+        runners = self.new_runners(seeds)
+        for i, runner in enumerate(runners):
+            self.assert_same_game(env, i, runner)
+        actions = random.Random(self.SEED)
+        bits = [controls.LEFT, controls.RIGHT, controls.UP, controls.FIRE]
+        ended = 0
+        for step in range(self.STEPS):
+            inputs = [sum(bit for bit in bits if actions.random() < 0.4)
+                      for i in range(self.N)]
+            scores = [runner.get_score() for runner in runners]
+            for i, runner in enumerate(runners):
+                if env.dones[i]:
+                    runners[i] = runner = GameRunner(
+                        self.ASTEROIDS, HeadlessScreen(),
+                        seeds.randrange(MAX_SEED))
+                    scores[i] = 0
+            observations, rewards, dones = env.step(inputs)
+            running = [runner.step(inputs[i], False)
+                       for i, runner in enumerate(runners)]
+            self.assertEqual(list(dones), [not value for value in running])
+            self.assertEqual(list(rewards),
+                             [runner.get_score() - scores[i]
+                              for i, runner in enumerate(runners)])
+            ended += sum(dones)
+            # a game that ended does not finish its last loop
+            for i, runner in enumerate(runners):
+                if not dones[i]:
+                    self.assert_same_game(env, i, runner)
+        self.assertTrue(ended)
+
+    def test_reset(self):
+        env = BatchEnv(self.N, self.ASTEROIDS, self.SEED)
+        env.step([controls.FIRE] * self.N)
+        env.reset(2)
+        self.assertEqual(env.get_counts("torpedoes")[2], 0)
+        self.assertEqual(env.get_counts("torpedoes")[1], 1)
+        self.assertFalse(env.observations["torpedoes"]["radius"][2].any())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+############################################################
+# FILE : test_collision.py
+
+# DESCRIPTION: Tests of collision detection (see collision.py): hits across
+# the screen edges, swept hits of fast objects, and the grid finding the same
+# collisions as checking every pair.
+############################################################
+# Imports
+############################################################
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collision import SpatialHash, find_collisions, find_hits
+from world import EntityTable
+
+BOUNDS = [(-500, 500), (-400, 400)]
+CELL_SIZE = 90
+ASTEROID_RADIUS = 15
+TORPEDO_RADIUS = 4
+
+
+class Row:
+    _table = None
+    _index = -1
+
+
+def new_table(rows):
+    """
+    :param rows: list of (x, y, vx, vy, radius)
+    :return: EntityTable with a Row view for each row
+    """
+    table = EntityTable()
+    for x, y, vx, vy, radius in rows:
+        table.add(Row(), (x, y), (vx, vy), radius)
+    return table
+
+
+def get_wrapped(d, dif):
+    """
+    :return: distance d on an axis of length dif, taken the short way
+    """
+    return (d + dif / 2) % dif - dif / 2
+
+
+def is_hit(a, b):
+    """
+    Reference narrow phase: closest distance of a and b (x, y, vx, vy,
+    radius) during the last loop, as both moved in a straight line to their
+    current positions on the wrapped screen.
+    """
+    dx = get_wrapped(a[0] - b[0], BOUNDS[0][1] - BOUNDS[0][0])
+    dy = get_wrapped(a[1] - b[1], BOUNDS[1][1] - BOUNDS[1][0])
+    dvx, dvy = a[2] - b[2], a[3] - b[3]
+
+    def distance(t):
+        return (dx + dvx * t) ** 2 + (dy + dvy * t) ** 2
+    times = [-1, 0]
+    if dvx or dvy:
+        t = -(dx * dvx + dy * dvy) / (dvx * dvx + dvy * dvy)
+        if -1 < t < 0:
+            times.append(t)
+    return min(distance(t) for t in times) <= (a[4] + b[4]) ** 2
+############################################################
+# CollisionTest class
+############################################################
+
+
+class CollisionTest(unittest.TestCase):
+
+    def collide(self, asteroid_rows, torpedo_rows):
+        """
+        :return: set of (torpedo row, asteroid row) of colliding pairs
+        """
+        asteroids = new_table(asteroid_rows)
+        torpedoes = new_table(torpedo_rows)
+        grid = SpatialHash(BOUNDS, CELL_SIZE)
+        grid.build(asteroids.x, asteroids.y)
+        return {(torpedo._index, asteroid._index) for torpedo, asteroid in
+                find_collisions(grid, asteroids, torpedoes)}
+
+    def hit(self, asteroid_rows, x, y, radius, speed):
+        """
+        :return: list of rows of asteroids hitting an object
+        """
+        asteroids = new_table(asteroid_rows)
+        grid = SpatialHash(BOUNDS, CELL_SIZE)
+        grid.build(asteroids.x, asteroids.y)
+        return [asteroid._index for asteroid in
+                find_hits(grid, asteroids, x, y, radius, speed)]
+
+    def test_hit_across_x_edge(self):
+        asteroid = (498, 0, 0, 0, ASTEROID_RADIUS)
+        torpedo = (-495, 0, 0, 0, TORPEDO_RADIUS)
+        self.assertEqual(self.collide([asteroid], [torpedo]), {(0, 0)})
+        self.assertEqual(self.hit([asteroid], -495, 0, 10, (0, 0)), [0])
+
+    def test_hit_across_y_edge(self):
+        asteroid = (10, -398, 0, 0, ASTEROID_RADIUS)
+        torpedo = (10, 395, 0, 0, TORPEDO_RADIUS)
+        self.assertEqual(self.collide([asteroid], [torpedo]), {(0, 0)})
+        self.assertEqual(self.hit([asteroid], 10, 395, 10, (0, 0)), [0])
+
+    def test_fast_torpedo_does_not_pass_through(self):
+        # moved from (-40, 0) to (40, 0) in one loop, through the asteroid,
+        # both end positions are out of reach
+        asteroid = (0, 0, 0, 0, ASTEROID_RADIUS)
+        torpedo = (40, 0, 80, 0, TORPEDO_RADIUS)
+        self.assertGreater(40, ASTEROID_RADIUS + TORPEDO_RADIUS)
+        self.assertEqual(self.collide([asteroid], [torpedo]), {(0, 0)})
+        self.assertEqual(self.hit([asteroid], 40, 0, 10, (80, 0)), [0])
+
+    def test_far_pair_does_not_hit(self):
+        asteroid = (0, 0, 1, 1, ASTEROID_RADIUS)
+        torpedo = (200, 150, 5, 5, TORPEDO_RADIUS)
+        self.assertEqual(self.collide([asteroid], [torpedo]), set())
+        self.assertEqual(self.hit([asteroid], 200, 150, 10, (5, 5)), [])
+
+    def test_grid_finds_all_pairs(self):
+        rng = random.Random(1)
+
+        def random_row(max_speed, radius):
+            return (rng.uniform(*BOUNDS[0]), rng.uniform(*BOUNDS[1]),
+                    rng.uniform(-max_speed, max_speed),
+                    rng.uniform(-max_speed, max_speed), radius)
+        asteroid_rows = [random_row(5, rng.choice((15, 30, 45)))
+                         for i in range(300)]
+        torpedo_rows = [random_row(60, TORPEDO_RADIUS) for i in range(100)]
+        expected = {(j, i) for j, torpedo in enumerate(torpedo_rows)
+                    for i, asteroid in enumerate(asteroid_rows)
+                    if is_hit(asteroid, torpedo)}
+        self.assertTrue(expected)
+        self.assertEqual(self.collide(asteroid_rows, torpedo_rows), expected)
+        for torpedo in torpedo_rows:
+            x, y, vx, vy, radius = torpedo
+            self.assertEqual(self.hit(asteroid_rows, x, y, radius, (vx, vy)),
+                             [i for i, asteroid in enumerate(asteroid_rows)
+                              if is_hit(asteroid, torpedo)])
+
+if __name__ == "__main__":
+    unittest.main()
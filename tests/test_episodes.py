@@ -0,0 +1,37 @@
+############################################################
+# FILE : test_episodes.py
+
+# DESCRIPTION: Tests of the command line args of the episode runner (see
+# episodes.py).
+############################################################
+# Imports
+############################################################
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from episodes import parse_args
+############################################################
+# ParseArgsTest class
+############################################################
+
+
+class ParseArgsTest(unittest.TestCase):
+
+    def test_set_constant(self):
+        args = parse_args(["--set", "TORPEDO_LIFETIME=300"])
+        self.assertEqual(args.set, [("TORPEDO_LIFETIME", 300)])
+
+    def test_set_unknown_constant(self):
+        with contextlib.redirect_stderr(io.StringIO()) as error:
+            with self.assertRaises(SystemExit):
+                parse_args(["--set", "NOT_A_CONST=1"])
+        self.assertIn("usage:", error.getvalue())
+        self.assertIn("NOT_A_CONST", error.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+############################################################
+# FILE : test_input.py
+
+# DESCRIPTION: Tests of the key input of the GUI (see Screen.poll_input):
+# key-down and key-up events are fed with a fake clock, and the input of
+# each loop is played by a headless game.
+############################################################
+# Imports
+############################################################
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import controls
+from asteroids_main import GameRunner
+from headless_screen import HeadlessScreen
+from ship import Ship
+
+try:
+    import screen
+except ImportError:
+    screen = None
+############################################################
+# InputTest class
+############################################################
+
+
+@unittest.skipIf(screen is None, "no tkinter")
+class InputTest(unittest.TestCase):
+    NS_IN_MS = 10 ** 6
+
+    def setUp(self):
+        self.now = 0
+        patcher = mock.patch.object(screen.time, "perf_counter_ns",
+                                    lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.gui = object.__new__(screen.Screen)
+        self.gui._init_keys_values()
+
+    def play(self, bit, press_ms, release_ms, loops,
+             tick_ms=GameRunner.TICK_MS):
+        """
+        This method presses a key at press_ms and releases it at release_ms,
+        and polls the input at the start of each loop.
+        :return: list of the input of each loop
+        """
+        events = [(press_ms, True), (release_ms, False)]
+        inputs = []
+        for i in range(loops):
+            ms = i * tick_ms
+            while events and events[0][0] <= ms:
+                event_ms, down = events.pop(0)
+                self.now = event_ms * self.NS_IN_MS
+                self.gui._handle_key(bit, down)
+            self.now = ms * self.NS_IN_MS
+            inputs.append(self.gui.poll_input())
+        return inputs
+
+    def run_game(self, inputs):
+        """
+        :return: headless game after playing inputs, one for each loop
+        """
+        runner = GameRunner(1, HeadlessScreen(), 1)
+        for loop_input in inputs:
+            self.assertTrue(runner.step(loop_input, False))
+        return runner
+
+    def test_tap_of_fire_launches_one_torpedo(self):
+        inputs = self.play(controls.FIRE, 5, 85, 20)
+        self.assertEqual(inputs.count(controls.FIRE), 1)
+        runner = self.run_game(inputs)
+        self.assertEqual(len(runner.get_world().torpedoes), 1)
+
+    def test_tap_shorter_than_a_loop_is_not_lost(self):
+        inputs = self.play(controls.FIRE, 12, 15, 5)
+        self.assertEqual(inputs, [0, 0, controls.FIRE, 0, 0])
+
+    def test_tap_of_left_turns_once(self):
+        runner = self.run_game(self.play(controls.LEFT, 5, 85, 20))
+        self.assertEqual(runner.ship.get_heading(), Ship.TURN_LEFT_DEGREE)
+
+    def test_held_key_repeats_at_the_same_rate_for_any_loop_length(self):
+        hold_ms = 1000
+        expected = 1 + (hold_ms - screen.Screen.KEY_REPEAT_DELAY_MS) * \
+            screen.Screen.KEY_REPEAT_HZ // 1000
+        for tick_ms in (5, 10, 20):
+            self.gui._init_keys_values()
+            inputs = self.play(controls.UP, 0, hold_ms,
+                               hold_ms // tick_ms + 10, tick_ms)
+            self.assertAlmostEqual(inputs.count(controls.UP), expected,
+                                   delta=1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+############################################################
+# FILE : test_main.py
+
+# DESCRIPTION: Tests of the command line args of the game (see
+# asteroids_main.py).
+############################################################
+# Imports
+############################################################
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from asteroids_main import MAX_SEED, parse_args
+############################################################
+# ParseArgsTest class
+############################################################
+
+
+class ParseArgsTest(unittest.TestCase):
+
+    def assert_usage_error(self, argv):
+        with contextlib.redirect_stderr(io.StringIO()) as error:
+            with self.assertRaises(SystemExit):
+                parse_args(argv)
+        self.assertIn("usage:", error.getvalue())
+
+    def test_seed_in_range(self):
+        self.assertEqual(parse_args(["--seed", "0"]).seed, 0)
+        self.assertEqual(parse_args(["--seed", str(MAX_SEED - 1)]).seed,
+                         MAX_SEED - 1)
+
+    def test_seed_out_of_range(self):
+        self.assert_usage_error(["--seed", "-1"])
+        self.assert_usage_error(["--seed", str(MAX_SEED)])
+
+if __name__ == "__main__":
+    unittest.main()
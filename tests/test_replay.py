@@ -0,0 +1,75 @@
+############################################################
+# FILE : test_replay.py
+
+# DESCRIPTION: Tests of replay files (see replay.py).
+############################################################
+# Imports
+############################################################
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from asteroids_main import GameRunner
+from headless_screen import HeadlessScreen
+from replay import ReplayFile, ReplayRecorder
+############################################################
+# ReplayTest class
+############################################################
+
+
+class ReplayTest(unittest.TestCase):
+    INTERVAL = 100
+    TICKS = 350
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "game.rep")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def record(self):
+        """
+        Plays a game recorded with a recorder that is never closed.
+        :return: dict of saved state of the game after each loop
+        """
+        rng = random.Random(1)
+        runner = GameRunner(5, HeadlessScreen(), 7)
+        recorder = ReplayRecorder(self.path, runner, 5, self.INTERVAL)
+        runner.set_recorder(recorder)
+        states = {}
+        while runner.get_ticks() < self.TICKS and \
+                runner.step(rng.choice([0, 1, 8, 9, 10])):
+            states[runner.get_ticks()] = runner.save_state()
+        return states
+
+    def test_replay_of_recorder_never_closed(self):
+        states = self.record()
+        replay = ReplayFile(self.path)
+        last = self.TICKS // self.INTERVAL * self.INTERVAL
+        self.assertEqual(replay.ticks, last)
+        for tick in (1, self.INTERVAL // 2, last):
+            runner = replay.seek(tick)
+            self.assertEqual(runner.get_ticks(), tick)
+            self.assertEqual(runner.save_state(), states[tick])
+        replay.close()
+
+    def test_replay_of_cut_off_file(self):
+        states = self.record()
+        size = os.path.getsize(self.path)
+        with open(self.path, "r+b") as replay_file:
+            replay_file.truncate(size - 10)
+        replay = ReplayFile(self.path)
+        self.assertEqual(replay.ticks, self.TICKS // self.INTERVAL *
+                         self.INTERVAL)
+        runner = replay.seek(replay.ticks)
+        self.assertEqual(runner.save_state(), states[replay.ticks])
+        replay.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+############################################################
+# FILE : test_rewind.py
+
+# DESCRIPTION: Tests of the memory count of the rewind buffer (see rewind.py).
+############################################################
+# Imports
+############################################################
+import os
+import sys
+import unittest
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_state import GameState
+from rewind import RewindBuffer
+############################################################
+# RewindTest class
+############################################################
+
+
+class RewindTest(unittest.TestCase):
+    ROWS = 3
+
+    def new_state(self, ticks, random_state):
+        columns = array("d", [0.0] * (self.ROWS * 8))
+        return GameState(ticks, 0, 3, 0, array("d", [0.0] * 8), columns,
+                         array("d"), random_state)
+
+    def get_expected_bytes(self, rewind):
+        """
+        :return: memory of the states in rewind, each distinct random state
+        counted once
+        """
+        states = [rewind.move(0)]
+        while rewind.move(-1) is not states[-1]:
+            states.append(rewind.move(0))
+        rewind.move(len(states))
+        shared = len(states) - len({id(state.random_state)
+                                    for state in states})
+        return sum(len(state) for state in states) - \
+            shared * GameState.RANDOM_STATE.size
+
+    def test_shared_random_state_counted_once(self):
+        first, second = tuple(range(625)), tuple(range(1, 626))
+        rewind = RewindBuffer()
+        for ticks in range(10):
+            # same words, new tuple each time (compared by value)
+            rewind.push(self.new_state(ticks, tuple(first)))
+        for ticks in range(10, 15):
+            rewind.push(self.new_state(ticks, second))
+        self.assertEqual(rewind.get_bytes(), self.get_expected_bytes(rewind))
+        self.assertEqual(rewind.get_bytes(), 15 * len(self.new_state(0, first))
+                         - 13 * GameState.RANDOM_STATE.size)
+
+    def test_dropped_owner_moves_count_to_next_state(self):
+        first, second = tuple(range(625)), tuple(range(1, 626))
+        size = len(self.new_state(0, first))
+        rewind = RewindBuffer(3 * size)
+        for ticks in range(40):
+            rewind.push(self.new_state(ticks, first if ticks < 30 else second))
+            self.assertEqual(rewind.get_bytes(),
+                             self.get_expected_bytes(rewind))
+            self.assertLessEqual(rewind.get_bytes(), 3 * size)
+
+    def test_resume_shares_random_state_of_cursor(self):
+        first, second = tuple(range(625)), tuple(range(1, 626))
+        rewind = RewindBuffer()
+        for ticks in range(10):
+            rewind.push(self.new_state(ticks, first if ticks < 5 else second))
+        rewind.move(-7)
+        rewind.push(self.new_state(3, first))
+        self.assertEqual(len(rewind), 4)
+        self.assertEqual(rewind.get_bytes(), self.get_expected_bytes(rewind))
+
+if __name__ == "__main__":
+    unittest.main()
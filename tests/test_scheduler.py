@@ -0,0 +1,83 @@
+############################################################
+# FILE : test_scheduler.py
+
+# DESCRIPTION: Tests of the fixed timestep scheduler (see scheduler.py), with
+# a fake clock.
+############################################################
+# Imports
+############################################################
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import FixedStepScheduler
+############################################################
+# SchedulerTest class
+############################################################
+
+
+class SchedulerTest(unittest.TestCase):
+    TICK_MS = 10
+    MAX_STEPS = 5
+
+    def setUp(self):
+        self.now = 100.0
+        self.steps = 0
+        self.alphas = []
+        self.scheduler = FixedStepScheduler(self.step, self.alphas.append,
+                                            self.TICK_MS, self.MAX_STEPS,
+                                            clock=lambda: self.now)
+
+    def step(self):
+        self.steps += 1
+
+    def advance(self, ms):
+        self.now += ms / 1000
+        return self.scheduler.advance()
+
+    def test_first_call_steps_one_tick(self):
+        self.assertEqual(self.advance(0), self.TICK_MS)
+        self.assertEqual(self.steps, 1)
+        self.assertEqual(self.alphas, [0])
+
+    def test_steps_due_ticks_and_renders_once(self):
+        self.advance(0)
+        wait = self.advance(25)
+        self.assertEqual(self.steps, 3)
+        self.assertEqual(len(self.alphas), 2)
+        self.assertAlmostEqual(self.alphas[-1], 0.5)
+        self.assertEqual(wait, 5)
+
+    def test_no_tick_due_skips_render(self):
+        self.advance(0)
+        wait = self.advance(4)
+        self.assertEqual(self.steps, 1)
+        self.assertEqual(len(self.alphas), 1)
+        self.assertEqual(wait, 6)
+
+    def test_catch_up_is_capped_and_rest_dropped(self):
+        self.advance(0)
+        self.advance(123)
+        self.assertEqual(self.steps, 1 + self.MAX_STEPS)
+        self.assertAlmostEqual(self.alphas[-1], 0.3)
+        # time behind was dropped, next call only steps what is due since
+        self.advance(10)
+        self.assertEqual(self.steps, 2 + self.MAX_STEPS)
+
+    def test_wait_counts_time_taken_by_the_call(self):
+        def slow_step():
+            self.now += 0.003
+        self.scheduler.set_callbacks(slow_step, self.alphas.append)
+        self.assertEqual(self.advance(0), self.TICK_MS - 3)
+
+    def test_reset_does_not_step_paused_time(self):
+        self.advance(0)
+        self.scheduler.reset()
+        self.assertEqual(self.advance(2000), self.TICK_MS)
+        self.assertEqual(self.steps, 2)
+        self.assertEqual(self.alphas[-1], 0)
+
+if __name__ == "__main__":
+    unittest.main()
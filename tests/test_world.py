@@ -0,0 +1,55 @@
+############################################################
+# FILE : test_world.py
+
+# DESCRIPTION: Tests of entity ids of world tables (see world.py).
+############################################################
+# Imports
+############################################################
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from world import EntityTable
+############################################################
+# EntityTableTest class
+############################################################
+
+
+class Row:
+    _table = None
+    _index = -1
+
+
+class EntityTableTest(unittest.TestCase):
+
+    def add(self, table):
+        row = Row()
+        table.add(row, (0, 0), (0, 0), 1)
+        return row
+
+    def test_reused_slot_gets_new_serial(self):
+        table = EntityTable()
+        first = self.add(table)
+        self.add(table)
+        removed = table.get_handle(first)
+        table.remove(first)
+        added = table.get_handle(self.add(table))
+        self.assertEqual(EntityTable.get_slot(added),
+                         EntityTable.get_slot(removed))
+        self.assertNotEqual(added, removed)
+        self.assertGreater(added >> EntityTable.SLOT_BITS,
+                           removed >> EntityTable.SLOT_BITS)
+
+    def test_moved_row_keeps_its_handle(self):
+        table = EntityTable()
+        first = self.add(table)
+        last = self.add(table)
+        handle = table.get_handle(last)
+        table.remove(first)
+        self.assertEqual(last._index, 0)
+        self.assertEqual(table.get_handle(last), handle)
+
+if __name__ == "__main__":
+    unittest.main()
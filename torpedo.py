@@ -6,10 +6,13 @@
 # and speed that is accelerating depending on ship's speed, launched at init.
 # Methods in class are getters, movement method for re-positioning and a method
 # to launch (accelerate speed).
+# Torpedo args are kept in a row of an EntityTable (see world.py), the object
+# is a view to its row. Its remaining lifetime is kept in the life column.
 ############################################################
 # Imports
 ############################################################
 import math
+from world import EntityTable
 ############################################################
 # Torpedo class
 ############################################################
@@ -21,7 +24,10 @@ class Torpedo:
     consts AXIS_X, AXIS_Y, MIN, MAX are used for the structural implementation
     of object's bounds arg.
     Torpedo's RADIUS is a const.
+    Torpedo only holds its table, row index and bounds (in slots, no
+    per-object dict), all other args are in the table columns.
     """
+    __slots__ = ("_table", "_index", "bounds")
     AXIS_X = 0
     AXIS_Y = 1
     MIN = 0
@@ -30,7 +36,7 @@ class Torpedo:
     INITIAL_SPEED = (0, 0)
     ACCELERATION_FACTOR = 2
 
-    def __init__(self, pos, heading, speed, bounds):
+    def __init__(self, pos, heading, speed, bounds, table=None, lifetime=0):
         """
         Torpedo object constructor
         Torpedo is launched by launch method at initialization according to
@@ -46,25 +52,49 @@ class Torpedo:
         each tuple incl. min and max values for screen bounds.
         for ex. [(min_x, max_x), (min_y, max_y)]
         :type bounds: list
-        """
-        self.__pos = pos
-        self.__heading = heading
-        self.__speed = self.launch(speed)
+        :param table: table of torpedoes to keep args in, if not given
+        torpedo gets a table of its own.
+        :type table: EntityTable
+        :param lifetime: number of game loops until torpedo is disarmed
+        :type lifetime: int
+        """
+        self._table = table if table is not None else EntityTable()
+        self._index = -1
         self.bounds = bounds
+        self.reset(pos, heading, speed, lifetime)
+
+    def reset(self, pos, heading, speed, lifetime):
+        """
+        This method sets torpedo args, launches it and adds it (again) to its
+        table, for re-using a torpedo that was removed from table.
+        :param pos: location on 2d matrix as (x, y)
+        :param heading: Torpedo's heading in degrees
+        :param speed: initial speed, (x, y)
+        :param lifetime: number of game loops until torpedo is disarmed
+        """
+        self._table.add(self, pos, self.launch(speed, heading), self.RADIUS,
+                        life=lifetime, heading=heading)
 
     def get_speed(self):
         """
         Torpedo speed getter
         :return: torpedo's speed arg (tuple)
         """
-        return self.__speed
+        return self._table.vx[self._index], self._table.vy[self._index]
 
     def get_heading(self):
         """
         Torpedo heading getter
         :return: torpedo's heading arg (in degrees)
         """
-        return self.__heading
+        return self._table.heading[self._index]
+
+    def get_lifetime(self):
+        """
+        Torpedo remaining lifetime getter
+        :return: number of game loops left until torpedo is disarmed
+        """
+        return int(self._table.life[self._index])
 
     def get_radius(self):
         """
@@ -79,14 +109,14 @@ class Torpedo:
         Torpedo's X coordinate getter
         :return: X coordinate of torpedo's position
         """
-        return self.__pos[self.AXIS_X]
+        return self._table.x[self._index]
 
     def get_y(self):
         """
         Torpedo's Y coordinate getter
         :return: Y coordinate of torpedo's position
         """
-        return self.__pos[self.AXIS_Y]
+        return self._table.y[self._index]
 
     def get_new_coordinate(self, axis, axis_bounds):
         """
@@ -101,9 +131,9 @@ class Torpedo:
         from object's bounds arg.
         :return: new coordination according to formula within a given axis, x or y.
         """
-        new_coord = self.__pos[axis]
+        new_coord = (self.get_x(), self.get_y())[axis]
         dif_axis = axis_bounds[self.MAX] - axis_bounds[self.MIN]
-        new_coord = (self.__speed[axis] + new_coord - axis_bounds[self.MIN]) \
+        new_coord = (self.get_speed()[axis] + new_coord - axis_bounds[self.MIN]) \
             % dif_axis + axis_bounds[self.MIN]
         return new_coord
 
@@ -113,16 +143,20 @@ class Torpedo:
         """
         new_coord_x = self.get_new_coordinate(self.AXIS_X, self.bounds[self.AXIS_X])
         new_coord_y = self.get_new_coordinate(self.AXIS_Y, self.bounds[self.AXIS_Y])
-        self.__pos = (new_coord_x, new_coord_y)
+        self._table.x[self._index] = new_coord_x
+        self._table.y[self._index] = new_coord_y
 
-    def degree_to_rad(self):
+    def degree_to_rad(self, heading=None):
         """
         this helper method converts degrees to radians
+        :param heading: heading in degrees, torpedo's heading if not given
         :return: heading of torpedo in radians
         """
-        return self.__heading * (math.pi / 180)
+        if heading is None:
+            heading = self.get_heading()
+        return heading * (math.pi / 180)
 
-    def launch(self, speed):
+    def launch(self, speed, heading):
         """
         This method launches the torpedo when Torpedo constructs new object,
         and accelerate speed according to the following formula:
@@ -133,10 +167,11 @@ class Torpedo:
         ACCELERATION FACTOR: a const defining accelerating factor, defined in class as 2.
         :param speed: speed param given from constructor,
         ship's speed in (x, y) format.
+        :param heading: heading param given from constructor (in degrees)
         :return: new speed after launching in (x, y) format
         """
         new_x_speed = speed[self.AXIS_X]\
-                      + (self.ACCELERATION_FACTOR * math.cos(self.degree_to_rad()))
+                      + (self.ACCELERATION_FACTOR * math.cos(self.degree_to_rad(heading)))
         new_y_speed = speed[self.AXIS_Y] \
-                      + (self.ACCELERATION_FACTOR * math.sin(self.degree_to_rad()))
+                      + (self.ACCELERATION_FACTOR * math.sin(self.degree_to_rad(heading)))
         return new_x_speed, new_y_speed
@@ -0,0 +1,276 @@
+############################################################
+# FILE : world.py
+
+# DESCRIPTION: This file contains EntityTable and World classes, the data
+# store of the objects in the Asteroids! game.
+# Objects args are not kept in each object, but in contiguous float arrays
+# (columns) of a table, one table for each kind of object. Ship, Asteroid and
+# Torpedo objects are views: they hold their table and their row index in it.
+# This way the movement of all objects of a kind is one batched formula over
+# the columns, instead of method calls for each object and coordinate.
+# Rows are removed by moving the last row into the removed row (swap-remove),
+# so removing is O(1) and the columns stay contiguous.
+# During a loop of the game objects are not removed right away, but marked
+# for removal and removed all at once at the end of the loop (flush), so rows
+# do not move while the loop goes over them.
+# Each row also has a handle, the entity id of its object, shared by the
+# game and the render backend (see sprite_index.py): a slot number (re-used
+# after the object is removed, so slots stay dense) and a serial number
+# given to each new object of the table in order (monotonic), so ids are
+# never re-used and an id of a removed object is never taken for the object
+# that took its slot.
+############################################################
+# Imports
+############################################################
+from array import array
+############################################################
+# EntityTable class
+############################################################
+
+
+class EntityTable:
+    """
+    A class representing a table of objects of one kind in 2D world.
+    Columns: x, y (position), vx, vy (speed), radius, size, life (remaining
+    lifetime) and heading (in degrees). Columns not used by a kind are 0.
+    views list holds the object (view) of each row, in the same order, and
+    handles array holds the handle of each row.
+    Objects marked for removal are still in table (and in views) until
+    flush, but has and len do not count them.
+    consts AXIS_X, AXIS_Y, MIN, MAX are used for the structural implementation
+    of bounds arg.
+    """
+    AXIS_X = 0
+    AXIS_Y = 1
+    MIN = 0
+    MAX = 1
+    COLUMNS = ("x", "y", "vx", "vy", "radius", "size", "life", "heading")
+    TYPECODE = "d"
+    SLOT_BITS = 32
+    SLOT_MASK = 2 ** SLOT_BITS - 1
+
+    def __init__(self):
+        """
+        EntityTable object constructor
+        :return: a new empty table, one float array for each column.
+        """
+        for column in self.COLUMNS:
+            setattr(self, column, array(self.TYPECODE))
+        self.views = []
+        self.handles = array("q")
+        # number of slots given so far, and serial of the last new object
+        self.__slots = 0
+        self.__serial = 0
+        self.__free_slots = []
+        # views marked for removal at end of loop, in order of marking (dict
+        # keys, so flush removes them in the same order every time)
+        self.__removed = {}
+
+    def __len__(self):
+        return len(self.views) - len(self.__removed)
+
+    def has(self, view):
+        """
+        :return: True if view is attached to a row in this table and not
+        marked for removal, else False
+        """
+        return view._table is self and view._index >= 0 and \
+            view not in self.__removed
+
+    def get_handle(self, view):
+        """
+        :return: handle (entity id, int) of the row of a view in this table
+        """
+        return self.handles[view._index]
+
+    @classmethod
+    def get_slot(cls, handle):
+        """
+        :return: slot of a handle, a small int (slots of the objects in a
+        table are dense, from 0)
+        """
+        return handle & cls.SLOT_MASK
+
+    def __new_handle(self):
+        """
+        This method gets a slot (a free one if there is one) and the next
+        serial for a new row.
+        :return: handle of the new row
+        """
+        self.__serial += 1
+        if self.__free_slots:
+            slot = self.__free_slots.pop()
+        else:
+            slot = self.__slots
+            self.__slots += 1
+        return self.__serial << self.SLOT_BITS | slot
+
+    def add(self, view, pos, speed, radius, size=0, life=0, heading=0):
+        """
+        This method adds a new row to table and attaches a view to it.
+        :param view: the object that reads and writes this row
+        :param pos: location on 2d matrix as (x, y)
+        :param speed: speed on 2d matrix, (x, y)
+        :return: row index of new row
+        """
+        self.x.append(pos[self.AXIS_X])
+        self.y.append(pos[self.AXIS_Y])
+        self.vx.append(speed[self.AXIS_X])
+        self.vy.append(speed[self.AXIS_Y])
+        self.radius.append(radius)
+        self.size.append(size)
+        self.life.append(life)
+        self.heading.append(heading)
+        self.views.append(view)
+        view._table = self
+        view._index = len(self.views) - 1
+        self.handles.append(self.__new_handle())
+        return view._index
+
+    def remove(self, view):
+        """
+        This method removes the row of a view from table in O(1), by moving
+        the last row to its place. View of last row is re-indexed.
+        Rows move, so it must not be called while going over the table, see
+        defer_remove.
+        :param view: the object of the row for removal
+        """
+        index = view._index
+        last = len(self.views) - 1
+        self.__free_slots.append(self.handles[index] & self.SLOT_MASK)
+        if index != last:
+            for column in self.COLUMNS:
+                values = getattr(self, column)
+                values[index] = values[last]
+            moved = self.views[last]
+            self.views[index] = moved
+            moved._index = index
+            self.handles[index] = self.handles[last]
+        for column in self.COLUMNS:
+            getattr(self, column).pop()
+        self.views.pop()
+        self.handles.pop()
+        view._index = -1
+
+    def defer_remove(self, view):
+        """
+        This method marks the row of a view for removal at the end of the
+        loop (see flush). Until then, rows do not move, and has and len act
+        as if the row was removed.
+        :param view: the object of the row for removal
+        """
+        self.__removed[view] = None
+
+    def flush(self):
+        """
+        This method removes all rows marked for removal, it is called at the
+        end of each loop.
+        :return: list of the removed objects
+        """
+        removed = list(self.__removed)
+        for view in removed:
+            self.remove(view)
+        self.__removed.clear()
+        return removed
+
+    def move(self, bounds):
+        """
+        This method moves all objects in table, with the same formula objects
+        use for one coordinate, over the whole x & y columns:
+        new coord = speed + old coord - AxisMinCoord) % AXIS DIFFERENCE + AxisMinCoord
+        :param bounds: screen bounds as [(min_x, max_x), (min_y, max_y)]
+        :type bounds: list
+        """
+        min_x, max_x = bounds[self.AXIS_X]
+        min_y, max_y = bounds[self.AXIS_Y]
+        dif_x = max_x - min_x
+        dif_y = max_y - min_y
+        self.x[:] = array(self.TYPECODE, [(vx + x - min_x) % dif_x + min_x
+                                          for x, vx in zip(self.x, self.vx)])
+        self.y[:] = array(self.TYPECODE, [(vy + y - min_y) % dif_y + min_y
+                                          for y, vy in zip(self.y, self.vy)])
+
+    def interpolate(self, bounds, alpha):
+        """
+        This method gets positions of all objects in between their previous
+        and current positions, for drawing in between two loops of the game:
+        coord = (old coord + speed * alpha - AxisMinCoord) % AXIS DIFFERENCE + AxisMinCoord
+        while old coord is current coord - speed.
+        :param bounds: screen bounds as [(min_x, max_x), (min_y, max_y)]
+        :param alpha: fraction of the way from previous position, in [0, 1]
+        :return: x coordinates list, y coordinates list
+        """
+        if alpha == 1:
+            return self.x, self.y
+        back = 1 - alpha
+        min_x, max_x = bounds[self.AXIS_X]
+        min_y, max_y = bounds[self.AXIS_Y]
+        dif_x = max_x - min_x
+        dif_y = max_y - min_y
+        return [(x - vx * back - min_x) % dif_x + min_x
+                for x, vx in zip(self.x, self.vx)], \
+            [(y - vy * back - min_y) % dif_y + min_y
+             for y, vy in zip(self.y, self.vy)]
+
+    def snapshot(self):
+        """
+        This method copies the columns of table to one flat array, one
+        column after the other.
+        :return: array of len(COLUMNS) * number of rows floats
+        """
+        values = array(self.TYPECODE)
+        for column in self.COLUMNS:
+            values.extend(getattr(self, column))
+        return values
+
+    def restore(self, values):
+        """
+        This method sets the columns of table from an array made by snapshot.
+        Table must already have the same number of rows (views) as the
+        snapshot.
+        :param values: flat array of columns
+        :type values: array
+        """
+        length = len(self.views)
+        for i, column in enumerate(self.COLUMNS):
+            getattr(self, column)[:] = values[i * length:(i + 1) * length]
+
+    @classmethod
+    def get_snapshot_column(cls, values, column):
+        """
+        :param values: flat array of columns made by snapshot
+        :param column: column name
+        :return: the column in values, as an array
+        """
+        length = len(values) // len(cls.COLUMNS)
+        i = cls.COLUMNS.index(column)
+        return values[i * length:(i + 1) * length]
+
+    def count_down(self):
+        """
+        This method subtracts one "life" from remaining lifetime of all objects.
+        """
+        self.life[:] = array(self.TYPECODE, [life - 1 for life in self.life])
+
+
+############################################################
+# World class
+############################################################
+
+
+class World:
+    """
+    A class representing all objects of the Asteroids! game, a table for
+    each kind: ships, asteroids and torpedoes.
+    """
+
+    def __init__(self, bounds):
+        """
+        World object constructor
+        :param bounds: screen bounds as [(min_x, max_x), (min_y, max_y)]
+        :type bounds: list
+        """
+        self.bounds = bounds
+        self.ships = EntityTable()
+        self.asteroids = EntityTable()
+        self.torpedoes = EntityTable()